@@ -0,0 +1,94 @@
+"""
+encoding.py — Response bodies for the analyse routes.
+
+The Accept header picks the format:
+    application/json      the default; encoded with orjson when it is
+                          installed, json.dumps otherwise
+    application/msgpack   MessagePack (also application/x-msgpack),
+                          when msgpack is installed — JSON otherwise
+
+Before encoding, each player dict in starting_xi and bench loses the
+squad selector's working keys (_selection_score, _pis) and the stored
+match stats the impact scores were computed from. Bulk responses can
+also be gzipped as they stream (gzip_stream).
+"""
+
+import json
+import zlib
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+NDJSON = "application/x-ndjson"
+
+# Player keys that never leave the API, besides any starting with "_"
+PRIVATE_PLAYER_KEYS = frozenset({"stats"})
+PLAYER_LISTS = ("starting_xi", "bench")
+
+
+# ── Report Bodies ──────────────────────────────────────────────
+def public_player(player: dict) -> dict:
+    return {k: v for k, v in player.items() if k[0] != "_" and k not in PRIVATE_PLAYER_KEYS}
+
+
+def public_report(body: dict) -> dict:
+    """Strips internal player keys from a report dict, in place."""
+    for key in PLAYER_LISTS:
+        if key in body:
+            body[key] = [public_player(p) for p in body[key]]
+    return body
+
+
+# ── Negotiation ────────────────────────────────────────────────
+def negotiate(accept: str) -> str:
+    """The media type to answer with for an Accept header."""
+    if msgpack is not None and "msgpack" in (accept or ""):
+        return MSGPACK
+    return JSON
+
+
+def _default(value):
+    """Values outside the plain JSON types: enums and NumPy scalars."""
+    for attr in ("value", "item"):
+        if hasattr(value, attr):
+            found = getattr(value, attr)
+            return found() if callable(found) else found
+    raise TypeError(f"Cannot encode {type(value).__name__}.")
+
+
+def encode(body, media_type: str = JSON) -> bytes:
+    if media_type == MSGPACK:
+        return msgpack.packb(body, default=_default)
+    if orjson is not None:
+        return orjson.dumps(body, default=_default)
+    return json.dumps(body, default=_default, separators=(",", ":")).encode()
+
+
+def encode_line(body, media_type: str = JSON) -> bytes:
+    """One item of a streamed response: an NDJSON line or a MessagePack object."""
+    data = encode(body, media_type)
+    return data if media_type == MSGPACK else data + b"\n"
+
+
+# ── Compression ────────────────────────────────────────────────
+def accepts_gzip(accept_encoding: str) -> bool:
+    return "gzip" in (accept_encoding or "")
+
+
+async def gzip_stream(chunks, level: int = 6):
+    """Gzips an async stream of bytes chunk by chunk, flushing after each."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    async for chunk in chunks:
+        data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
@@ -0,0 +1,137 @@
+"""
+executor.py — Runs pipeline work off the event loop.
+
+Requests are handed to a bounded thread or process pool. Once
+max_pending requests are in flight, new ones are rejected with
+ExecutorBusy so the route can answer 429 instead of queueing
+without limit.
+
+Configured from the environment:
+    GAFFEROS_EXECUTOR     thread | process      (default: thread)
+    GAFFEROS_WORKERS      pool size             (default: CPU count)
+    GAFFEROS_MAX_PENDING  in-flight limit       (default: 4 × workers)
+"""
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from core.schemas import TacticalReport
+
+
+class ExecutorBusy(Exception):
+    """Raised when the in-flight limit is reached."""
+
+
+# ── Process worker state ───────────────────────────────────────
+# Each worker process builds its own pipeline once, at start-up.
+_worker_pipeline = None
+
+
+def _init_worker(factory):
+    global _worker_pipeline
+    _worker_pipeline = factory()
+
+
+def _run_in_worker(method: str, arg, *args) -> TacticalReport:
+    return getattr(_worker_pipeline, method)(arg, *args)
+
+
+def _warm_up_worker(barrier) -> float:
+    seconds = _worker_pipeline.warm_up()
+    # Hold this worker until every other one has taken a warm-up task
+    barrier.wait()
+    return seconds
+
+
+# ── Executor ───────────────────────────────────────────────────
+class PipelineExecutor:
+
+    KINDS = ("thread", "process")
+
+    def __init__(self, pipeline, kind: str = "thread", max_workers: int = None,
+                 max_pending: int = None, factory=None):
+        """
+        pipeline: shared TactIQPipeline used by thread workers.
+        factory:  zero-arg callable building a pipeline in each process
+                  worker (defaults to the pipeline's class).
+        """
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown executor kind '{kind}'. Use one of {self.KINDS}.")
+
+        self.kind = kind
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.max_workers * 4
+        self._pending = 0
+
+        self._pipeline = pipeline
+        if kind == "thread":
+            self._pool = ThreadPoolExecutor(self.max_workers, thread_name_prefix="pipeline")
+        else:
+            self._pool = ProcessPoolExecutor(
+                self.max_workers,
+                initializer=_init_worker,
+                initargs=(factory or type(pipeline),),
+            )
+
+    @classmethod
+    def from_env(cls, pipeline, factory=None) -> "PipelineExecutor":
+        workers = os.getenv("GAFFEROS_WORKERS")
+        pending = os.getenv("GAFFEROS_MAX_PENDING")
+        return cls(
+            pipeline,
+            kind=os.getenv("GAFFEROS_EXECUTOR", "thread"),
+            max_workers=int(workers) if workers else None,
+            max_pending=int(pending) if pending else None,
+            factory=factory,
+        )
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    async def run(self, request, method: str = "run", args: tuple = ()) -> TacticalReport:
+        """
+        Runs pipeline.<method>(request, *args) on the pool — "run" for a
+        MatchAnalysisRequest, "run_validated" for InputValidator output.
+        Only called from the event loop thread, so the pending counter
+        needs no lock.
+        """
+        if self._pending >= self.max_pending:
+            raise ExecutorBusy(f"{self._pending} analyses already in flight.")
+
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            if self.kind == "thread":
+                call = getattr(self._pipeline, method)
+                return await loop.run_in_executor(self._pool, call, request, *args)
+            return await loop.run_in_executor(self._pool, _run_in_worker, method, request, *args)
+        finally:
+            self._pending -= 1
+
+    async def warm_up(self) -> float:
+        """
+        Runs pipeline.warm_up() before traffic arrives: once on the pool
+        in thread mode. In process mode the parent warms up first, then
+        each worker once — workers are forked on demand, so they start
+        with the parent's imports already loaded. The worker tasks meet
+        at a barrier, so each lands on a different worker and none
+        returns before all of them are warm. Returns the seconds the
+        slowest warm-up took.
+        """
+        loop = asyncio.get_running_loop()
+        if self.kind == "thread":
+            return await loop.run_in_executor(self._pool, self._pipeline.warm_up)
+        seconds = await loop.run_in_executor(None, self._pipeline.warm_up)
+        with multiprocessing.Manager() as manager:
+            barrier = manager.Barrier(self.max_workers)
+            workers = [
+                loop.run_in_executor(self._pool, _warm_up_worker, barrier)
+                for _ in range(self.max_workers)
+            ]
+            return max([seconds] + list(await asyncio.gather(*workers)))
+
+    def shutdown(self):
+        self._pool.shutdown(wait=True, cancel_futures=True)
@@ -4,32 +4,156 @@ Phase 3: REST API wrapping the existing pipeline.
 
 Run from backend/ directory:
     uvicorn api.main:app --reload --port 8000
+
+Pipeline work runs on a bounded pool — see api/executor.py for the
+GAFFEROS_EXECUTOR / GAFFEROS_WORKERS / GAFFEROS_MAX_PENDING settings.
+Repeat analyses are served from a report cache sized by
+GAFFEROS_CACHE_SIZE / GAFFEROS_CACHE_TTL (core/report_cache.py).
+ML predictions can be micro-batched across concurrent requests with
+GAFFEROS_ML_BATCH_ROWS / GAFFEROS_ML_BATCH_WAIT_MS (core/inference.py).
+Per-stage latency histograms are served at /metrics in Prometheus text
+format; GAFFEROS_METRICS=0 turns the timing off (core/stage_metrics.py).
+Tactical thresholds come from a rule table (GAFFEROS_RULES), reloaded
+with POST /rules/reload or polled every GAFFEROS_RULES_POLL seconds
+(engine/rule_engine.py).
+Clubs, squads and results can be stored (GAFFEROS_DATABASE_URL, SQLite
+by default — db/store.py) and analysed by id with
+GET /analyse/{team_id}/{opponent_id}.
+POST /render draws a report's XI on a pitch as SVG or PNG, cached up to
+GAFFEROS_RENDER_CACHE_SIZE images (core/pitch_renderer.py).
+Versioned models are memory-mapped from GAFFEROS_MODEL_DIR
+(core/model_registry.py), loaded during warm-up and swapped with
+POST /models/{version}/activate.
+/health is liveness; /ready turns 200 once a start-up warm-up has run
+a sample request through the pipeline. Heavy, rarely used imports
+(SQLAlchemy, matplotlib, scipy) load on first use, so importing this
+module stays within the budget benchmarks/bench_cold_start.py checks.
+/analyse?fields= runs only the stages the named report fields need;
+GAFFEROS_STAGE_WORKERS > 0 runs independent stages side by side.
+Analyse responses are JSON or, for Accept: application/msgpack,
+MessagePack, without the squad selector's internal player keys; the
+batch stream is gzipped on Accept-Encoding: gzip (api/encoding.py).
+POST /fixtures/analyse analyses a round of fixtures, computing each
+team's indices and form once for both sides of its match.
 """
 
-from fastapi import FastAPI, HTTPException
-from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
-from typing import Optional, List
+import asyncio
+import logging
+import os
+import tempfile
+from contextlib import asynccontextmanager
 
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
+from pydantic import ValidationError
+from core.errors import InvalidInput, NotFound
+from core.inference import MLInference
+from core.model_registry import ModelRegistry
+from core.pitch_renderer import FORMATS, MEDIA_TYPES, PitchRenderer
+from core.report_cache import ReportCache
 from core.schemas import (
-    MatchAnalysisRequest,
-    DataTier,
-    Tier1Input,
-    Tier2Input,
-    MatchResult,
-    Player,
-    BroadPosition,
-    SpecificPosition,
+    ClubIn, DataTier, FixtureIn, FixtureRoundRequest, MatchAnalysisRequest, Player, PlayerStatsIn, RenderRequest, ResultIn, SweepAxis,
 )
+from core.stage_metrics import StageMetrics, prometheus_counters
+from engine.rule_engine import RuleError
 from pipeline import TactIQPipeline
+from api.executor import PipelineExecutor, ExecutorBusy
+from api.encoding import JSON, NDJSON, accepts_gzip, encode, encode_line, gzip_stream, negotiate, public_report
+
+# ── Pipeline (singleton) ───────────────────────────────────────
+pipeline = TactIQPipeline(
+    cache=ReportCache.from_env(),
+    inference=MLInference.from_env(),
+    stage_metrics=StageMetrics.from_env(),
+    stage_workers=int(os.getenv("GAFFEROS_STAGE_WORKERS", "0")),
+    models=ModelRegistry.from_env(),
+)
+
+
+def _worker_pipeline() -> TactIQPipeline:
+    """Pipeline for GAFFEROS_EXECUTOR=process workers, with its own handle on the model store."""
+    return TactIQPipeline(models=ModelRegistry.from_env())
+
+
+executor = PipelineExecutor.from_env(pipeline, factory=_worker_pipeline)
+renderer = PitchRenderer.from_env()
+
+logger = logging.getLogger(__name__)
+
+# Opened on first use, so importing the app never creates a database
+# (or imports SQLAlchemy)
+_store = None
+
+
+def team_store():
+    """The app's db.store.TeamStore."""
+    global _store
+    if _store is None:
+        from db.store import TeamStore
+        _store = TeamStore.from_env()
+    return _store
+
+
+# Set once the lifespan's warm-up has run — /ready answers 503 until then
+_readiness = {"ready": False, "warm_up_seconds": None, "error": None}
+
+
+async def _warm_up():
+    try:
+        _readiness["warm_up_seconds"] = round(await executor.warm_up(), 3)
+        _readiness["ready"] = True
+    except Exception as e:
+        logger.exception("Warm-up failed")
+        _readiness["error"] = str(e)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # In the background, so /health answers while the pipeline warms up
+    warm_up = asyncio.create_task(_warm_up())
+    yield
+    warm_up.cancel()
+    executor.shutdown()
+    pipeline.inference.close()
+    if _store is not None:
+        _store.close()
+
 
 # ── App ────────────────────────────────────────────────────────
 app = FastAPI(
     title="GafferOS API",
     description="AI-assisted tactical decision support for grassroots football.",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
+# ── OpenAPI ────────────────────────────────────────────────────
+# Routes that validate the raw body in one pass (InputValidator) take
+# no model parameter, so FastAPI can't see their schemas. They name
+# their model with _request_body() and _openapi() publishes it.
+BODY_MODELS = (MatchAnalysisRequest, FixtureRoundRequest)
+SCHEMA_REF = "#/components/schemas/{model}"
+
+
+def _request_body(model) -> dict:
+    ref = {"$ref": SCHEMA_REF.format(model=model.__name__)}
+    return {"requestBody": {"required": True, "content": {"application/json": {"schema": ref}}}}
+
+
+def _openapi() -> dict:
+    if app.openapi_schema is None:
+        schemas = FastAPI.openapi(app).setdefault("components", {}).setdefault("schemas", {})
+        for model in BODY_MODELS:
+            schema = model.model_json_schema(ref_template=SCHEMA_REF)
+            schemas.update(schema.pop("$defs", {}))
+            schemas[model.__name__] = schema
+    return app.openapi_schema
+
+
+app.openapi = _openapi
+
 # ── CORS — allow Next.js dev server ───────────────────────────
 app.add_middleware(
     CORSMiddleware,
@@ -42,112 +166,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# ── Pipeline (singleton) ───────────────────────────────────────
-pipeline = TactIQPipeline()
-
-
-# ── Request / Response Models ──────────────────────────────────
-
-class PlayerRequest(BaseModel):
-    name: str
-    position: str           # BroadPosition value e.g. "DEF"
-    specific_position: str  # SpecificPosition value e.g. "CB"
-    secondary_position: Optional[str] = None
-    available: bool = True
-    fitness_score: float = Field(default=1.0, ge=0.0, le=1.0)
-
-
-class Tier1Request(BaseModel):
-    team_name: str
-    opponent_name: str
-    last_5_results: List[str] = Field(..., min_length=1, max_length=5)
-    goals_scored_last_5: int = Field(..., ge=0)
-    goals_conceded_last_5: int = Field(..., ge=0)
-    players: Optional[List[PlayerRequest]] = []
-    opponent_last_5_results: Optional[List[str]] = None
-    opponent_goals_scored: Optional[int] = None
-    opponent_goals_conceded: Optional[int] = None
-
-
-class Tier2Request(Tier1Request):
-    avg_possession: float = Field(..., ge=0, le=100)
-    avg_passing_accuracy: float = Field(..., ge=0, le=100)
-    avg_shots_per_match: float = Field(..., ge=0)
-    avg_shots_on_target: float = Field(..., ge=0)
-    avg_defensive_errors: float = Field(..., ge=0)
-    opp_avg_possession: Optional[float] = None
-    opp_avg_passing_accuracy: Optional[float] = None
-    opp_avg_shots_per_match: Optional[float] = None
-    opp_avg_defensive_errors: Optional[float] = None
-
-
-class AnalyseRequest(BaseModel):
-    tier: str  # "tier_1" or "tier_2"
-    tier1_data: Optional[Tier1Request] = None
-    tier2_data: Optional[Tier2Request] = None
-
-
-# ── Helpers ────────────────────────────────────────────────────
-
-def _build_players(raw: Optional[List[PlayerRequest]]) -> List[Player]:
-    if not raw:
-        return []
-    players = []
-    for p in raw:
-        players.append(Player(
-            name=p.name,
-            position=BroadPosition(p.position),
-            specific_position=SpecificPosition(p.specific_position),
-            secondary_position=SpecificPosition(p.secondary_position) if p.secondary_position else None,
-            available=p.available,
-            fitness_score=p.fitness_score,
-        ))
-    return players
-
-
-def _build_results(raw: Optional[List[str]]) -> Optional[List[MatchResult]]:
-    if raw is None:
-        return None
-    return [MatchResult(r) for r in raw]
-
-
-def _build_tier1(data: Tier1Request) -> Tier1Input:
-    return Tier1Input(
-        team_name=data.team_name,
-        opponent_name=data.opponent_name,
-        last_5_results=_build_results(data.last_5_results),
-        goals_scored_last_5=data.goals_scored_last_5,
-        goals_conceded_last_5=data.goals_conceded_last_5,
-        players=_build_players(data.players),
-        opponent_last_5_results=_build_results(data.opponent_last_5_results),
-        opponent_goals_scored=data.opponent_goals_scored,
-        opponent_goals_conceded=data.opponent_goals_conceded,
-    )
-
-
-def _build_tier2(data: Tier2Request) -> Tier2Input:
-    return Tier2Input(
-        team_name=data.team_name,
-        opponent_name=data.opponent_name,
-        last_5_results=_build_results(data.last_5_results),
-        goals_scored_last_5=data.goals_scored_last_5,
-        goals_conceded_last_5=data.goals_conceded_last_5,
-        players=_build_players(data.players),
-        opponent_last_5_results=_build_results(data.opponent_last_5_results),
-        opponent_goals_scored=data.opponent_goals_scored,
-        opponent_goals_conceded=data.opponent_goals_conceded,
-        avg_possession=data.avg_possession,
-        avg_passing_accuracy=data.avg_passing_accuracy,
-        avg_shots_per_match=data.avg_shots_per_match,
-        avg_shots_on_target=data.avg_shots_on_target,
-        avg_defensive_errors=data.avg_defensive_errors,
-        opp_avg_possession=data.opp_avg_possession,
-        opp_avg_passing_accuracy=data.opp_avg_passing_accuracy,
-        opp_avg_shots_per_match=data.opp_avg_shots_per_match,
-        opp_avg_defensive_errors=data.opp_avg_defensive_errors,
-    )
-
-
 # ── Routes ─────────────────────────────────────────────────────
 
 @app.get("/")
@@ -157,40 +175,487 @@ def root():
 
 @app.get("/health")
 def health():
-    return {"status": "ok"}
+    return {"status": "ok", "ml": pipeline.inference.stats(), "rules": pipeline.rules.version}
+
 
+@app.get("/ready")
+def ready():
+    """
+    Readiness, separate from /health (liveness): 503 until the
+    start-up warm-up has run one sample request through the pipeline
+    on the executor, 200 after.
+    """
+    if _readiness["ready"]:
+        return {"status": "ready", "warm_up_seconds": _readiness["warm_up_seconds"]}
+    status = "failed" if _readiness["error"] else "warming_up"
+    return JSONResponse({"status": status, "error": _readiness["error"]}, status_code=503)
+
+
+# ── Rules ──────────────────────────────────────────────────────
+
+@app.get("/rules")
+def rules():
+    return pipeline.rules.stats()
 
-@app.post("/analyse")
-def analyse(body: AnalyseRequest):
+
+@app.post("/rules/reload")
+def reload_rules():
     """
-    Main endpoint. Accepts match data and returns a full TacticalReport.
+    Re-reads the rule table without a restart and drops cached reports.
+    A table that fails to parse or compile is rejected with 422 and the
+    current one stays in use. With GAFFEROS_EXECUTOR=process, workers
+    hold their own copy — set GAFFEROS_RULES_POLL so they pick it up.
     """
     try:
-        tier = DataTier(body.tier)
-
-        if tier == DataTier.TIER_1:
-            if not body.tier1_data:
-                raise HTTPException(status_code=422, detail="tier1_data is required for tier_1.")
-            request = MatchAnalysisRequest(
-                tier=tier,
-                tier1_data=_build_tier1(body.tier1_data),
-            )
+        pipeline.rules.reload()
+    except (OSError, RuleError) as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return pipeline.rules.stats()
 
-        elif tier == DataTier.TIER_2:
-            if not body.tier2_data:
-                raise HTTPException(status_code=422, detail="tier2_data is required for tier_2.")
-            request = MatchAnalysisRequest(
-                tier=tier,
-                tier2_data=_build_tier2(body.tier2_data),
-            )
 
+# ── Models ─────────────────────────────────────────────────────
+
+@app.get("/models")
+def models():
+    if pipeline.models is None:
+        raise HTTPException(status_code=404, detail="No model registry configured (GAFFEROS_MODEL_DIR).")
+    return pipeline.models.stats()
+
+
+@app.post("/models/{version}/activate")
+def activate_model(version: str):
+    """
+    Swaps a published model version in without a restart and records
+    it as current. Requests already predicting finish on the old model;
+    every report names the version that produced it (model_version).
+    Other uvicorn or process-pool workers switch over when they next
+    poll — set GAFFEROS_MODEL_POLL.
+    """
+    if pipeline.models is None:
+        raise HTTPException(status_code=404, detail="No model registry configured (GAFFEROS_MODEL_DIR).")
+    try:
+        pipeline.models.promote(version)
+    except NotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except InvalidInput as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return pipeline.models.stats()
+
+
+# ── Metrics ────────────────────────────────────────────────────
+
+# /analyse outcomes — only touched from the event loop thread
+_outcomes = {"ok": 0, "busy": 0, "invalid": 0, "not_found": 0, "error": 0}
+
+
+def _count_outcome(outcome: str):
+    _outcomes[outcome] += 1
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Prometheus text exposition: stage latency, cache, ML and request counters."""
+    parts = []
+    if pipeline.stage_metrics is not None:
+        parts.append(pipeline.stage_metrics.render())
+
+    parts.append(prometheus_counters(
+        "gafferos_analyse_requests_total", "/analyse requests by outcome.", "outcome", _outcomes,
+    ))
+
+    ml = pipeline.inference.stats()
+    parts.append(prometheus_counters(
+        "gafferos_ml_predictions_total", "ML predictions by result.", "result",
+        {"success": ml["successes"], "failure": ml["failures"]},
+    ))
+
+    if pipeline.cache is not None:
+        cache = pipeline.cache.stats()
+        parts.append(prometheus_counters(
+            "gafferos_report_cache_lookups_total", "Report cache lookups by result.", "result",
+            {"hit": cache["hits"], "miss": cache["misses"]},
+        ))
+        parts.append(prometheus_counters(
+            "gafferos_report_cache_evictions_total", "Report cache evictions.", "cache",
+            {"report": cache["evictions"]},
+        ))
+
+    return PlainTextResponse(
+        "\n".join(p.rstrip("\n") for p in parts) + "\n",
+        media_type="text/plain; version=0.0.4",
+    )
+
+
+# ── Batch Helpers ──────────────────────────────────────────────
+
+BATCH_CHUNK_SIZE = 256
+BATCH_SPOOL_BYTES = 8 * 1024 * 1024
+
+
+def _parse_item(raw) -> dict:
+    """One NDJSON line or list item, validated in a single pass."""
+    if isinstance(raw, (str, bytes)):
+        return pipeline.validate_json(raw)
+    return pipeline.validate_payload(raw)
+
+
+def _run_chunk(chunk: list) -> list:
+    """
+    Runs one chunk of (index, validated) pairs through run_batch.
+    If the batch fails, the failure is logged and each item re-run with
+    run_validated(), so a single bad request only produces its own
+    error line.
+    """
+    try:
+        reports = pipeline.run_batch_validated([req for _, req in chunk])
+        return [
+            {"index": i, "report": public_report(report.model_dump())}
+            for (i, _), report in zip(chunk, reports)
+        ]
+    except Exception:
+        logger.exception("Batch of %d failed; retrying item by item", len(chunk))
+
+    lines = []
+    for i, req in chunk:
+        try:
+            lines.append({"index": i, "report": public_report(pipeline.run_validated(req).model_dump())})
+        except Exception as e:
+            lines.append({"index": i, "error": f"Pipeline error: {e}"})
+    return lines
+
+
+async def _spool_upload(request: Request):
+    """
+    Copies the upload into a temp file that only lives in memory up to
+    BATCH_SPOOL_BYTES. The body has to be drained before the streaming
+    response starts, since Starlette then listens on the same channel
+    for client disconnects.
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=BATCH_SPOOL_BYTES)
+    async for part in request.stream():
+        spool.write(part)
+    spool.seek(0)
+    return spool
+
+
+async def _ndjson_items(spool):
+    """Yields raw NDJSON lines one at a time, closing the spool at the end."""
+    with spool:
+        for line in spool:
+            if line.strip():
+                yield line
+
+
+async def _list_items(body: list):
+    for item in body:
+        yield item
+
+
+async def _stream_reports(items, media_type: str):
+    """
+    Parses, validates and analyses items in chunks of
+    BATCH_CHUNK_SIZE, yielding one encoded line per item in order.
+    Only one chunk is held in memory at a time.
+    """
+    index = 0
+    chunk, errors = [], []
+
+    async def flush():
+        lines = errors + (await run_in_threadpool(_run_chunk, chunk) if chunk else [])
+        lines.sort(key=lambda line: line["index"])
+        return b"".join(encode_line(line, media_type) for line in lines)
+
+    async for raw in items:
+        try:
+            chunk.append((index, _parse_item(raw)))
+        except Exception as e:
+            errors.append({"index": index, "error": str(e)})
+        index += 1
+
+        if len(chunk) + len(errors) >= BATCH_CHUNK_SIZE:
+            yield await flush()
+            chunk, errors = [], []
+
+    if chunk or errors:
+        yield await flush()
+
+
+async def _analysis_response(request: Request, load, robustness: int = None, seed: int = None,
+                             fields: str = None) -> Response:
+    """
+    Awaits load() for a validated input and runs it on the executor.
+    Shared by the /analyse routes.
+    """
+    async def analyse():
+        validated = await load()
+        if fields:
+            names = tuple(f.strip() for f in fields.split(",") if f.strip())
+            body = await executor.run(validated, method="run_fields", args=(names,))
         else:
-            raise HTTPException(status_code=400, detail="Invalid tier value.")
+            body = (await executor.run(validated, method="run_validated")).model_dump()
+        public_report(body)
+        if robustness is not None:
+            body["robustness"] = await executor.run(
+                validated, method="robustness_validated", args=(robustness, seed),
+            )
+        return body
 
-        report = pipeline.run(request)
-        return report.dict()
+    return await _encoded_response(request, analyse)
 
-    except ValueError as e:
+
+async def _encoded_response(request: Request, produce) -> Response:
+    """
+    Awaits produce() for a response body and maps failures to status
+    codes: NotFound to 404, InvalidInput to 422, anything else to 500.
+    The body is encoded in the format the Accept header asks for
+    (api/encoding.py).
+    """
+    try:
+        body = await produce()
+        media_type = negotiate(request.headers.get("accept"))
+        content = encode(body, media_type)
+        _count_outcome("ok")
+        return Response(content, media_type=media_type)
+
+    except ExecutorBusy as e:
+        _count_outcome("busy")
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "1"})
+    except NotFound as e:
+        _count_outcome("not_found")
+        raise HTTPException(status_code=404, detail=str(e))
+    except InvalidInput as e:
+        _count_outcome("invalid")
         raise HTTPException(status_code=422, detail=str(e))
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Pipeline error: {str(e)}")
\ No newline at end of file
+        _count_outcome("error")
+        logger.exception("Pipeline error")
+        raise HTTPException(status_code=500, detail=f"Pipeline error: {str(e)}")
+
+
+@app.post("/analyse", openapi_extra=_request_body(MatchAnalysisRequest))
+async def analyse(request: Request, robustness: int = None, seed: int = None, fields: str = None):
+    """
+    Main endpoint. Accepts match data (a MatchAnalysisRequest as JSON)
+    and returns a full TacticalReport. The body is parsed and validated
+    in one pass by InputValidator.validate_json; the pipeline runs on
+    the configured executor and answers 429 when too many analyses
+    are already in flight.
+
+    ?robustness=N adds a "robustness" section: how often each decision
+    holds across N perturbed copies of the input (engine/robustness.py).
+    ?seed= makes the sampling repeatable.
+
+    ?fields=recommended_formation,press_intensity returns just those
+    report fields and runs only the stages they need (core/stage_graph.py).
+
+    Accept: application/msgpack answers in MessagePack instead of JSON.
+    """
+    async def load():
+        return pipeline.validate_json(await request.body())
+
+    return await _analysis_response(request, load, robustness, seed, fields)
+
+
+@app.get("/analyse/{team_id}/{opponent_id}")
+async def analyse_stored(request: Request, team_id: int, opponent_id: int, tier: DataTier = None,
+                         robustness: int = None, seed: int = None, fields: str = None):
+    """
+    /analyse from stored data: the last five results of both clubs,
+    the team's squad and, when every one of those fixtures has team
+    stats, tier 2 averages. ?tier= forces a tier. Stored player match
+    stats feed the squad selector's impact scores. ?fields= and
+    Accept as for POST /analyse.
+    """
+    async def load():
+        payload, squad_stats = await run_in_threadpool(team_store().analysis_input, team_id, opponent_id, tier)
+        validated = pipeline.validate_payload(payload)
+        for player, stats in zip(validated["players"], squad_stats):
+            if stats:
+                player["stats"] = stats
+        return validated
+
+    return await _analysis_response(request, load, robustness, seed, fields)
+
+
+@app.post("/analyse/batch")
+async def analyse_batch(request: Request):
+    """
+    Bulk endpoint. Accepts either a JSON list of analyse requests or an
+    NDJSON upload (Content-Type: application/x-ndjson, one request per
+    line) and streams NDJSON back, one line per item in input order:
+
+        {"index": 0, "report": {...}}
+        {"index": 1, "error": "..."}
+
+    NDJSON uploads are spooled to disk past BATCH_SPOOL_BYTES and read
+    back line by line, so memory stays flat however many fixtures are
+    sent. A JSON list has to be parsed in full first.
+
+    Accept: application/msgpack streams one MessagePack object per item
+    instead; Accept-Encoding: gzip compresses the stream as it goes.
+    """
+    content_type = request.headers.get("content-type", "")
+    if "ndjson" in content_type or "jsonl" in content_type:
+        items = _ndjson_items(await _spool_upload(request))
+    else:
+        try:
+            body = await request.json()
+        except ValueError:
+            raise HTTPException(status_code=422, detail="Body is not valid JSON.")
+        if not isinstance(body, list):
+            raise HTTPException(status_code=422, detail="Expected a JSON list of analyse requests.")
+        items = _list_items(body)
+
+    media_type = negotiate(request.headers.get("accept"))
+    stream = _stream_reports(items, media_type)
+    headers = {}
+    if accepts_gzip(request.headers.get("accept-encoding")):
+        stream = gzip_stream(stream)
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(stream, media_type=NDJSON if media_type == JSON else media_type,
+                             headers=headers)
+
+
+@app.post("/fixtures/analyse", openapi_extra=_request_body(FixtureRoundRequest))
+async def analyse_round(request: Request):
+    """
+    A whole round in one call. Body: each team once, and the fixtures
+    between them by team name (FixtureRoundRequest):
+
+        {"teams": [{"team_name": "Ashford", "last_5_results": [...], ...}, ...],
+         "fixtures": [{"home": "Ashford", "away": "Brampton"}, ...]}
+
+    A team with all five tier 2 averages is analysed at tier 2; each
+    side's opponent fields come from the other team's entry. Returns
+    both sides' reports for every fixture, in order:
+
+        {"fixtures": [{"home": ..., "away": ..., "home_report": {...}, "away_report": {...}}]}
+
+    Each team's indices and form are computed once for the round and
+    reused on both sides of its fixture (TactIQPipeline.run_round), so
+    the reports match POST /analyse for each side at a fraction of the
+    cost. Accept as for POST /analyse.
+    """
+    async def analyse():
+        teams, fixtures = pipeline.validator.validate_round_json(await request.body())
+        pairs = await executor.run(teams, method="run_round", args=(fixtures,))
+        return {"fixtures": [
+            {"home": home, "away": away,
+             "home_report": public_report(home_report.model_dump()),
+             "away_report": public_report(away_report.model_dump())}
+            for (home, away), (home_report, away_report) in zip(fixtures, pairs)
+        ]}
+
+    return await _encoded_response(request, analyse)
+
+
+@app.post("/analyse/sweep")
+async def analyse_sweep(request: Request):
+    """
+    What-if decision surface for heatmaps. Body:
+
+        {"request": {...analyse request...},
+         "axes": {"fatigue_risk_score": {"start": 0, "stop": 1, "steps": 100},
+                  "opponent_strength_index": {"start": 0.2, "stop": 0.9, "steps": 100}}}
+
+    Up to three of the indices the loaded rules read can be swept
+    (422 for any other); the rest keep the values the request itself
+    produces. Returns formation, defensive line, tactical focus, press
+    intensity and match risk for every grid cell (see
+    engine/decision_surface.py). Runs on the executor, so it answers
+    429 when too many analyses are in flight.
+    """
+    async def sweep():
+        try:
+            body = await request.json()
+        except ValueError:
+            raise InvalidInput("Body is not valid JSON.")
+        if not isinstance(body, dict) or not isinstance(body.get("axes"), dict):
+            raise InvalidInput("Expected {\"request\": {...}, \"axes\": {index: {start, stop, steps}}}.")
+        validated = pipeline.validate_payload(body.get("request"))
+        axes = {}
+        for name, axis in body["axes"].items():
+            try:
+                axis = SweepAxis.model_validate(axis)
+            except ValidationError as e:
+                raise InvalidInput(str(e)) from e
+            axes[name] = (axis.start, axis.stop, axis.steps)
+        return await executor.run(validated, method="sweep_validated", args=(axes,))
+
+    return await _encoded_response(request, sweep)
+
+
+# ── Pitch Rendering ────────────────────────────────────────────
+
+@app.post("/render")
+async def render(body: RenderRequest, format: str = "svg"):
+    """
+    The formation and starting XI of a report drawn on a pitch, as
+    ?format=svg (default) or png. Send recommended_formation,
+    starting_xi and team_name from an /analyse response. Repeat renders
+    of the same XI come from the renderer's cache.
+    """
+    if format not in FORMATS:
+        raise HTTPException(status_code=422, detail=f"format must be one of {FORMATS}.")
+    image = await run_in_threadpool(renderer.render, body.formation, body.starting_xi, body.team_name, format)
+    return Response(image, media_type=MEDIA_TYPES[format], headers={"Cache-Control": "max-age=3600"})
+
+
+# ── Clubs, Squads & Fixtures ───────────────────────────────────
+
+def _stored(fn, *args):
+    """Runs a TeamStore call, mapping NotFound, conflicts and InvalidInput to 404 / 409 / 422."""
+    from sqlalchemy.exc import IntegrityError
+
+    try:
+        return fn(*args)
+    except IntegrityError as e:
+        raise HTTPException(status_code=409, detail=f"Conflicts with stored data: {e.orig}")
+    except NotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except InvalidInput as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+@app.post("/clubs", status_code=201)
+def create_club(club: ClubIn):
+    return {"id": _stored(team_store().add_club, club.name)}
+
+
+@app.post("/clubs/{club_id}/players", status_code=201)
+def create_player(club_id: int, player: Player):
+    return {"id": _stored(team_store().add_player, club_id, player.model_dump(mode="json"))}
+
+
+@app.post("/fixtures", status_code=201)
+def create_fixture(fixture: FixtureIn):
+    result = fixture.result.model_dump() if fixture.result else {}
+    return {"id": _stored(
+        team_store().add_fixture, fixture.home_club_id, fixture.away_club_id, fixture.kickoff,
+        result.get("home_goals"), result.get("away_goals"), result.get("home_stats"), result.get("away_stats"),
+    )}
+
+
+@app.put("/fixtures/{fixture_id}/result", status_code=204)
+def record_result(fixture_id: int, result: ResultIn):
+    r = result.model_dump()
+    _stored(team_store().record_result, fixture_id, r["home_goals"], r["away_goals"], r["home_stats"], r["away_stats"])
+
+
+@app.get("/clubs/{club_id}/form")
+def club_form(club_id: int, windows: str = "5,10,20", halflife: float = None):
+    """
+    Rolling form over a club's whole stored history, e.g.
+    ?windows=5,10,20&halflife=8 for last-N windows plus an
+    exponentially weighted one.
+    """
+    try:
+        sizes = tuple(int(w) for w in windows.split(","))
+    except ValueError:
+        raise HTTPException(status_code=422, detail="windows must be comma-separated match counts.")
+    return _stored(team_store().form, club_id, sizes, halflife)
+
+
+@app.put("/players/{player_id}/stats", status_code=204)
+def record_player_stats(player_id: int, entry: PlayerStatsIn):
+    _stored(team_store().add_player_stats, player_id, entry.fixture_id, entry.stats)
@@ -0,0 +1,72 @@
+"""
+Benchmark: TactIQPipeline.run vs run_batch.
+
+Reports two numbers per size:
+  stages   — metrics, form, formation, press and mismatch only
+             (the part run_batch vectorizes)
+  pipeline — full run() loop vs run_batch(), including validation,
+             squad selection, rotation and the explainer
+
+Run from backend/ directory:
+    python -m benchmarks.bench_batch [sizes...]
+"""
+
+import sys
+import time
+
+from pipeline import TactIQPipeline
+from benchmarks.workloads import make_requests
+
+
+def _scalar_stages(p: TactIQPipeline, rows: list) -> list:
+    out = []
+    for data in rows:
+        data = p.metrics.calculate(data)
+        data = p.form.analyse(data)
+        data = p.formation.select(data)
+        data = p.press.recommend(data)
+        out.append(p.mismatch.detect(data))
+    return out
+
+
+def _batch_stages(p: TactIQPipeline, rows: list) -> dict:
+    cols = p.metrics.calculate_batch(rows)
+    cols.update(p.form.analyse_batch(rows))
+    cols.update(p.formation.select_batch(cols))
+    cols.update(p.press.recommend_batch(cols))
+    cols.update(p.mismatch.detect_batch(cols))
+    return cols
+
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main(sizes):
+    pipeline = TactIQPipeline()
+
+    print(f"{'requests':>10} | {'stages run':>10} {'batch':>8} {'speedup':>8} | "
+          f"{'pipeline run':>12} {'batch':>8} {'speedup':>8}")
+    for n in sizes:
+        requests = make_requests(n, seed=n)
+        rows = [pipeline.validator.validate(r) for r in requests]
+
+        _, stage_scalar_s = _timed(_scalar_stages, pipeline, rows)
+        _, stage_batch_s = _timed(_batch_stages, pipeline, rows)
+        del rows
+
+        scalar, run_s = _timed(lambda: [pipeline.run(r) for r in requests])
+        batch, batch_s = _timed(pipeline.run_batch, requests)
+
+        if any(a != b for a, b in zip(scalar, batch)):
+            raise SystemExit(f"run_batch diverged from run at n={n}")
+
+        print(f"{n:>10} | {stage_scalar_s:>9.3f}s {stage_batch_s:>7.3f}s "
+              f"{stage_scalar_s / stage_batch_s:>7.1f}x | "
+              f"{run_s:>11.3f}s {batch_s:>7.3f}s {run_s / batch_s:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [1_000, 10_000, 100_000])
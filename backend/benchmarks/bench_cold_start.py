@@ -0,0 +1,106 @@
+"""
+Benchmark: API process cold start, and the import-time budget check.
+
+Each figure comes from a fresh interpreter, as a new worker would be:
+
+    import api.main      `python -X importtime`, cumulative for api.main
+    eager equivalent     the same plus the modules now loaded lazily
+                         (scipy.optimize, scipy.signal, matplotlib,
+                         SQLAlchemy / db.store), i.e. the old import
+    first request        import, then one analysis with no warm-up
+    after warm-up        import, pipeline.warm_up(), then one analysis
+
+Exits with status 1 when importing api.main takes longer than budget_ms
+(median of the runs), so CI can enforce the budget. The ten slowest
+imports under api.main are listed to show what broke it.
+
+Run from backend/ directory:
+    python -m benchmarks.bench_cold_start [budget_ms] [runs]
+"""
+
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+LAZY_MODULES = ("scipy.optimize", "scipy.signal", "matplotlib.figure", "db.store")
+
+_FIRST_REQUEST = """
+import json, time
+from core.payloads import SAMPLE_PAYLOAD
+from api.main import pipeline
+raw = json.dumps(dict(SAMPLE_PAYLOAD, tier2_data=dict(SAMPLE_PAYLOAD["tier2_data"], team_name="Cold FC")))
+{warm}
+start = time.perf_counter()
+pipeline.run_validated(pipeline.validate_json(raw))
+print(time.perf_counter() - start)
+"""
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def _python(code: str, *flags) -> subprocess.CompletedProcess:
+    env = dict(os.environ, GAFFEROS_CACHE_SIZE="0")
+    return subprocess.run([sys.executable, *flags, "-c", code], capture_output=True, text=True, env=env, check=True)
+
+
+def _top_level(lines: list) -> list:
+    """(cumulative ms, module) for each import made directly by the statement."""
+    found = []
+    for line in lines:
+        match = _LINE.match(line)
+        if match and len(match.group(3)) == 1:
+            found.append((int(match.group(2)) / 1e3, match.group(4)))
+    return found
+
+
+def import_profile(modules=("api.main",)) -> tuple:
+    """(total ms for the import statement, [(cumulative ms, module)] directly under api.main)."""
+    startup = {name for _, name in _top_level(_python("pass", "-X", "importtime").stderr.splitlines())}
+    lines = _python("import " + ", ".join(modules), "-X", "importtime").stderr.splitlines()
+    total = sum(ms for ms, name in _top_level(lines) if name not in startup)
+    # Children print before their parent: keep those since the last top-level line
+    children = []
+    for line in lines:
+        match = _LINE.match(line)
+        if not match:
+            continue
+        depth, name = len(match.group(3)), match.group(4)
+        if depth == 1:
+            if name == "api.main":
+                break
+            children = []
+        elif depth == 3:
+            children.append((int(match.group(2)) / 1e3, name))
+    return total, children
+
+
+def main(budget_ms: float = 800.0, runs: int = 5):
+    profiles = [import_profile() for _ in range(runs)]
+    import_ms = statistics.median(total for total, _ in profiles)
+    eager_ms = statistics.median(import_profile(("api.main",) + LAZY_MODULES)[0] for _ in range(runs))
+    first_ms = statistics.median(
+        float(_python(_FIRST_REQUEST.format(warm="")).stdout) * 1e3 for _ in range(runs)
+    )
+    warm_ms = statistics.median(
+        float(_python(_FIRST_REQUEST.format(warm="pipeline.warm_up()")).stdout) * 1e3 for _ in range(runs)
+    )
+
+    print(f"median of {runs} fresh interpreters\n")
+    print(f"{'import api.main':<24} {import_ms:>9.0f} ms   (budget {budget_ms:.0f} ms)")
+    print(f"{'eager equivalent':<24} {eager_ms:>9.0f} ms")
+    print(f"{'first request':<24} {first_ms:>9.1f} ms")
+    print(f"{'after warm-up':<24} {warm_ms:>9.1f} ms")
+
+    print("\nslowest imports under api.main:")
+    for ms, name in sorted(profiles[0][1], reverse=True)[:10]:
+        print(f"  {name:<30} {ms:>8.1f} ms")
+
+    if import_ms > budget_ms:
+        print(f"\nFAIL: importing api.main took {import_ms:.0f} ms, budget is {budget_ms:.0f} ms.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(*[float(a) for a in sys.argv[1:2]], *[int(a) for a in sys.argv[2:3]])
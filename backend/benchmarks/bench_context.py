@@ -0,0 +1,77 @@
+"""
+Benchmark: stage chain on a MatchContext vs plain dicts.
+
+Runs stages 2-7 on one validated 40-player request, once passing a
+MatchContext (filled in place, what the pipeline does) and once
+passing a plain dict (each stage goes through the @context_stage
+compatibility adapter and returns a copy). Reports mean latency and
+tracemalloc's peak / retained bytes per run.
+
+Run from backend/ directory:
+    python -m benchmarks.bench_context [squad_size]
+"""
+
+import random
+import sys
+import time
+import tracemalloc
+
+from core.context import MatchContext
+from core.schemas import DataTier
+from pipeline import TactIQPipeline
+from benchmarks.workloads import make_request
+
+
+def _stages(p: TactIQPipeline, data):
+    data = p.metrics.calculate(data)
+    data = p.form.analyse(data)
+    data = p.formation.select(data)
+    data = p.press.recommend(data)
+    data = p.mismatch.detect(data)
+    data = p.squad_selector.select(data)
+    data = p.rotation.advise(data)
+    return p.explainer.explain(data)
+
+
+def _latency(fn, repeat: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def _allocations(fn) -> tuple:
+    """(peak bytes, total bytes allocated) for one call."""
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    before = tracemalloc.take_snapshot()
+    fn()
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    total = sum(stat.size_diff for stat in after.compare_to(before, "lineno") if stat.size_diff > 0)
+    return peak, total
+
+
+def main(squad_size: int = 40, repeat: int = 2000):
+    p = TactIQPipeline()
+    request = make_request(random.Random(0), DataTier.TIER_2, squad_size)
+    validated = p.validator.validate(request)
+
+    variants = {
+        "dict adapter": lambda: _stages(p, dict(validated)),
+        "MatchContext": lambda: _stages(p, MatchContext.from_dict(validated)),
+    }
+    assert variants["dict adapter"]()["reasoning"] == variants["MatchContext"]()["reasoning"]
+
+    print(f"{squad_size}-player squad, {repeat} runs")
+    print(f"{'variant':>14} {'latency us':>11} {'peak B':>9} {'retained B':>11}")
+    for name, fn in variants.items():
+        latency = _latency(fn, repeat)
+        peak, total = _allocations(fn)
+        print(f"{name:>14} {latency * 1e6:>11.1f} {peak:>9} {total:>11}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 40)
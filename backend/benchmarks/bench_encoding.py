@@ -0,0 +1,98 @@
+"""
+Benchmark: /analyse response encoding for a 25-player squad.
+
+    before        report.dict() through FastAPI's jsonable_encoder and
+                  JSONResponse, internal player keys included
+    json          public_report(model_dump()), json.dumps fallback
+    orjson        the same, encoded by orjson
+    msgpack       the same as MessagePack
+
+Squads carry stored season stats, as GET /analyse/{team_id}/{opponent_id}
+attaches them. Reports time the encoding alone, from the finished
+TacticalReport to response bytes. The batch rows show the size of a
+200-report NDJSON stream with and without gzip_stream().
+
+Run from backend/ directory:
+    python -m benchmarks.bench_encoding [reports]
+"""
+
+import asyncio
+import json
+import random
+import sys
+import timeit
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+import api.encoding as encoding
+from api.encoding import JSON, MSGPACK, encode, encode_line, gzip_stream, public_report
+from core.schemas import DataTier
+from pipeline import TactIQPipeline
+from benchmarks.workloads import make_player_stats, make_request
+
+SQUAD = 25
+
+
+def _reports(n: int) -> list:
+    rng = random.Random(8)
+    pipeline = TactIQPipeline()
+    reports = []
+    for _ in range(n):
+        validated = pipeline.validator.validate(make_request(rng, DataTier.TIER_1, SQUAD))
+        for player in validated["players"]:
+            player["stats"] = make_player_stats(rng)
+        reports.append(pipeline.run_validated(validated))
+    return reports
+
+
+def _before(report) -> bytes:
+    return JSONResponse(jsonable_encoder(report.model_dump())).body  # report.dict(), minus the warning
+
+
+def _json_fallback(report) -> bytes:
+    orjson, encoding.orjson = encoding.orjson, None
+    try:
+        return encode(public_report(report.model_dump()), JSON)
+    finally:
+        encoding.orjson = orjson
+
+
+async def _drain(chunks) -> bytes:
+    return b"".join([chunk async for chunk in chunks])
+
+
+async def _lines(lines: list):
+    for line in lines:
+        yield line
+
+
+def main(n: int = 200):
+    reports = _reports(n)
+    rows = (
+        ("before", _before),
+        ("json", _json_fallback),
+        ("orjson", lambda r: encode(public_report(r.model_dump()), JSON)),
+        ("msgpack", lambda r: encode(public_report(r.model_dump()), MSGPACK)),
+    )
+    assert json.loads(rows[2][1](reports[0])) == json.loads(rows[1][1](reports[0]))
+
+    print(f"{n} reports, {SQUAD}-player squads\n")
+    print(f"{'encoding':<10} {'us/report':>10} {'bytes/report':>13} {'speed-up':>9}")
+    base_us = None
+    for name, fn in rows:
+        us = min(timeit.repeat(lambda: [fn(r) for r in reports], number=1, repeat=5)) / n * 1e6
+        size = sum(len(fn(r)) for r in reports) / n
+        base_us = base_us or us
+        print(f"{name:<10} {us:>10.1f} {size:>13.0f} {base_us / us:>8.1f}x")
+
+    before = b"".join(_before(r) + b"\n" for r in reports)
+    lines = [encode_line({"index": i, "report": public_report(r.model_dump())}) for i, r in enumerate(reports)]
+    plain = b"".join(lines)
+    gzipped = asyncio.run(_drain(gzip_stream(_lines(lines))))
+    print(f"\nbatch stream of {n}: before {len(before) / 1024:.0f} KB, "
+          f"now {len(plain) / 1024:.0f} KB, gzipped {len(gzipped) / 1024:.0f} KB")
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:]])
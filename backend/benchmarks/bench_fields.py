@@ -0,0 +1,57 @@
+"""
+Benchmark: full analyses vs run_fields() for a subset of the report.
+
+    full            run_validated(): all eight stages, then the report
+    formation+press run_fields() for recommended_formation and
+                    press_intensity: metrics, form, formation, press
+    all fields      run_fields() for every field, so the overhead of
+                    planning and slicing against the full run
+    all, N workers  the same with stage_workers=N: press, mismatch,
+                    formation and ML share a level and run side by side
+
+With make_model() loaded, so the ML stage is part of the full run.
+Every run_fields() result is checked against the full report.
+
+Run from backend/ directory:
+    python -m benchmarks.bench_fields [requests] [workers]
+"""
+
+import sys
+import timeit
+
+from pipeline import TactIQPipeline
+from benchmarks.workloads import make_model, make_requests
+
+SUBSET = ("recommended_formation", "press_intensity")
+
+
+def main(n: int = 500, workers: int = 4):
+    model = make_model()
+    serial = TactIQPipeline(ml_model=model)
+    pooled = TactIQPipeline(ml_model=model, stage_workers=workers)
+    validated = [serial.validator.validate(r) for r in make_requests(n, seed=5)]
+
+    everything = serial.REPORT_FIELDS
+    for v in validated:
+        report = serial.run_validated(v).model_dump()
+        assert serial.run_fields(v, SUBSET) == {f: report[f] for f in SUBSET}
+        assert pooled.run_fields(v, everything) == report
+
+    rows = (
+        ("full", lambda: [serial.run_validated(v) for v in validated]),
+        ("formation+press", lambda: [serial.run_fields(v, SUBSET) for v in validated]),
+        ("all fields", lambda: [serial.run_fields(v, everything) for v in validated]),
+        (f"all, {workers} workers", lambda: [pooled.run_fields(v, everything) for v in validated]),
+    )
+    print(f"{n} requests, plan for {SUBSET}: {serial.stage_graph().plan(SUBSET)}\n")
+    print(f"{'path':<20} {'ms/request':>11} {'vs full':>8}")
+    base = None
+    for name, fn in rows:
+        ms = min(timeit.repeat(fn, number=1, repeat=5)) / n * 1e3
+        base = base or ms
+        print(f"{name:<20} {ms:>11.4f} {base / ms:>7.2f}x")
+    pooled.stage_pool.shutdown()
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:]])
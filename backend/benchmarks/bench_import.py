@@ -0,0 +1,106 @@
+"""
+Benchmark: streaming league import into tier 2 aggregates.
+
+Writes a synthetic team-layout export (rows × 10 columns, 500 teams)
+as CSV and Parquet, a chunk at a time, then reports for each format:
+
+    rows/sec      LeagueImporter.import_file(), window=5
+    peak MB       tracemalloc peak during the import
+
+and the same for loading the whole file with pandas and grouping it,
+the by-hand route. Run at two file sizes: the importer's peak should
+stay flat while the whole-file load grows with the file.
+
+Run from backend/ directory:
+    python -m benchmarks.bench_import [rows] [chunk_size]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from db.league_import import STAT_COLUMNS, TEAM_COLUMNS, LeagueImporter
+
+N_TEAMS = 500
+WRITE_CHUNK = 250_000
+
+
+def write_exports(directory: str, rows: int, seed: int = 0) -> dict:
+    """Synthetic export in date order, written in chunks; returns {format: path}."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    rng = np.random.default_rng(seed)
+    teams = np.array([f"Team {i:03d}" for i in range(N_TEAMS)])
+    paths = {"csv": os.path.join(directory, "league.csv"), "parquet": os.path.join(directory, "league.parquet")}
+    writer = None
+    day0 = np.datetime64("2000-01-01")
+
+    for start in range(0, rows, WRITE_CHUNK):
+        n = min(WRITE_CHUNK, rows - start)
+        index = np.arange(start, start + n)
+        frame = pd.DataFrame({
+            "date": day0 + (index // N_TEAMS).astype("timedelta64[D]"),
+            "team": teams[index % N_TEAMS],
+            "opponent": teams[(index + 1) % N_TEAMS],
+            "goals_for": rng.poisson(1.4, n),
+            "goals_against": rng.poisson(1.4, n),
+            "possession": rng.uniform(30, 70, n).round(1),
+            "passing_accuracy": rng.uniform(60, 92, n).round(1),
+            "shots": rng.integers(3, 22, n),
+            "shots_on_target": rng.integers(0, 9, n),
+            "defensive_errors": rng.integers(0, 4, n),
+        })[list(TEAM_COLUMNS)]
+        frame.to_csv(paths["csv"], mode="a", header=start == 0, index=False)
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        if writer is None:
+            writer = pq.ParquetWriter(paths["parquet"], table.schema)
+        writer.write_table(table)
+
+    writer.close()
+    return paths
+
+
+def whole_file(path: str) -> pd.DataFrame:
+    frame = pd.read_parquet(path) if path.endswith(".parquet") else pd.read_csv(path, parse_dates=["date"])
+    frame = frame.sort_values(["team", "date"], kind="stable")
+    return frame.groupby("team").tail(5).groupby("team")[list(STAT_COLUMNS)].mean()
+
+
+def _measure(fn) -> tuple:
+    """(seconds, peak MB) — timed without tracing, then traced for memory."""
+    start = time.perf_counter()
+    fn()
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak / 2**20
+
+
+def main(rows: int = 2_000_000, chunk_size: int = 100_000):
+    importer = LeagueImporter(window=5, chunk_size=chunk_size)
+    print(f"chunk_size {chunk_size:,}, {N_TEAMS} teams\n")
+    print(f"{'rows':>10} {'format':<8} {'file MB':>8} {'method':<12} {'rows/sec':>12} {'peak MB':>8}")
+
+    for n in (rows // 4, rows):
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = write_exports(tmp, n)
+            for fmt, path in paths.items():
+                size = os.path.getsize(path) / 2**20
+                streamed = importer.import_file(path).averages
+                assert np.allclose(streamed.to_numpy(), whole_file(path).round(3).to_numpy())
+                for name, fn in (("streaming", lambda: importer.import_file(path)),
+                                 ("whole file", lambda: whole_file(path))):
+                    seconds, peak = _measure(fn)
+                    print(f"{n:>10,} {fmt:<8} {size:>8.1f} {name:<12} {n / seconds:>12,.0f} {peak:>8.1f}")
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:]])
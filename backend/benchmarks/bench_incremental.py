@@ -0,0 +1,43 @@
+"""
+Benchmark: full run() vs update_players() after a fitness change.
+
+Also checks that the incremental report equals a full run on the
+edited request.
+
+Run from backend/ directory:
+    python -m benchmarks.bench_incremental [squad_size]
+"""
+
+import random
+import sys
+import timeit
+
+from core.schemas import DataTier
+from pipeline import TactIQPipeline
+from benchmarks.workloads import make_request
+
+
+def main(squad_size: int = 25, number: int = 2000):
+    p = TactIQPipeline()
+    request = make_request(random.Random(0), DataTier.TIER_2, squad_size)
+    _, state = p.run_with_state(request)
+
+    target = request.tier2_data.players[0]
+    changes = {target.name: {"fitness_score": 0.4, "available": False}}
+
+    edited = request.model_copy(deep=True)
+    edited.tier2_data.players[0].fitness_score = 0.4
+    edited.tier2_data.players[0].available = False
+    incremental, _ = p.update_players(state, changes)
+    assert incremental == p.run(edited), "update_players diverged from run()"
+
+    full_s = timeit.timeit(lambda: p.run(edited), number=number) / number
+    inc_s = timeit.timeit(lambda: p.update_players(state, changes), number=number) / number
+
+    print(f"{squad_size}-player squad, {number} runs")
+    print(f"  run()            {full_s * 1e6:8.1f} us")
+    print(f"  update_players() {inc_s * 1e6:8.1f} us   ({full_s / inc_s:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 25)
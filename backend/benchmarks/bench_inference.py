@@ -0,0 +1,66 @@
+"""
+Benchmark: ML inference paths with a scikit-learn stand-in model.
+
+1. Feature rows: to_list() per context vs one to_matrix() call.
+2. Prediction: one-row predict_proba per context (the old hook) vs
+   predict_rows(), a single call for the whole matrix.
+3. Micro-batching: concurrent threads each calling predict(), for a
+   few max_rows settings. Reports throughput and how many
+   predict_proba calls were actually made.
+
+Every path is checked against the one-row results.
+
+Run from backend/ directory:
+    python -m benchmarks.bench_inference [contexts] [threads]
+"""
+
+import sys
+import time
+import timeit
+from concurrent.futures import ThreadPoolExecutor
+
+from core.inference import MLInference
+from pipeline import TactIQPipeline
+from benchmarks.workloads import make_requests, make_model
+
+
+def main(n: int = 2000, threads: int = 32):
+    model = make_model()
+    pipeline = TactIQPipeline()
+    contexts = [pipeline.run_with_state(r)[1] for r in make_requests(n, seed=3)]
+    features = pipeline.features
+
+    def one_row():
+        return [MLInference._probabilities(model.predict_proba([features.to_list(c)])[0]) for c in contexts]
+
+    reference = one_row()
+    inference = MLInference(model)
+    assert inference.predict_rows(contexts) == reference
+
+    rows_ms = min(timeit.repeat(lambda: [features.to_list(c) for c in contexts], number=5, repeat=3)) / 5 * 1e3
+    matrix_ms = min(timeit.repeat(lambda: features.to_matrix(contexts), number=5, repeat=3)) / 5 * 1e3
+    single_ms = min(timeit.repeat(one_row, number=1, repeat=3)) * 1e3
+    batch_ms = min(timeit.repeat(lambda: inference.predict_rows(contexts), number=5, repeat=3)) / 5 * 1e3
+
+    print(f"{n} contexts")
+    print(f"  features   to_list x{n}: {rows_ms:8.2f} ms   to_matrix: {matrix_ms:8.2f} ms")
+    print(f"  predict    one-row x{n}: {single_ms:8.2f} ms   predict_rows: {batch_ms:8.2f} ms")
+
+    print(f"\nmicro-batching, {threads} threads")
+    print(f"{'max_rows':>9} {'preds/s':>10} {'calls':>7} {'rows/call':>10}")
+    for max_rows in (1, 8, 32, 64):
+        inference = MLInference(model, max_rows=max_rows, max_wait_ms=2.0)
+        with ThreadPoolExecutor(threads) as pool:
+            start = time.perf_counter()
+            results = list(pool.map(inference.predict, contexts))
+            elapsed = time.perf_counter() - start
+        inference.close()
+        assert results == reference
+
+        stats = inference.stats()
+        print(f"{max_rows:>9} {n / elapsed:>10.0f} {stats['predict_calls']:>7} "
+              f"{stats['successes'] / stats['predict_calls']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:]])
@@ -0,0 +1,94 @@
+"""
+Benchmark: per-worker memory for a registry model, 1 vs 8 workers,
+memory-mapped vs unpickled per process.
+
+Publishes a random forest (large tree arrays, as a real Phase 2 model
+would have) to a temporary registry. Then starts N spawned worker
+processes, as `uvicorn --workers N` does. Each builds a pipeline on the
+registry, warms up (loads the model), analyses a batch and then scores
+20,000 random feature rows, which reaches most tree nodes the way a
+long run of traffic would. While all workers are alive, each reads
+/proc/self/smaps_rollup:
+
+    RSS   resident pages, shared ones counted in full by every worker
+    PSS   shared pages split between the processes mapping them,
+          i.e. what each worker really costs
+    none  a worker with no registry, for the baseline
+
+Linux only (smaps_rollup).
+
+Run from backend/ directory:
+    python -m benchmarks.bench_model_memory [trees]
+"""
+
+import multiprocessing as mp
+import os
+import sys
+import tempfile
+
+WORKER_COUNTS = (1, 8)
+
+
+def _smaps() -> dict:
+    with open("/proc/self/smaps_rollup") as f:
+        fields = dict(line.split(":", 1) for line in f if ":" in line and not line.startswith("0"))
+    return {key: int(fields[key].split()[0]) / 1024 for key in ("Rss", "Pss")}
+
+
+def _worker(root, mmap, barrier, results):
+    import numpy as np
+    from core.model_registry import ModelRegistry
+    from pipeline import TactIQPipeline
+    from benchmarks.workloads import make_requests
+
+    models = ModelRegistry(root, mmap=mmap) if root else None
+    pipeline = TactIQPipeline(models=models)
+    pipeline.warm_up()
+    pipeline.run_batch(make_requests(50, seed=os.getpid()))
+    if pipeline.ml_model is not None:
+        rows = np.random.default_rng(os.getpid()).uniform(0, 1, size=(20_000, len(pipeline.features.FEATURE_KEYS)))
+        pipeline.ml_model.predict_proba(rows)
+    barrier.wait()
+    results.put(_smaps())
+    barrier.wait()
+
+
+def _run(workers: int, root, mmap: bool) -> tuple:
+    ctx = mp.get_context("spawn")
+    barrier = ctx.Barrier(workers)
+    results = ctx.Queue()
+    procs = [ctx.Process(target=_worker, args=(root, mmap, barrier, results)) for _ in range(workers)]
+    for p in procs:
+        p.start()
+    rows = [results.get() for _ in procs]
+    for p in procs:
+        p.join()
+    return (sum(r["Rss"] for r in rows) / workers, sum(r["Pss"] for r in rows) / workers)
+
+
+def _model(trees: int):
+    import numpy as np
+    from sklearn.ensemble import RandomForestClassifier
+    from core.feature_builder import FeatureBuilder
+
+    rng = np.random.default_rng(0)
+    X = rng.uniform(0, 1, size=(20_000, len(FeatureBuilder.FEATURE_KEYS)))
+    y = rng.integers(0, 3, size=len(X))
+    return RandomForestClassifier(n_estimators=trees, min_samples_leaf=2, random_state=0, n_jobs=1).fit(X, y)
+
+
+def main(trees: int = 60):
+    from core.model_registry import ModelRegistry
+
+    with tempfile.TemporaryDirectory() as root:
+        path = ModelRegistry(root).publish(_model(trees), "bench")
+        print(f"random forest, {trees} trees, artifact {path.stat().st_size / 2**20:.0f} MB\n")
+        print(f"{'workers':>7} {'model':<10} {'RSS MB/worker':>14} {'PSS MB/worker':>14} {'PSS MB total':>13}")
+        for workers in WORKER_COUNTS:
+            for label, registry, mmap in (("none", None, False), ("unpickled", root, False), ("mmap", root, True)):
+                rss, pss = _run(workers, registry, mmap)
+                print(f"{workers:>7} {label:<10} {rss:>14.0f} {pss:>14.0f} {pss * workers:>13.0f}")
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:]])
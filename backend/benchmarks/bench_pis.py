@@ -0,0 +1,61 @@
+"""
+Benchmark: scalar _calculate_pis vs calculate_pis_batch.
+
+"scalar x2" is the old SquadSelector cost: PIS computed once inside
+_selection_score and again for _pis. "batch cold" clears the
+fingerprint cache first; "batch warm" is a repeat run (e.g. another
+risk level). Also checks agreement with the scalar function to 1e-9.
+
+Run from backend/ directory:
+    python -m benchmarks.bench_pis [squad sizes...]
+"""
+
+import random
+import sys
+import timeit
+
+from engine import squad_selector as ss
+from benchmarks.workloads import make_player
+
+
+def make_squad(n: int, seed: int) -> list:
+    rng = random.Random(seed)
+    squad = []
+    for i in range(n):
+        p = make_player(rng, i).model_dump(mode="json")
+        mp = rng.randint(0, 30)
+        p["stats"] = {"matches_played": mp}
+        p["stats"].update({key: rng.randint(0, 3 * mp + 1) for key in ss.PIS_STAT_KEYS})
+        squad.append(p)
+    return squad
+
+
+def _cold(squad):
+    ss._pis_cache.clear()
+    return ss.calculate_pis_batch(squad)
+
+
+def main(sizes):
+    print(f"{'players':>8} {'scalar x2 us':>13} {'batch cold us':>14} {'batch warm us':>14}")
+    for n in sizes:
+        squad = make_squad(n, seed=n)
+
+        for p, value in zip(squad, _cold(squad)):
+            expected = ss._calculate_pis(p)
+            assert (value is None) == (expected is None)
+            assert value is None or abs(value - expected) < 1e-9, (value, expected)
+
+        number = max(20, 20000 // n)
+        scalar = timeit.timeit(
+            lambda: [(ss._selection_score(p, "Medium"), ss._calculate_pis(p)) for p in squad],
+            number=number,
+        ) / number
+        cold = timeit.timeit(lambda: _cold(squad), number=number) / number
+        ss.calculate_pis_batch(squad)
+        warm = timeit.timeit(lambda: ss.calculate_pis_batch(squad), number=number) / number
+
+        print(f"{n:>8} {scalar * 1e6:>13.1f} {cold * 1e6:>14.1f} {warm * 1e6:>14.1f}")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [11, 25, 60, 200, 1000])
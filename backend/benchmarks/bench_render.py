@@ -0,0 +1,131 @@
+"""
+Benchmark: pitch rendering, old Streamlit drawing vs PitchRenderer.
+
+    pyplot         what frontend/ui/app.py did on every rerun. It built
+                   the whole 8 × 11 figure with pyplot, drew it to PNG
+                   and never closed it.
+    PNG / SVG      PitchRenderer with its cache off. The pitch is drawn
+                   once; each render only draws the markers.
+    cached         PitchRenderer hit for an XI it has already drawn.
+
+Reports the median render time, and the memory still held after a
+second pass of `renders` renders (tracemalloc). The second figure
+shows the unclosed figures piling up.
+
+Run from backend/ directory:
+    python -m benchmarks.bench_render [renders]
+"""
+
+import gc
+import io
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.patches as patches
+import matplotlib.pyplot as plt
+
+from core.pitch_renderer import PitchRenderer, layout
+from core.schemas import DataTier
+from pipeline import TactIQPipeline
+from benchmarks.workloads import make_request
+
+
+def pyplot_render(formation: str, xi: list, team_name: str) -> bytes:
+    """The app's original drawing code, condensed; the figure is left open as it was."""
+    fig, ax = plt.subplots(figsize=(8, 11))
+    fig.patch.set_facecolor("#2d5a27")
+    ax.set_facecolor("#2d5a27")
+    w, h = 100, 130
+    ax.add_patch(patches.Rectangle((5, 5), w - 10, h - 10, linewidth=2, edgecolor="white", facecolor="none"))
+    ax.plot([5, w - 5], [h / 2, h / 2], color="white", linewidth=1.5)
+    ax.add_patch(plt.Circle((w / 2, h / 2), 10, color="white", fill=False, linewidth=1.5))
+    ax.plot(w / 2, h / 2, "o", color="white", markersize=3)
+    for x, y, bw, bh, lw in ((27, 5, 46, 18, 1.5), (27, h - 23, 46, 18, 1.5), (38, 5, 24, 8, 1), (38, h - 13, 24, 8, 1)):
+        ax.add_patch(patches.Rectangle((x, y), bw, bh, linewidth=lw, edgecolor="white", facecolor="none"))
+
+    for x, y, player in layout(formation, xi):
+        fitness = (player.get("fitness_score") or 0) if player else 0
+        ax.add_patch(plt.Circle((x, y), 4.5, color="#1a3a8f" if fitness >= 0.65 else "#8b0000", zorder=3))
+        ax.add_patch(plt.Circle((x, y), 4.5, color="white", fill=False, linewidth=1.5, zorder=4))
+        if player:
+            ax.text(x, y + 0.5, player["name"].split()[-1], ha="center", va="center",
+                    fontsize=5.5, color="white", fontweight="bold", zorder=5)
+            ax.text(x, y - 1.8, player["specific_position"], ha="center", va="center",
+                    fontsize=4.5, color="#ffdd88", zorder=5)
+            ax.text(x, y - 3.5, f"{int(fitness * 100)}%", ha="center", va="center",
+                    fontsize=4.0, color="#aaffaa", zorder=5)
+        else:
+            ax.text(x, y, "?", ha="center", va="center", fontsize=8, color="white", zorder=5)
+
+    ax.plot([], [], "o", color="#1a3a8f", label="Fit (≥65%)", markersize=8)
+    ax.plot([], [], "o", color="#8b0000", label="Fatigue risk (<65%)", markersize=8)
+    ax.legend(loc="lower center", fontsize=7, facecolor="#1a1a1a", labelcolor="white", framealpha=0.8, ncol=2)
+    ax.text(w / 2, h - 2, f"{team_name}  ·  {formation}", ha="center", va="top",
+            fontsize=9, color="white", fontweight="bold")
+    ax.set_xlim(0, w)
+    ax.set_ylim(0, h)
+    ax.axis("off")
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png")  # st.pyplot does the same
+    return buffer.getvalue()
+
+
+def _xis(n: int) -> list:
+    """n reports with different XIs, like swap-panel edits."""
+    pipeline = TactIQPipeline()
+    rng = random.Random(4)
+    out = []
+    for _ in range(n):
+        report = pipeline.run(make_request(rng, DataTier.TIER_1, 18))
+        out.append((report.recommended_formation, report.starting_xi, report.team_name))
+    return out
+
+
+def _run(fn, xis: list) -> tuple:
+    """(median ms, MB still allocated after all renders) — timed, then traced in a second pass."""
+    times = []
+    for formation, xi, team in xis:
+        start = time.perf_counter()
+        fn(formation, xi, team)
+        times.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    for formation, xi, team in xis:
+        fn(formation, xi, team)
+    gc.collect()
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return statistics.median(times) * 1e3, held / 2**20
+
+
+def main(renders: int = 30):
+    xis = _xis(renders)
+    png = PitchRenderer(cache_size=0)
+    svg = PitchRenderer(cache_size=0)
+    cached = PitchRenderer()
+    png.render(*xis[0], "png")  # draws the static pitch
+    for x in xis:
+        cached.render(*x, "png")
+
+    rows = (
+        ("pyplot, figure left open", lambda f, xi, t: pyplot_render(f, xi, t)),
+        ("PitchRenderer PNG", lambda f, xi, t: png.render(f, xi, t, "png")),
+        ("PitchRenderer SVG", lambda f, xi, t: svg.render(f, xi, t, "svg")),
+        ("PitchRenderer cached PNG", lambda f, xi, t: cached.render(f, xi, t, "png")),
+    )
+    print(f"{renders} renders, each a different XI\n")
+    print(f"{'method':<28} {'median ms':>10} {'MB held after':>14}")
+    for name, fn in rows:
+        ms, mb = _run(fn, xis)
+        print(f"{name:<28} {ms:>10.3f} {mb:>14.2f}")
+    print(f"\nopen pyplot figures: {len(plt.get_fignums())}")
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:]])
@@ -0,0 +1,72 @@
+"""
+Benchmark: Monte Carlo robustness mode.
+
+1. RobustnessAnalyser.analyse() for a few sample counts, in process.
+2. The same with chunks mapped over a ProcessPoolExecutor — checked
+   to give identical counts for the same seed. Only pays off with
+   several cores and large sample counts.
+3. For scale: the scalar stages (metrics → press) on one perturbed
+   MatchContext per sample, the cost of one pipeline pass per guess.
+
+Run from backend/ directory:
+    python -m benchmarks.bench_robustness [workers]
+"""
+
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from core.context import MatchContext
+from core.schemas import DataTier
+from pipeline import TactIQPipeline
+from benchmarks.workloads import make_request
+
+
+def _timed(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1e3
+
+
+def main(workers: int = 2):
+    pipeline = TactIQPipeline()
+    validated = pipeline.validator.validate(make_request(random.Random(9), DataTier.TIER_1, 18))
+    analyser = pipeline.robustness
+
+    print("analyse(), in process")
+    for n in (1_000, 10_000, 100_000):
+        ms = _timed(lambda: analyser.analyse(validated, n, seed=1))
+        print(f"  {n:>7} samples: {ms:8.1f} ms   {ms / n * 1e3:6.2f} us/sample")
+
+    with ProcessPoolExecutor(workers) as pool:
+        analyser.analyse(validated, 100, seed=1, pool=pool)  # start the workers
+        for n in (10_000, 100_000):
+            assert analyser.analyse(validated, n, seed=1, pool=pool) == analyser.analyse(validated, n, seed=1)
+        print(f"\nanalyse(), {workers} worker processes")
+        for n in (10_000, 100_000):
+            ms = _timed(lambda: analyser.analyse(validated, n, seed=1, pool=pool))
+            print(f"  {n:>7} samples: {ms:8.1f} ms")
+
+    rng = random.Random(1)
+    n = 2_000
+    contexts = []
+    for _ in range(n):
+        ctx = MatchContext.from_dict(validated)
+        ctx.last_5_results = rng.choices("WDL", k=len(validated["last_5_results"]))
+        contexts.append(ctx)
+
+    def scalar():
+        for ctx in contexts:
+            data = pipeline.form.analyse(pipeline.metrics.calculate(ctx.copy()))
+            pipeline.press.recommend(pipeline.formation.select(data))
+
+    ms = _timed(scalar)
+    print(f"\nscalar stages per sample: {ms / n * 1e3:6.2f} us/sample")
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:]])
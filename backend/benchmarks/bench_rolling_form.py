@@ -0,0 +1,112 @@
+"""
+Benchmark: rolling form over long match histories.
+
+For a synthetic league history (n_clubs × matches each) with windows
+5/10/20 and an exponentially weighted window:
+
+1. backfill()      form after every match from cumulative sums
+2. RollingForm     the same, one append() per match
+3. re-slicing      the same windows recomputed from history slices at
+                   every match, as FormAnalyser would (window only, no
+                   goal rates or stability)
+
+Checks that 1 and 2 agree exactly.
+
+Run from backend/ directory:
+    python -m benchmarks.bench_rolling_form [n_clubs] [matches_per_club]
+"""
+
+import random
+import sys
+import time
+
+from core.form_analyser import FormAnalyser
+from core.rolling_form import RollingForm, backfill
+
+WINDOWS = (5, 10, 20)
+HALFLIFE = 8
+
+
+def _history(n_clubs: int, per_club: int, seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    h = {"club_id": [], "result": [], "scored": [], "conceded": []}
+    for club in range(n_clubs):
+        for _ in range(per_club):
+            scored, conceded = rng.randint(0, 4), rng.randint(0, 4)
+            h["club_id"].append(club)
+            h["result"].append("W" if scored > conceded else "L" if scored < conceded else "D")
+            h["scored"].append(scored)
+            h["conceded"].append(conceded)
+    return h
+
+
+def _timed(fn) -> tuple:
+    start = time.perf_counter()
+    out = fn()
+    return time.perf_counter() - start, out
+
+
+def main(n_clubs: int = 100, per_club: int = 500):
+    h = _history(n_clubs, per_club)
+    n = len(h["result"])
+    print(f"{n:,} matches, {n_clubs} clubs, windows {WINDOWS} + ewm half-life {HALFLIFE}\n")
+
+    t_backfill, cols = _timed(lambda: backfill(
+        h["result"], h["scored"], h["conceded"], h["club_id"], WINDOWS, HALFLIFE))
+
+    def incremental():
+        snaps, i = [], 0
+        for club in range(n_clubs):
+            form = RollingForm(WINDOWS, HALFLIFE)
+            for _ in range(per_club):
+                form.append(h["result"][i], h["scored"][i], h["conceded"][i])
+                snaps.append(form.snapshot())
+                i += 1
+        return snaps
+
+    t_incremental, snaps = _timed(incremental)
+
+    def append_only():
+        i = 0
+        for club in range(n_clubs):
+            form = RollingForm(WINDOWS, HALFLIFE)
+            for _ in range(per_club):
+                form.append(h["result"][i], h["scored"][i], h["conceded"][i])
+                i += 1
+
+    t_append, _ = _timed(append_only)
+
+    analysers = [FormAnalyser(w) for w in WINDOWS]
+
+    def reslice():
+        i = 0
+        for club in range(n_clubs):
+            results = h["result"][i:i + per_club]
+            for j in range(1, per_club + 1):
+                for f in analysers:
+                    window = results[max(0, j - f.window):j]
+                    f._form_score(window)
+                    f._momentum(window)
+            i += per_club
+
+    t_reslice, _ = _timed(reslice)
+
+    for key, fields in cols.items():
+        for field, column in fields.items():
+            values = column if isinstance(column, list) else column.tolist()
+            assert values == [s[key][field] for s in snaps], (key, field)
+
+    rows = (
+        ("backfill()", t_backfill),
+        ("RollingForm append()", t_append),
+        ("RollingForm append() + snapshot()", t_incremental),
+        ("re-slicing, form + momentum only", t_reslice),
+    )
+    print(f"{'method':<36} {'total ms':>10} {'us/match':>10}")
+    for name, t in rows:
+        print(f"{name:<36} {t * 1e3:>10.1f} {t / n * 1e6:>10.2f}")
+    print("\nbackfill() and RollingForm agree on every match")
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:]])
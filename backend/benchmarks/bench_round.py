@@ -0,0 +1,93 @@
+"""
+Benchmark: a round of N fixtures as one POST /fixtures/analyse vs
+2 * N POST /analyse calls, one per side.
+
+    2N x /analyse      each side sent on its own, opponent fields
+                       copied from the other team (round_requests())
+    /fixtures/analyse  the round in one body; each team's indices and
+                       form computed once, ML once for the round
+
+Both go through the app in-process (httpx ASGITransport), with the
+report cache off and make_model() loaded. The pipeline rows time the
+same work without HTTP: run_validated() per side vs run_round().
+Every round report is checked against its /analyse counterpart.
+
+Run from backend/ directory:
+    python -m benchmarks.bench_round [fixtures ...]
+"""
+
+import asyncio
+import copy
+import json
+import os
+import sys
+import timeit
+
+os.environ["GAFFEROS_CACHE_SIZE"] = "0"
+
+import httpx
+
+from api.main import app, pipeline
+from benchmarks.workloads import make_model, make_round, round_requests
+
+REPEAT = 5
+
+
+async def _analyse_each(http: httpx.AsyncClient, requests: list) -> list:
+    responses = [await http.post("/analyse", json=r) for r in requests]
+    return [r.json() for r in responses]
+
+
+async def _analyse_round(http: httpx.AsyncClient, body: dict) -> list:
+    response = await http.post("/fixtures/analyse", json=body)
+    return [
+        report for fixture in response.json()["fixtures"]
+        for report in (fixture["home_report"], fixture["away_report"])
+    ]
+
+
+def _best_ms(fn) -> float:
+    return min(timeit.repeat(fn, number=1, repeat=REPEAT)) * 1e3
+
+
+async def _main(sizes: tuple):
+    pipeline.ml_model = make_model()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+        print(f"{'fixtures':>8} {'path':<20} {'ms/round':>9} {'speed-up':>9}")
+        for n in sizes:
+            body = make_round(n, seed=n)
+            requests = round_requests(body)
+            assert await _analyse_round(http, body) == await _analyse_each(http, requests)
+
+            async def timed(coro_fn) -> float:
+                best = float("inf")
+                for _ in range(REPEAT):
+                    start = timeit.default_timer()
+                    await coro_fn()
+                    best = min(best, timeit.default_timer() - start)
+                return best * 1e3
+
+            each_ms = await timed(lambda: _analyse_each(http, requests))
+            round_ms = await timed(lambda: _analyse_round(http, body))
+
+            sides = [pipeline.validate_payload(copy.deepcopy(r)) for r in requests]
+            teams, fixtures = pipeline.validator.validate_round_json(json.dumps(body))
+            direct_ms = _best_ms(lambda: [pipeline.run_validated(side) for side in sides])
+            shared_ms = _best_ms(lambda: pipeline.run_round(teams, fixtures))
+
+            for path, ms, base in (
+                (f"{2 * n} x /analyse", each_ms, each_ms),
+                ("/fixtures/analyse", round_ms, each_ms),
+                ("run_validated x 2N", direct_ms, direct_ms),
+                ("run_round", shared_ms, direct_ms),
+            ):
+                print(f"{n:>8} {path:<20} {ms:>9.1f} {base / ms:>8.1f}x")
+
+
+def main(*sizes: int):
+    asyncio.run(_main(sizes or (10, 20, 40)))
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:]])
@@ -0,0 +1,77 @@
+"""
+Benchmark: compiled vs interpreted rule evaluation.
+
+All seven tactical decisions (formation, line, focus, press, risk,
+advantages, threats) for n analysed contexts:
+
+    interpreted   CompiledRules.interpret(), walking the expression trees
+    compiled      the generated scalar functions the stages call
+    batch         the generated column functions, one call per decision
+
+Every path is checked against the compiled scalar results first.
+
+Run from backend/ directory:
+    python -m benchmarks.bench_rules [contexts]
+"""
+
+import sys
+import timeit
+
+import numpy as np
+
+from engine.mismatch_detector import MismatchDetector
+from engine.rule_engine import REQUIRED, default_rules
+from pipeline import TactIQPipeline
+from benchmarks.workloads import make_requests
+
+INPUTS = (
+    "offensive_strength_index", "defensive_vulnerability_index", "transition_intensity_score",
+    "fatigue_risk_score", "opponent_strength_index", "form_score", "opponent_form_score",
+)
+
+
+def main(n: int = 2000):
+    pipeline = TactIQPipeline()
+    contexts = [pipeline.run_with_state(r)[1] for r in make_requests(n, seed=8)]
+    compiled = default_rules().compiled
+    decisions = list(REQUIRED)
+    scalar = [compiled.scalar[key] for key in decisions]
+
+    columns = {key: np.array([c[key] for c in contexts]) for key in INPUTS}
+    columns["momentum"] = [c.momentum for c in contexts]
+    detector = MismatchDetector()
+
+    def interpreted():
+        return [[compiled.interpret(key, c) for key in decisions] for c in contexts]
+
+    def compiled_scalar():
+        return [[fn(c) for fn in scalar] for c in contexts]
+
+    def batch():
+        out = {}
+        for key in decisions:
+            result = compiled.batch[key](columns)
+            if REQUIRED[key] == "first":
+                codes, table = result
+                out[key] = [table[code] for code in codes.tolist()]
+            else:
+                out[key] = detector._collect(result, compiled.decisions[key]["default"])
+        return out
+
+    reference = compiled_scalar()
+    assert interpreted() == reference
+    by_row = batch()
+    assert [[by_row[key][i] for key in decisions] for i in range(n)] == reference
+
+    interp_ms = min(timeit.repeat(interpreted, number=1, repeat=5)) * 1e3
+    scalar_ms = min(timeit.repeat(compiled_scalar, number=3, repeat=5)) / 3 * 1e3
+    batch_ms = min(timeit.repeat(batch, number=3, repeat=5)) / 3 * 1e3
+
+    print(f"{len(decisions)} decisions x {n} contexts")
+    print(f"  interpreted:      {interp_ms:8.2f} ms   {interp_ms / n * 1e3:6.2f} us/context")
+    print(f"  compiled scalar:  {scalar_ms:8.2f} ms   {scalar_ms / n * 1e3:6.2f} us/context   ({interp_ms / scalar_ms:.1f}x)")
+    print(f"  compiled batch:   {batch_ms:8.2f} ms   {batch_ms / n * 1e3:6.2f} us/context   ({interp_ms / batch_ms:.1f}x)")
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:]])
@@ -0,0 +1,57 @@
+"""
+Benchmark: optimal (assignment) vs greedy XI selection.
+
+For each pool size, times SquadSelector._fill_xi in both modes and
+compares XI quality: primary / secondary / out-of-position fits and
+the total selection score of the chosen XI.
+
+Run from backend/ directory:
+    python -m benchmarks.bench_squad [pool sizes...]
+"""
+
+import random
+import sys
+import timeit
+
+from engine.squad_selector import SquadSelector, FORMATION_SLOTS, SPECIFIC_TO_BROAD
+from benchmarks.workloads import make_player
+
+
+def _pool(n: int, seed: int) -> list:
+    rng = random.Random(seed)
+    pool = []
+    for i in range(n):
+        p = make_player(rng, i).model_dump(mode="json")
+        p["available"] = True
+        p["_selection_score"] = p["fitness_score"]
+        pool.append(p)
+    return pool
+
+
+def _quality(xi: list) -> tuple:
+    primary = sum(p["position"] == p["slot_broad"] for p in xi)
+    secondary = sum(
+        p["position"] != p["slot_broad"] and SPECIFIC_TO_BROAD.get(p["secondary_position"]) == p["slot_broad"]
+        for p in xi
+    )
+    score = sum(p["_selection_score"] for p in xi)
+    return primary, secondary, len(xi) - primary - secondary, score
+
+
+def main(sizes):
+    selectors = {mode: SquadSelector(mode) for mode in SquadSelector.MODES}
+    slots = FORMATION_SLOTS["4-2-3-1"]
+
+    print(f"{'players':>8} {'mode':>8} {'ms':>8} {'prim':>5} {'sec':>4} {'out':>4} {'score':>7}")
+    for n in sizes:
+        pool = _pool(n, seed=n)
+        number = max(10, 2000 // n)
+        for mode, selector in selectors.items():
+            seconds = timeit.timeit(lambda: selector._fill_xi(pool, slots), number=number) / number
+            xi, _ = selector._fill_xi(pool, slots)
+            primary, secondary, out, score = _quality(xi)
+            print(f"{n:>8} {mode:>8} {seconds * 1000:>8.3f} {primary:>5} {secondary:>4} {out:>4} {score:>7.3f}")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [12, 25, 60, 200, 500])
@@ -0,0 +1,108 @@
+"""
+Benchmark: overhead of per-stage timing on TactIQPipeline.run().
+
+Compares run() on a pipeline without StageMetrics against:
+
+    bare        run() and _analyse() as they were before the hooks
+    every run   StageMetrics(sample_every=1)
+    sampled     StageMetrics.from_env() — what the API uses
+
+Each comparison runs the two sides back to back in ABBA order and
+takes the median ratio over many rounds, which holds up far better
+against machine noise than comparing best-of times. Exits non-zero if
+the disabled hooks cost more than 0.5% over bare, or the API
+configuration more than 2%.
+
+Run from backend/ directory:
+    python -m benchmarks.bench_stage_metrics [squad_size] [rounds]
+"""
+
+import gc
+import random
+import statistics
+import sys
+from time import perf_counter
+
+from core.context import MatchContext
+from core.schemas import DataTier
+from core.stage_metrics import StageMetrics
+from pipeline import TactIQPipeline
+from benchmarks.workloads import make_request
+
+DISABLED_BUDGET = 0.005
+ENABLED_BUDGET = 0.02
+
+
+class BarePipeline(TactIQPipeline):
+    """run() and _analyse() without the timing hooks."""
+
+    def run(self, request):
+        return self.run_validated(self.validator.validate(request))
+
+    def _analyse(self, data: MatchContext) -> MatchContext:
+        data = self.metrics.calculate(data)
+        data = self.form.analyse(data)
+        data = self.formation.select(data)
+        data = self.press.recommend(data)
+        data = self.mismatch.detect(data)
+        data = self.squad_selector.select(data)
+        data = self.rotation.advise(data)
+        return self.explainer.explain(data)
+
+
+def _batch(pipeline, requests) -> float:
+    start = perf_counter()
+    for r in requests:
+        pipeline.run(r)
+    return perf_counter() - start
+
+
+def overhead(base, other, requests, rounds: int) -> float:
+    """Median of other/base - 1 over ABBA rounds."""
+    ratios = []
+    gc.disable()
+    try:
+        for _ in range(rounds):
+            a1 = _batch(base, requests)
+            b1 = _batch(other, requests)
+            b2 = _batch(other, requests)
+            a2 = _batch(base, requests)
+            ratios.append((b1 + b2) / (a1 + a2))
+    finally:
+        gc.enable()
+    return statistics.median(ratios) - 1
+
+
+def main(squad_size: int = 18, rounds: int = 300):
+    requests = [make_request(random.Random(i), DataTier.TIER_2, squad_size) for i in range(10)]
+    bare = BarePipeline()
+    disabled = TactIQPipeline()
+    every = TactIQPipeline(stage_metrics=StageMetrics(sample_every=1))
+    sampled = TactIQPipeline(stage_metrics=StageMetrics.from_env())
+
+    for r in requests:
+        assert bare.run(r) == disabled.run(r) == every.run(r) == sampled.run(r)
+
+    run_time = min(_batch(disabled, requests) for _ in range(20)) / len(requests)
+    print(f"run(), tier 2, {squad_size} players: {run_time * 1e6:.1f} us")
+
+    off = overhead(bare, disabled, requests, rounds)
+    on_every = overhead(disabled, every, requests, rounds)
+    on_sampled = overhead(disabled, sampled, requests, rounds)
+    n = sampled.stage_metrics.sample_every
+    print(f"  disabled vs bare          {off:+.2%}")
+    print(f"  enabled, every run        {on_every:+.2%}")
+    print(f"  enabled, 1 in {n} (API)     {on_sampled:+.2%}")
+
+    stages = every.stage_metrics.snapshot()["stages"]
+    print("\nmean stage time")
+    for name, h in sorted(stages.items(), key=lambda kv: -kv[1]["sum"]):
+        print(f"  {name:>10}: {h['sum'] / h['count'] * 1e6:7.1f} us")
+
+    ok = off <= DISABLED_BUDGET and on_sampled <= ENABLED_BUDGET
+    print(f"\n{'within' if ok else 'OVER'} budget (disabled <= {DISABLED_BUDGET:.1%}, API config <= {ENABLED_BUDGET:.0%})")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(*[int(a) for a in sys.argv[1:]]))
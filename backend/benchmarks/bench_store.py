@@ -0,0 +1,85 @@
+"""
+Benchmark: stored-data analysis vs the full-body /analyse route.
+
+Seeds a SQLite TeamStore (a temp file unless a URL is given), then for
+the same club pairings compares:
+
+    POST /analyse           client sends the full tier 2 request body
+    GET  /analyse/{a}/{b}   server builds it from the store
+
+through the ASGI app in process, with the report cache off. Reports
+request bytes, median latency per request and, for the GET route, the
+share of it spent in TeamStore.analysis_input().
+
+Run from backend/ directory:
+    python -m benchmarks.bench_store [n_clubs] [requests] [database_url]
+"""
+
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import httpx
+
+
+async def _latencies(client, calls) -> list:
+    out = []
+    for method, url, body in calls:
+        start = time.perf_counter()
+        response = await client.request(method, url, content=body, headers={"content-type": "application/json"})
+        out.append(time.perf_counter() - start)
+        response.raise_for_status()
+    return out
+
+
+def main(n_clubs: int = 20, n: int = 200, url: str = None):
+    tmp = tempfile.TemporaryDirectory()
+    os.environ["GAFFEROS_DATABASE_URL"] = url or f"sqlite:///{tmp.name}/bench.db"
+    os.environ.setdefault("GAFFEROS_CACHE_SIZE", "0")
+
+    import api.main as api
+    from benchmarks.workloads import seed_store
+
+    store = api.team_store()
+    start = time.perf_counter()
+    clubs = seed_store(store, n_clubs=n_clubs)
+    print(f"seeded {n_clubs} clubs in {time.perf_counter() - start:.1f} s ({store.url.split(':')[0]})")
+
+    pairs = [(clubs[i % n_clubs], clubs[(i * 7 + 1) % n_clubs]) for i in range(n)]
+    pairs = [(a, b) if a != b else (a, clubs[(clubs.index(a) + 1) % n_clubs]) for a, b in pairs]
+    bodies = [json.dumps(store.analysis_input(a, b)[0]).encode() for a, b in pairs]
+
+    full = [("POST", "/analyse", body) for body in bodies]
+    stored = [("GET", f"/analyse/{a}/{b}", b"") for a, b in pairs]
+
+    async def run():
+        transport = httpx.ASGITransport(app=api.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            await _latencies(client, full[:20] + stored[:20])  # warm-up
+            return await _latencies(client, full), await _latencies(client, stored)
+
+    full_s, stored_s = asyncio.run(run())
+    build = []
+    for a, b in pairs:
+        t = time.perf_counter()
+        store.analysis_input(a, b)
+        build.append(time.perf_counter() - t)
+
+    body_bytes = statistics.mean(len(b) for b in bodies)
+    url_bytes = statistics.mean(len(u) for _, u, _ in stored)
+    print(f"\n{'route':<24} {'request bytes':>14} {'median ms':>10} {'p95 ms':>8}")
+    for name, size, lat in (("POST /analyse", body_bytes, full_s), ("GET /analyse/{a}/{b}", url_bytes, stored_s)):
+        p95 = sorted(lat)[int(len(lat) * 0.95)]
+        print(f"{name:<24} {size:>14.0f} {statistics.median(lat) * 1e3:>10.2f} {p95 * 1e3:>8.2f}")
+    print(f"\nanalysis_input(): {statistics.median(build) * 1e3:.2f} ms median")
+    store.close()
+    tmp.cleanup()
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(*[int(a) for a in args[:2]], *args[2:3])
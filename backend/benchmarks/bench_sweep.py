@@ -0,0 +1,58 @@
+"""
+Benchmark: what-if decision surface vs one scalar evaluation per guess.
+
+For an n × n grid over fatigue and opponent strength, compares
+TactIQPipeline.sweep_validated() against setting the two indices on a
+copy of the analysed context and running FormationSelector.select()
+and PressEngine.recommend() per cell — already far cheaper than the
+full run() per guess it replaces. Checks every cell agrees.
+
+Run from backend/ directory:
+    python -m benchmarks.bench_sweep [n]
+"""
+
+import random
+import sys
+import timeit
+
+from core.context import MatchContext
+from core.schemas import DataTier
+from pipeline import TactIQPipeline
+from benchmarks.workloads import make_request
+
+AXES = ("fatigue_risk_score", "opponent_strength_index")
+
+
+def main(n: int = 100):
+    pipeline = TactIQPipeline()
+    validated = pipeline.validator.validate(make_request(random.Random(7), DataTier.TIER_2, 18))
+    axes = {name: (0.0, 1.0, n) for name in AXES}
+    base = pipeline.form.analyse(pipeline.metrics.calculate(MatchContext.from_dict(validated)))
+
+    def per_cell():
+        grid = {}
+        for x in surface["axes"][0]["values"]:
+            for y in surface["axes"][1]["values"]:
+                ctx = base.copy()
+                ctx.fatigue_risk_score, ctx.opponent_strength_index = x, y
+                pipeline.press.recommend(pipeline.formation.select(ctx))
+                grid[x, y] = ctx
+        return grid
+
+    surface = pipeline.sweep_validated(validated, axes)
+    cells = per_cell()
+    xs, ys = surface["axes"][0]["values"], surface["axes"][1]["values"]
+    for key, s in surface["surfaces"].items():
+        for i, x in enumerate(xs):
+            for j, y in enumerate(ys):
+                assert s["labels"][s["grid"][i][j]] == cells[x, y][key], (key, x, y)
+
+    sweep_ms = min(timeit.repeat(lambda: pipeline.sweep_validated(validated, axes), number=10, repeat=5)) / 10 * 1e3
+    cell_ms = min(timeit.repeat(per_cell, number=1, repeat=3)) * 1e3
+    print(f"{n} x {n} grid ({n * n} cells)")
+    print(f"  per cell, scalar rules: {cell_ms:8.2f} ms")
+    print(f"  sweep_validated():      {sweep_ms:8.2f} ms   ({cell_ms / sweep_ms:.0f}x)")
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:]])
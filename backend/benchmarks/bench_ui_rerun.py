@@ -0,0 +1,178 @@
+"""
+Benchmark: Streamlit rerun cost for a 30-player squad, old app vs new.
+
+Streamlit reruns the whole script on every interaction. This replays
+the app's own work per rerun, leaving out Streamlit's widget protocol:
+
+    idle rerun     any widget change while a report is shown
+    analyse again  pressing Analyse with unchanged inputs
+    apply swap     Apply Changes after editing one XI slot
+
+old: Player models rebuilt every rerun. Analyse builds a
+     MatchAnalysisRequest and runs the pipeline; its ReportCache still
+     needs full validation first. The pitch is redrawn with pyplot every
+     rerun. A swap only re-draws, and the rotation advice goes stale.
+new: plain dicts and one json.dumps per rerun. Analyse goes through
+     st.cache_data keyed on that JSON, modelled here as a dict lookup
+     plus the pickle round trip cache_data does. A swap runs
+     pipeline.swap_xi() (RotationAdvisor only) and one render. Later
+     reruns hit the renderer cache.
+
+Run from backend/ directory:
+    python -m benchmarks.bench_ui_rerun [repeat]
+"""
+
+import json
+import pickle
+import random
+import statistics
+import sys
+import time
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+from core.pitch_renderer import PitchRenderer
+from core.report_cache import ReportCache
+from core.schemas import (
+    BroadPosition, DataTier, MatchAnalysisRequest, MatchResult, Player, SpecificPosition, Tier1Input,
+)
+from pipeline import TactIQPipeline
+from benchmarks.bench_render import pyplot_render
+from benchmarks.workloads import make_request
+
+SQUAD = 30
+
+
+def _form_inputs() -> dict:
+    """Widget values as the app reads them."""
+    request = make_request(random.Random(11), DataTier.TIER_1, SQUAD).tier1_data
+    return {
+        "team_name": request.team_name,
+        "opponent_name": request.opponent_name,
+        "results": [r.value for r in request.last_5_results],
+        "goals_scored": request.goals_scored_last_5,
+        "goals_conceded": request.goals_conceded_last_5,
+        "opp_results": [r.value for r in request.opponent_last_5_results or []] or ["D"] * 5,
+        "opp_goals_scored": 5,
+        "opp_goals_conceded": 8,
+        "players": [p.model_dump(mode="json") for p in request.players],
+    }
+
+
+# ── Old app ────────────────────────────────────────────────────
+class OldApp:
+
+    def __init__(self, form: dict):
+        self.form = form
+        self.pipeline = TactIQPipeline(cache=ReportCache(max_size=256))
+        self.result = None
+        self.current_xi = None
+
+    def _players(self) -> list:
+        return [
+            Player(
+                name=p["name"],
+                position=BroadPosition(p["position"]),
+                specific_position=SpecificPosition(p["specific_position"]),
+                secondary_position=SpecificPosition(p["secondary_position"]) if p["secondary_position"] else None,
+                available=p["available"],
+                fitness_score=p["fitness_score"],
+            )
+            for p in self.form["players"]
+        ]
+
+    def rerun(self, analyse: bool = False, swap: list = None):
+        f = self.form
+        players = self._players()
+        if analyse:
+            request = MatchAnalysisRequest(tier=DataTier.TIER_1, tier1_data=Tier1Input(
+                team_name=f["team_name"], opponent_name=f["opponent_name"],
+                last_5_results=[MatchResult(r) for r in f["results"]],
+                goals_scored_last_5=f["goals_scored"], goals_conceded_last_5=f["goals_conceded"],
+                players=players,
+                opponent_last_5_results=[MatchResult(r) for r in f["opp_results"]],
+                opponent_goals_scored=f["opp_goals_scored"], opponent_goals_conceded=f["opp_goals_conceded"],
+            ))
+            self.result = self.pipeline.run(request)
+            self.current_xi = list(self.result.starting_xi)
+        if swap is not None:
+            by_name = {p.name: p for p in players}
+            self.current_xi = [by_name[name].model_dump() for name in swap]
+        if self.result is not None:
+            pyplot_render(self.result.recommended_formation, self.current_xi, self.result.team_name)
+            plt.close("all")  # kinder than the app, which never closed them
+
+
+# ── New app ────────────────────────────────────────────────────
+class NewApp:
+
+    def __init__(self, form: dict):
+        self.form = form
+        self.pipeline = TactIQPipeline(cache=ReportCache(max_size=256))
+        self.renderer = PitchRenderer(cache_size=64)
+        self._cache_data = {}
+        self.result = None
+
+    def _analyse(self, payload_json: str):
+        if payload_json not in self._cache_data:
+            report = self.pipeline.run_validated(self.pipeline.validate_json(payload_json))
+            self._cache_data[payload_json] = pickle.dumps(report)
+        return pickle.loads(self._cache_data[payload_json])
+
+    def rerun(self, analyse: bool = False, swap: list = None):
+        f = self.form
+        players = [dict(p) for p in f["players"]]
+        data = dict(
+            team_name=f["team_name"], opponent_name=f["opponent_name"],
+            last_5_results=f["results"], goals_scored_last_5=f["goals_scored"],
+            goals_conceded_last_5=f["goals_conceded"], players=players,
+            opponent_last_5_results=f["opp_results"], opponent_goals_scored=f["opp_goals_scored"],
+            opponent_goals_conceded=f["opp_goals_conceded"],
+        )
+        payload_json = json.dumps({"tier": "tier_1", "tier1_data": data}, sort_keys=True)
+        if analyse:
+            self.result = self._analyse(payload_json)
+        if swap is not None:
+            self.result = self.pipeline.swap_xi(self.result, swap)
+        if self.result is not None:
+            self.renderer.render(self.result.recommended_formation, self.result.starting_xi,
+                                 self.result.team_name, "png")
+
+
+def _median_ms(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1e3
+
+
+def main(repeat: int = 15):
+    form = _form_inputs()
+    old, new = OldApp(form), NewApp(form)
+    old.rerun(analyse=True)
+    new.rerun(analyse=True)
+
+    xi = [p["name"] for p in new.result.starting_xi]
+    swaps = [[bench["name"]] + xi[1:] for bench in new.result.bench if bench.get("available", True)]
+
+    def swap_cycle(app):
+        it = iter(swaps * repeat)
+        return lambda: app.rerun(swap=next(it))
+
+    print(f"{SQUAD}-player squad, median of {repeat}\n")
+    print(f"{'rerun':<16} {'old ms':>10} {'new ms':>10} {'speed-up':>9}")
+    for name, old_fn, new_fn in (
+        ("idle rerun", lambda: old.rerun(), lambda: new.rerun()),
+        ("analyse again", lambda: old.rerun(analyse=True), lambda: new.rerun(analyse=True)),
+        ("apply swap", swap_cycle(old), swap_cycle(new)),
+    ):
+        old_ms, new_ms = _median_ms(old_fn, repeat), _median_ms(new_fn, repeat)
+        print(f"{name:<16} {old_ms:>10.2f} {new_ms:>10.2f} {old_ms / new_ms:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:]])
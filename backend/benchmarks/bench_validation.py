@@ -0,0 +1,46 @@
+"""
+Benchmark: request decode + validation cost per player.
+
+"model" parses the body into MatchAnalysisRequest and runs
+InputValidator.validate (the pipeline.run() path). "fast" is
+InputValidator.validate_json, which the API now uses: one TypedDict
+pass straight from JSON bytes to the validated dict. Also checks both
+paths produce the same dict.
+
+Run from backend/ directory:
+    python -m benchmarks.bench_validation [squad sizes...]
+"""
+
+import json
+import random
+import sys
+import timeit
+
+from core.input_validator import InputValidator
+from core.schemas import MatchAnalysisRequest, DataTier
+from benchmarks.workloads import make_request
+
+
+def _model_path(validator, raw):
+    return validator.validate(MatchAnalysisRequest.model_validate_json(raw))
+
+
+def main(sizes):
+    validator = InputValidator()
+    print(f"{'tier':>6} {'players':>8} {'model us':>9} {'fast us':>8} {'model us/pl':>12} {'fast us/pl':>11}")
+    for tier in (DataTier.TIER_1, DataTier.TIER_2):
+        for n in sizes:
+            rng = random.Random(n)
+            raw = json.dumps(make_request(rng, tier, n).model_dump(mode="json")).encode()
+
+            # Enums compare equal to their string values, so this checks content
+            assert _model_path(validator, raw) == validator.validate_json(raw)
+
+            number = 2000
+            model = min(timeit.repeat(lambda: _model_path(validator, raw), number=number, repeat=5)) / number * 1e6
+            fast = min(timeit.repeat(lambda: validator.validate_json(raw), number=number, repeat=5)) / number * 1e6
+            print(f"{tier.value:>6} {n:>8} {model:>9.1f} {fast:>8.1f} {model / n:>12.2f} {fast / n:>11.2f}")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [11, 25, 60])
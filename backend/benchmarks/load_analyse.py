@@ -0,0 +1,87 @@
+"""
+Load test for POST /analyse.
+
+Each client loops sending one request at a time for the given
+duration. Reports throughput, p50/p99 latency of successful
+responses and how many were shed with 429.
+
+Start the API first, e.g. from backend/:
+    GAFFEROS_EXECUTOR=thread uvicorn api.main:app --port 8000
+
+Then, from backend/:
+    python -m benchmarks.load_analyse --clients 50 100 250 500
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+import httpx
+
+from benchmarks.workloads import make_request
+
+
+def _payload(seed: int) -> dict:
+    request = make_request(random.Random(seed))
+    return request.model_dump(mode="json")
+
+
+def _percentile(values: list, pct: float) -> float:
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def _client(http: httpx.AsyncClient, url: str, payload: dict, until: float, stats: dict):
+    while time.perf_counter() < until:
+        start = time.perf_counter()
+        try:
+            response = await http.post(url, json=payload)
+        except httpx.HTTPError:
+            stats["errors"] += 1
+            continue
+        elapsed = time.perf_counter() - start
+
+        if response.status_code == 200:
+            stats["latencies"].append(elapsed)
+        elif response.status_code == 429:
+            stats["shed"] += 1
+            await asyncio.sleep(0.05)
+        else:
+            stats["errors"] += 1
+
+
+async def run(base_url: str, clients: int, duration: float) -> dict:
+    stats = {"latencies": [], "shed": 0, "errors": 0}
+    payloads = [_payload(i) for i in range(min(clients, 32))]
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as http:
+        until = time.perf_counter() + duration
+        await asyncio.gather(*(
+            _client(http, "/analyse", payloads[i % len(payloads)], until, stats)
+            for i in range(clients)
+        ))
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--clients", type=int, nargs="+", default=[50, 100, 250, 500])
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+
+    print(f"{'clients':>8} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'429s':>6} {'errors':>6}")
+    for clients in args.clients:
+        stats = asyncio.run(run(args.url, clients, args.duration))
+        lat = stats["latencies"]
+        print(f"{clients:>8} {len(lat) / args.duration:>8.1f} "
+              f"{_percentile(lat, 50) * 1000:>8.1f} {_percentile(lat, 99) * 1000:>8.1f} "
+              f"{stats['shed']:>6} {stats['errors']:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+"""
+Benchmark suite with a stored-baseline regression gate.
+
+Cases are grouped by prefix:
+
+    micro.*  one component on prepared inputs — MetricCalculator,
+             _calculate_pis / calculate_pis_batch, SquadSelector,
+             RotationAdvisor, Explainer, the what-if decision surface
+    e2e.*    TactIQPipeline.run() per tier and squad size, run_batch()
+    http.*   POST /analyse in-process through httpx's ASGI transport
+
+Every case reports throughput (items per second, best of --repeat)
+and a score: throughput scaled by the time of a fixed calibration
+loop, which is what the baseline stores and the gate compares (see
+measure()). All inputs come from the seeded generators in
+benchmarks/workloads.py. The score absorbs clock-speed drift, not a
+different CPU or Python — re-record the baseline when those change.
+
+Run from backend/ directory:
+    python -m benchmarks.suite                    # compare against the baseline
+    python -m benchmarks.suite --save-baseline    # record a new one
+    python -m benchmarks.suite -k micro --max-regression 10   # stricter, on a quiet machine
+
+Exits 1 if any case's score drops more than --max-regression
+percent below its baseline.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from core.context import MatchContext
+from core.metric_calculator import MetricCalculator
+from core.schemas import DataTier
+from engine import squad_selector as ss
+from engine.explainer import Explainer
+from engine.rotation_advisor import RotationAdvisor
+from pipeline import TactIQPipeline
+from benchmarks.workloads import make_request, make_requests, make_player, make_player_stats
+
+BASELINE = Path(__file__).with_name("baseline.json")
+CASES = {}
+
+
+def case(name: str):
+    """Registers a setup function returning (fn, items per fn call)."""
+    def register(setup):
+        CASES[name] = setup
+        return setup
+    return register
+
+
+# ── Inputs ─────────────────────────────────────────────────────
+
+def _validated(n: int, tier: DataTier, squad_size: int, seed: int) -> list:
+    rng = random.Random(seed)
+    pipeline = TactIQPipeline()
+    return [pipeline.validator.validate(make_request(rng, tier, squad_size)) for _ in range(n)]
+
+
+def _states(n: int = 200, squad_size: int = 18, seed: int = 1) -> list:
+    """Fully enriched contexts, as the later stages see them."""
+    pipeline = TactIQPipeline()
+    return [pipeline.run_with_state(r)[1] for r in make_requests(n, seed=seed, squad_size=squad_size)]
+
+
+def _squad_dicts(n_squads: int = 40, squad_size: int = 25, density: float = 0.7, seed: int = 2) -> list:
+    rng = random.Random(seed)
+    squads = []
+    for _ in range(n_squads):
+        squad = []
+        for i in range(squad_size):
+            p = make_player(rng, i).model_dump(mode="json")
+            p["stats"] = make_player_stats(rng, density)
+            squad.append(p)
+        squads.append(squad)
+    return squads
+
+
+# ── Micro ──────────────────────────────────────────────────────
+
+@case("micro.metric_calculator")
+def _metric_calculator():
+    contexts = [MatchContext.from_dict(v) for v in _validated(200, DataTier.TIER_2, 18, seed=3)]
+    calc = MetricCalculator()
+    return (lambda: [calc.calculate(c) for c in contexts]), len(contexts)
+
+
+@case("micro.pis_scalar")
+def _pis_scalar():
+    players = [p for squad in _squad_dicts() for p in squad]
+    return (lambda: [ss._calculate_pis(p) for p in players]), len(players)
+
+
+@case("micro.pis_batch_cold")
+def _pis_batch_cold():
+    squads = _squad_dicts()
+
+    def run():
+        ss._pis_cache.clear()
+        for squad in squads:
+            ss.calculate_pis_batch(squad)
+    return run, sum(len(s) for s in squads)
+
+
+@case("micro.squad_selector")
+def _squad_selector():
+    states = _states()
+    selector = ss.SquadSelector()
+    return (lambda: [selector.select(s) for s in states]), len(states)
+
+
+@case("micro.rotation_advisor")
+def _rotation_advisor():
+    states = _states()
+    advisor = RotationAdvisor()
+    return (lambda: [advisor.advise(s) for s in states]), len(states)
+
+
+@case("micro.explainer")
+def _explainer():
+    states = _states()
+    explainer = Explainer()
+    return (lambda: [explainer.explain(s) for s in states]), len(states)
+
+
+@case("micro.decision_surface")
+def _decision_surface():
+    validated = _validated(1, DataTier.TIER_2, 18, seed=6)[0]
+    pipeline = TactIQPipeline()
+    axes = {"fatigue_risk_score": (0.0, 1.0, 100), "opponent_strength_index": (0.0, 1.0, 100)}
+    return (lambda: pipeline.sweep_validated(validated, axes)), 100 * 100
+
+
+# ── End to end ─────────────────────────────────────────────────
+
+def _run_case(tier: DataTier, squad_size: int):
+    def setup():
+        rng = random.Random(squad_size)
+        requests = [make_request(rng, tier, squad_size) for _ in range(50)]
+        pipeline = TactIQPipeline()
+        return (lambda: [pipeline.run(r) for r in requests]), len(requests)
+    return setup
+
+
+for _tier in (DataTier.TIER_1, DataTier.TIER_2):
+    for _size in (11, 18, 25):
+        case(f"e2e.run.{_tier.value}.{_size}")(_run_case(_tier, _size))
+
+
+@case("e2e.run_batch.256")
+def _run_batch():
+    requests = make_requests(256, seed=4)
+    pipeline = TactIQPipeline()
+    return (lambda: pipeline.run_batch(requests)), len(requests)
+
+
+# ── HTTP ───────────────────────────────────────────────────────
+
+@case("http.analyse")
+def _http_analyse():
+    import httpx
+
+    # Every request is distinct, but repeats would hit the report cache
+    os.environ.setdefault("GAFFEROS_CACHE_SIZE", "0")
+    from api.main import app
+
+    bodies = [json.dumps(r.model_dump(mode="json")).encode() for r in make_requests(50, seed=5)]
+    loop = asyncio.new_event_loop()
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench")
+    headers = {"content-type": "application/json"}
+
+    async def send_all():
+        for body in bodies:
+            response = await client.post("/analyse", content=body, headers=headers)
+            response.raise_for_status()
+
+    return (lambda: loop.run_until_complete(send_all())), len(bodies)
+
+
+# ── Runner ─────────────────────────────────────────────────────
+
+def _calibrate(n: int = 100_000) -> int:
+    """Fixed pure-Python loop used as the machine-speed yardstick."""
+    total = 0
+    for i in range(n):
+        total += i * i
+    return total
+
+
+def _timed_loop(fn, number: int) -> float:
+    start = time.perf_counter()
+    for _ in range(number):
+        fn()
+    return (time.perf_counter() - start) / number
+
+
+def measure(fn, items: int, repeat: int, min_time: float) -> tuple:
+    """
+    Returns (items per second, score). Each repeat times the case next
+    to the _calibrate() loop; score is throughput in items per
+    calibration-loop time, the median over repeats. Clock speed on
+    shared machines drifts by tens of percent between runs, and the
+    score cancels most of that out, so the gate compares scores.
+    """
+    fn()  # warm-up, also sizes the inner loop
+    number = max(1, int(min_time / max(_timed_loop(fn, 1), 1e-9)))
+    cal_number = max(1, int(min_time / 2 / max(_timed_loop(_calibrate, 1), 1e-9)))
+
+    best, scores = float("inf"), []
+    for _ in range(repeat):
+        cal = _timed_loop(_calibrate, cal_number)
+        seconds = _timed_loop(fn, number)
+        best = min(best, seconds)
+        scores.append(items / seconds * cal)
+    return items / best, statistics.median(scores)
+
+
+def compare(scores: dict, baseline: dict, max_regression: float) -> list:
+    """Names of cases scoring more than max_regression percent below baseline."""
+    failed = []
+    print(f"\n{'case':<26} {'score':>10} {'baseline':>10} {'change':>8}")
+    for name, score in scores.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<26} {score:>10.2f} {'—':>10} {'new':>8}")
+            continue
+        change = score / base - 1
+        flag = ""
+        if change < -max_regression / 100:
+            failed.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<26} {score:>10.2f} {base:>10.2f} {change:>+8.1%}{flag}")
+    return failed
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", "--filter", default="", help="only cases whose name contains this")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--min-time", type=float, default=0.1, help="seconds per timed repeat")
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--max-regression", type=float, default=25.0, help="percent drop that fails the run")
+    args = parser.parse_args(argv)
+
+    names = [name for name in CASES if args.filter in name]
+    rates, scores = {}, {}
+    print(f"{'case':<26} {'items/s':>10} {'score':>10}")
+    for name in names:
+        fn, items = CASES[name]()
+        rates[name], scores[name] = measure(fn, items, args.repeat, args.min_time)
+        print(f"{name:<26} {rates[name]:>10.0f} {scores[name]:>10.2f}", flush=True)
+
+    if args.save_baseline:
+        saved = json.loads(args.baseline.read_text())["scores"] if args.baseline.exists() else {}
+        saved.update(scores)
+        args.baseline.write_text(json.dumps({
+            "machine": f"{platform.machine()} / {platform.python_implementation()} {platform.python_version()}",
+            "scores": {k: round(v, 3) for k, v in sorted(saved.items())},
+        }, indent=2) + "\n")
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline first.")
+        return 0
+
+    failed = compare(scores, json.loads(args.baseline.read_text())["scores"], args.max_regression)
+    if failed:
+        print(f"\n{len(failed)} case(s) regressed more than {args.max_regression:.0f}%: {', '.join(failed)}")
+        return 1
+    print(f"\nNo case regressed more than {args.max_regression:.0f}%.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
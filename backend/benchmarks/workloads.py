@@ -0,0 +1,211 @@
+"""
+workloads.py — Seeded synthetic MatchAnalysisRequest generators
+for benchmarks.
+"""
+
+import random
+
+from core.schemas import (
+    MatchAnalysisRequest, DataTier, Tier1Input, Tier2Input,
+    MatchResult, Player, BroadPosition, POSITION_MAP, PIS_STAT_KEYS,
+)
+
+RESULTS = [MatchResult.WIN, MatchResult.DRAW, MatchResult.LOSS]
+BROAD_MIX = [BroadPosition.GK] + [BroadPosition.DEF] * 4 + [BroadPosition.MID] * 4 + [BroadPosition.FWD] * 3
+ALL_SPECIFIC = [s for group in POSITION_MAP.values() for s in group]
+
+
+def make_player(rng: random.Random, i: int, density: float = 0.8) -> Player:
+    broad = BROAD_MIX[i % len(BROAD_MIX)]
+    return Player(
+        name=f"Player {i + 1}",
+        position=broad,
+        specific_position=rng.choice(POSITION_MAP[broad]),
+        secondary_position=rng.choice(ALL_SPECIFIC) if rng.random() < density / 2 else None,
+        available=rng.random() > 0.1,
+        fitness_score=round(rng.uniform(0.3, 1.0), 2),
+    )
+
+
+def _base_fields(rng: random.Random, squad_size: int, density: float) -> dict:
+    return dict(
+        team_name=f"Team {rng.randrange(1000)}",
+        opponent_name=f"Team {rng.randrange(1000)}",
+        last_5_results=[rng.choice(RESULTS) for _ in range(rng.randint(1, 5))],
+        goals_scored_last_5=rng.randint(0, 18),
+        goals_conceded_last_5=rng.randint(0, 18),
+        players=[make_player(rng, i, density) for i in range(squad_size)],
+        opponent_last_5_results=[rng.choice(RESULTS) for _ in range(5)] if rng.random() < density else None,
+        opponent_goals_scored=rng.randint(0, 18) if rng.random() < density else None,
+        opponent_goals_conceded=rng.randint(0, 18) if rng.random() < density else None,
+    )
+
+
+def make_tier1_input(rng: random.Random, squad_size: int = 18, density: float = 0.8) -> Tier1Input:
+    """
+    A valid Tier1Input. density is the chance each optional field
+    (opponent form, secondary positions at half that rate) is filled.
+    """
+    return Tier1Input(**_base_fields(rng, squad_size, density))
+
+
+def make_tier2_input(rng: random.Random, squad_size: int = 18, density: float = 0.8) -> Tier2Input:
+    """A valid Tier2Input; density also covers the optional opponent averages."""
+    return Tier2Input(
+        **_base_fields(rng, squad_size, density),
+        avg_possession=rng.uniform(30, 70),
+        avg_passing_accuracy=rng.uniform(50, 95),
+        avg_shots_per_match=rng.uniform(0, 25),
+        avg_shots_on_target=rng.uniform(0, 12),
+        avg_defensive_errors=rng.uniform(0, 5),
+        opp_avg_possession=rng.uniform(30, 70),
+        opp_avg_passing_accuracy=rng.uniform(50, 95),
+        opp_avg_shots_per_match=rng.uniform(0, 25) if rng.random() < density * 7 / 8 else None,
+        opp_avg_defensive_errors=rng.uniform(0, 5),
+    )
+
+
+def make_request(
+    rng: random.Random,
+    tier: DataTier = DataTier.TIER_1,
+    squad_size: int = 18,
+    density: float = 0.8,
+) -> MatchAnalysisRequest:
+    if tier == DataTier.TIER_1:
+        return MatchAnalysisRequest(tier=tier, tier1_data=make_tier1_input(rng, squad_size, density))
+    return MatchAnalysisRequest(tier=tier, tier2_data=make_tier2_input(rng, squad_size, density))
+
+
+def make_player_stats(rng: random.Random, density: float = 0.8) -> dict:
+    """
+    Season stats for the Player Impact Score, as SquadSelector reads
+    them from player dicts. Each counting stat is present with
+    probability density.
+    """
+    played = rng.randint(0, 30)
+    stats = {"matches_played": played}
+    for key in PIS_STAT_KEYS:
+        if rng.random() < density:
+            stats[key] = rng.randint(0, 3 * played + 1)
+    return stats
+
+
+def make_requests(n: int, seed: int = 0, squad_size: int = 18) -> list:
+    """n requests, alternating tier 1 / tier 2."""
+    rng = random.Random(seed)
+    tiers = [DataTier.TIER_1, DataTier.TIER_2]
+    return [make_request(rng, tiers[i % 2], squad_size) for i in range(n)]
+
+
+def make_round(fixtures: int = 10, seed: int = 0, squad_size: int = 18, tier2_share: float = 0.5) -> dict:
+    """
+    A /fixtures/analyse body: 2 * fixtures teams, each playing once.
+    About tier2_share of them carry tier 2 averages.
+    """
+    rng = random.Random(seed)
+    teams = []
+    for i in range(2 * fixtures):
+        fields = _base_fields(rng, squad_size, density=0.8)
+        team = {
+            "team_name": f"Club {i + 1}",
+            "last_5_results": [r.value for r in fields["last_5_results"]],
+            "goals_scored_last_5": fields["goals_scored_last_5"],
+            "goals_conceded_last_5": fields["goals_conceded_last_5"],
+            "players": [p.model_dump(mode="json") for p in fields["players"]],
+        }
+        if rng.random() < tier2_share:
+            team.update(
+                avg_possession=rng.uniform(30, 70),
+                avg_passing_accuracy=rng.uniform(50, 95),
+                avg_shots_per_match=rng.uniform(0, 25),
+                avg_shots_on_target=rng.uniform(0, 12),
+                avg_defensive_errors=rng.uniform(0, 5),
+            )
+        teams.append(team)
+    names = [t["team_name"] for t in teams]
+    rng.shuffle(names)
+    return {
+        "teams": teams,
+        "fixtures": [{"home": home, "away": away} for home, away in zip(names[::2], names[1::2])],
+    }
+
+
+def round_requests(body: dict) -> list:
+    """
+    The 2 * len(fixtures) /analyse bodies that make_round()'s round
+    stands for, home side then away side of each fixture.
+    """
+    from core.input_validator import ROUND_AVERAGES
+
+    teams = {t["team_name"]: t for t in body["teams"]}
+    requests = []
+    for fixture in body["fixtures"]:
+        for name, opponent in ((fixture["home"], fixture["away"]), (fixture["away"], fixture["home"])):
+            team, opp = teams[name], teams[opponent]
+            fields = dict(
+                team,
+                opponent_name=opponent,
+                opponent_last_5_results=opp["last_5_results"],
+                opponent_goals_scored=opp["goals_scored_last_5"],
+                opponent_goals_conceded=opp["goals_conceded_last_5"],
+            )
+            if "avg_possession" in team:
+                fields.update({opp_key: opp.get(key) for key, opp_key in ROUND_AVERAGES.items() if opp_key})
+                requests.append({"tier": "tier_2", "tier2_data": fields})
+            else:
+                requests.append({"tier": "tier_1", "tier1_data": fields})
+    return requests
+
+
+def make_model(seed: int = 0, n_samples: int = 600):
+    """
+    Stand-in Phase 2 model: a scikit-learn LogisticRegression fitted on
+    random feature rows with (loss, draw, win) labels, so predict_proba
+    returns three columns in the order the pipeline expects.
+    """
+    import numpy as np
+    from sklearn.linear_model import LogisticRegression
+    from core.feature_builder import FeatureBuilder
+
+    rng = np.random.default_rng(seed)
+    X = rng.uniform(0, 100, size=(n_samples, len(FeatureBuilder.FEATURE_KEYS)))
+    y = np.arange(n_samples) % 3
+    return LogisticRegression(max_iter=500).fit(X, y)
+
+
+def seed_store(store, n_clubs: int = 20, squad_size: int = 18, rounds: int = 10,
+               seed: int = 0, with_stats: bool = True) -> list:
+    """
+    Fills a TeamStore with n_clubs clubs, a squad each and `rounds`
+    weekly rounds of played fixtures. Returns the club ids.
+    """
+    from datetime import datetime, timedelta
+
+    rng = random.Random(seed)
+    clubs = [store.add_club(f"Club {i + 1}") for i in range(n_clubs)]
+    squads = {}
+    for club in clubs:
+        squads[club] = [store.add_player(club, make_player(rng, i).model_dump(mode="json")) for i in range(squad_size)]
+
+    def team_stats():
+        return {
+            "possession": round(rng.uniform(35, 65), 1),
+            "passing_accuracy": round(rng.uniform(60, 90), 1),
+            "shots": rng.randint(4, 20),
+            "shots_on_target": rng.randint(1, 8),
+            "defensive_errors": rng.randint(0, 4),
+        }
+
+    start = datetime(2026, 8, 1)
+    for r in range(rounds):
+        order = clubs[:]
+        rng.shuffle(order)
+        for home, away in zip(order[::2], order[1::2]):
+            fixture = store.add_fixture(
+                home, away, start + timedelta(days=7 * r), rng.randint(0, 4), rng.randint(0, 4),
+                team_stats() if with_stats else None, team_stats() if with_stats else None,
+            )
+            if with_stats:
+                for player in squads[home][:11] + squads[away][:11]:
+                    store.add_player_stats(player, fixture, make_player_stats(rng))
+    return clubs
@@ -0,0 +1,81 @@
+"""
+columns.py — Packs validated input dicts into NumPy columns
+so batch stages can evaluate many requests at once.
+"""
+
+import numpy as np
+
+
+# ── Scalar Columns ─────────────────────────────────────────────
+def float_column(rows: list, key: str) -> np.ndarray:
+    """Float column for key. Missing / None values become NaN."""
+    return np.array(
+        [np.nan if r.get(key) is None else r[key] for r in rows],
+        dtype=np.float64,
+    )
+
+
+# ── Results Matrix ─────────────────────────────────────────────
+def results_matrix(results: list, points: dict, default: int = 1):
+    """
+    Pads W/D/L lists into an (n × longest) points matrix.
+    Returns (points, lengths). Padding is 0 and never read past length.
+    """
+    n = len(results)
+    lengths = np.fromiter((len(r) for r in results), dtype=np.int64, count=n)
+    width = max(int(lengths.max()) if n else 0, 1)
+    flat = "".join(map("".join, results))
+
+    if len(flat) != lengths.sum():
+        # Multi-character labels — no fast path, fill row by row
+        pts = np.zeros((n, width), dtype=np.float64)
+        for i, res in enumerate(results):
+            pts[i, :len(res)] = [points.get(r, default) for r in res]
+        return pts, lengths
+
+    lookup = np.full(128, default, dtype=np.float64)
+    for label, value in points.items():
+        lookup[ord(label)] = value
+
+    codes = np.frombuffer(flat.encode("ascii"), dtype=np.uint8)
+    starts = np.repeat(np.cumsum(lengths) - lengths, lengths)
+    rows = np.repeat(np.arange(n), lengths)
+    pts = np.zeros((n, width), dtype=np.float64)
+    pts[rows, np.arange(len(codes)) - starts] = lookup[codes]
+    return pts, lengths
+
+
+# ── Rounding ───────────────────────────────────────────────────
+def round_column(values: np.ndarray, ndigits: int = 3) -> np.ndarray:
+    """
+    Rounds exactly like Python's round(). np.round only disagrees
+    when the scaled value sits on a .5 tie, so those few entries
+    are re-rounded with round() itself.
+    """
+    scale = 10.0 ** ndigits
+    scaled = values * scale
+    out = np.rint(scaled) / scale
+
+    ties = np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6)
+    for i in ties.tolist():
+        out[i] = round(float(values[i]), ndigits)
+    return out
+
+
+def pick_codes(labels: list, conditions: list, default: str) -> tuple:
+    """
+    Array form of an if/elif chain. Returns (codes, table): codes holds
+    the index of the first matching condition per row, or len(labels)
+    when none match, and table[code] is that row's label.
+    """
+    codes = np.select(conditions, list(range(len(labels))), default=len(labels))
+    return codes, list(labels) + [default]
+
+
+def decode(codes: np.ndarray, table: list) -> list:
+    return [table[c] for c in codes.tolist()]
+
+
+def pick(labels: list, conditions: list, default: str) -> list:
+    """First matching label per row — array form of an if/elif chain."""
+    return decode(*pick_codes(labels, conditions, default))
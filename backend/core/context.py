@@ -0,0 +1,136 @@
+"""
+context.py — MatchContext, the typed working state that flows
+through the pipeline stages.
+
+Stages used to return {**data, ...new keys}, copying the whole
+growing dict (players list included) once per stage. A MatchContext
+is a fixed set of slots that stages fill in place.
+
+Stages read and write slots as attributes. The @context_stage
+adapter keeps the old dict interface working for callers that still
+pass plain dicts, and MatchContext itself supports d["key"], d.get
+and "key" in d for code that treats it as a mapping.
+"""
+
+import functools
+
+
+class MatchContext:
+
+    __slots__ = (
+        # InputValidator
+        "tier", "team_name", "opponent_name",
+        "last_5_results", "goals_scored_last_5", "goals_conceded_last_5",
+        "players",
+        "opponent_last_5_results", "opponent_goals_scored", "opponent_goals_conceded",
+        "avg_possession", "avg_passing_accuracy", "avg_shots_per_match",
+        "avg_shots_on_target", "avg_defensive_errors",
+        "opp_avg_possession", "opp_avg_passing_accuracy",
+        "opp_avg_shots_per_match", "opp_avg_defensive_errors",
+
+        # MetricCalculator
+        "offensive_strength_index", "defensive_vulnerability_index",
+        "transition_intensity_score", "fatigue_risk_score",
+        "tactical_stability_score", "opponent_strength_index",
+
+        # FormAnalyser
+        "form_score", "opponent_form_score", "momentum", "form_label",
+
+        # FormationSelector
+        "recommended_formation", "defensive_line", "tactical_focus",
+
+        # PressEngine
+        "press_intensity", "match_risk_level",
+
+        # MismatchDetector
+        "advantages", "threats",
+
+        # SquadSelector
+        "starting_xi", "bench",
+
+        # RotationAdvisor
+        "rotation_suggestions",
+
+        # Explainer
+        "reasoning",
+    )
+    _FIELD_ORDER = __slots__
+    _FIELDS = frozenset(__slots__)
+
+    def __init_subclass__(cls, **kwargs):
+        """Subclasses extend the context by declaring extra __slots__."""
+        super().__init_subclass__(**kwargs)
+        extra = tuple(cls.__dict__.get("__slots__", ()))
+        cls._FIELD_ORDER = cls._FIELD_ORDER + extra
+        cls._FIELDS = frozenset(cls._FIELD_ORDER)
+
+    def __init__(self, **fields):
+        self.update(fields)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "MatchContext":
+        return cls(**data)
+
+    def copy(self) -> "MatchContext":
+        """Shallow copy — lists and player dicts are shared, not cloned."""
+        clone = type(self).__new__(type(self))
+        for key in self._FIELD_ORDER:
+            if hasattr(self, key):
+                setattr(clone, key, getattr(self, key))
+        return clone
+
+    def to_dict(self) -> dict:
+        return {key: getattr(self, key) for key in self._FIELD_ORDER if hasattr(self, key)}
+
+    # ── Dict interface ─────────────────────────────────────────
+    # For mapping-style callers (FeatureBuilder, batch unpacking). Slot
+    # access already rejects unknown keys, so these stay thin wrappers.
+
+    def __getitem__(self, key: str):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key: str, value):
+        try:
+            setattr(self, key, value)
+        except AttributeError:
+            raise KeyError(f"MatchContext has no field '{key}'.") from None
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._FIELDS and hasattr(self, key)
+
+    def get(self, key: str, default=None):
+        return getattr(self, key, default)
+
+    def update(self, values: dict):
+        try:
+            for key, value in values.items():
+                setattr(self, key, value)
+        except AttributeError:
+            raise KeyError(f"MatchContext has no field '{key}'.") from None
+
+    def keys(self) -> list:
+        return list(self.to_dict())
+
+    def __repr__(self) -> str:
+        return f"MatchContext({self.to_dict()!r})"
+
+
+def context_stage(method):
+    """
+    Compatibility adapter for stages written against MatchContext.
+    A MatchContext passes straight through and is filled in place.
+    A plain dict is loaded into a context, and the caller gets back a
+    new dict with the stage's output added — the old {**data, ...}
+    behaviour, with the caller's dict left untouched.
+    """
+    @functools.wraps(method)
+    def wrapper(self, data):
+        if isinstance(data, MatchContext):
+            return method(self, data)
+        known = MatchContext._FIELDS
+        context = MatchContext(**{k: v for k, v in data.items() if k in known})
+        return {**data, **method(self, context).to_dict()}
+    return wrapper
@@ -0,0 +1,16 @@
+"""
+errors.py — Exceptions the API answers with a client status code.
+
+Only code that has checked the caller's input raises these; anything
+else raised while handling a request is a server error (500). Both
+subclass the builtin they refine, so existing except clauses still
+catch them.
+"""
+
+
+class NotFound(LookupError):
+    """A club, fixture, player, team or model version that does not exist (404)."""
+
+
+class InvalidInput(ValueError):
+    """Input that fails validation, or that the pipeline cannot analyse (422)."""
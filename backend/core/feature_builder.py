@@ -1,3 +1,6 @@
+import numpy as np
+
+
 class FeatureBuilder:
 
     # Must match training schema exactly when ML is added in Phase 2
@@ -19,4 +22,18 @@ class FeatureBuilder:
     def to_list(self, data: dict) -> list:
         """Returns features as ordered list for scikit-learn."""
         features = self.build(data)
-        return [features[k] for k in self.FEATURE_KEYS]
\ No newline at end of file
+        return [features[k] for k in self.FEATURE_KEYS]
+
+    def to_matrix(self, contexts: list) -> np.ndarray:
+        """
+        Features for many enriched contexts as one C-contiguous float64
+        array of shape (len(contexts), len(FEATURE_KEYS)), rows in
+        input order and columns in FEATURE_KEYS order.
+        """
+        keys = self.FEATURE_KEYS
+        flat = np.fromiter(
+            (d.get(k, 0.0) for d in contexts for k in keys),
+            dtype=np.float64,
+            count=len(contexts) * len(keys),
+        )
+        return flat.reshape(len(contexts), len(keys))
@@ -1,40 +1,91 @@
+import numpy as np
+
+from core.columns import results_matrix, round_column
+from core.context import MatchContext, context_stage
+
+
 class FormAnalyser:
+    """
+    Form over the results in one request, at most `window` of them.
+    core/rolling_form.py keeps the same figures over a whole history.
+    """
 
     POINTS = {"W": 3, "D": 1, "L": 0}
-    MAX_POINTS = 15  # 5 wins = max
+    WINDOW = 5
+    RECENT_SHARE = 0.4  # momentum: the last 2 of 5 vs the 3 before
 
-    def analyse(self, data: dict) -> dict:
-        results = data["last_5_results"]
-        opp_results = data.get("opponent_last_5_results", ["D"] * 5)
+    READS = ("last_5_results", "opponent_last_5_results")
+    WRITES = ("form_score", "opponent_form_score", "momentum", "form_label")
+    # analyse_team(): all but opponent_form_score, which is the
+    # opponent's own form_score
+    TEAM_WRITES = ("form_score", "momentum", "form_label")
 
-        form_data = {
-            "form_score": self._form_score(results),
-            "opponent_form_score": self._form_score(opp_results),
-            "momentum": self._momentum(results),
-            "form_label": self._form_label(results),
-        }
+    def __init__(self, window: int = WINDOW):
+        if window < 1:
+            raise ValueError("window must be at least 1.")
+        self.window = window
+        self.max_points = self.POINTS["W"] * window  # all wins = max
+        self.recent = max(1, round(window * self.RECENT_SHARE))
+
+    @context_stage
+    def analyse(self, data: MatchContext) -> MatchContext:
+        results = data.last_5_results
+        opp_results = getattr(data, "opponent_last_5_results", ["D"] * 5)
+
+        data.form_score = self._form_score(results)
+        data.opponent_form_score = self._form_score(opp_results)
+        data.momentum = self._momentum(results)
+        data.form_label = self._form_label(results)
+        return data
+
+    @context_stage
+    def analyse_team(self, data: MatchContext) -> MatchContext:
+        results = data.last_5_results
+        data.form_score = self._form_score(results)
+        data.momentum = self._momentum(results)
+        data.form_label = self._form_label(results)
+        return data
+
+    def analyse_batch(self, rows: list) -> dict:
+        """Column-wise analyse() over many validated inputs."""
+        results = [r["last_5_results"] for r in rows]
+        opp_results = [r.get("opponent_last_5_results", ["D"] * 5) for r in rows]
+        pts, lengths = results_matrix(results, self.POINTS)
+        opp_pts, opp_lengths = results_matrix(opp_results, self.POINTS)
 
-        return {**data, **form_data}
+        cols = self.analyse_points(pts, lengths, opp_pts, opp_lengths)
+        cols["form_label"] = [self._form_label(r) for r in results]
+        return cols
+
+    def analyse_points(self, pts, lengths, opp_pts, opp_lengths) -> dict:
+        """analyse_batch() from results_matrix() output, without form_label."""
+        return {
+            "form_score": self._form_score_batch(pts, lengths),
+            "opponent_form_score": self._form_score_batch(opp_pts, opp_lengths),
+            "momentum": self._momentum_batch(pts, lengths),
+        }
 
     # ── Form Score ─────────────────────────────────────────────
     def _form_score(self, results: list) -> float:
         """0.0 to 1.0 — overall recent form quality."""
         if not results:
             return 0.5
-        pts = sum(self.POINTS.get(r, 1) for r in results)
-        return round(pts / self.MAX_POINTS, 3)
+        pts = sum(self.POINTS.get(r, 1) for r in results[-self.window:])
+        return round(pts / self.max_points, 3)
 
     # ── Momentum ───────────────────────────────────────────────
     def _momentum(self, results: list) -> str:
         """
-        Compares last 2 results vs first 3.
+        Compares the last 2 results vs the first 3 (for a window of 5).
         Returns Rising, Falling or Stable.
         """
-        if len(results) < 3:
+        results = results[-self.window:]
+        earlier_n = self.window - self.recent
+        if len(results) <= self.recent or len(results) < earlier_n:
             return "Stable"
 
-        recent = sum(self.POINTS.get(r, 1) for r in results[-2:]) / 2
-        earlier = sum(self.POINTS.get(r, 1) for r in results[:3]) / 3
+        recent = sum(self.POINTS.get(r, 1) for r in results[-self.recent:]) / self.recent
+        earlier = sum(self.POINTS.get(r, 1) for r in results[:earlier_n]) / earlier_n
 
         if recent > earlier + 0.5:
             return "Rising"
@@ -45,4 +96,35 @@ class FormAnalyser:
     # ── Form Label ─────────────────────────────────────────────
     def _form_label(self, results: list) -> str:
         """Human readable form string e.g. W W D L W"""
-        return " ".join(results)
\ No newline at end of file
+        return " ".join(results)
+
+    # ── Batch Versions ─────────────────────────────────────────
+    # Rows are left-aligned with their lengths, so window sums come
+    # from one cumulative sum per row.
+    def _cumsum(self, pts: np.ndarray) -> np.ndarray:
+        cs = np.zeros((len(pts), pts.shape[1] + 1))
+        np.cumsum(pts, axis=1, out=cs[:, 1:])
+        return cs
+
+    def _window_sums(self, cs: np.ndarray, start: np.ndarray, stop: np.ndarray) -> np.ndarray:
+        rows = np.arange(len(cs))
+        return cs[rows, stop] - cs[rows, start]
+
+    def _form_score_batch(self, pts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+        start = np.maximum(lengths - self.window, 0)
+        scores = round_column(self._window_sums(self._cumsum(pts), start, lengths) / self.max_points)
+        return np.where(lengths == 0, 0.5, scores)
+
+    def _momentum_batch(self, pts: np.ndarray, lengths: np.ndarray) -> list:
+        earlier_n = self.window - self.recent
+        start = np.maximum(lengths - self.window, 0)
+        count = lengths - start
+        cs = self._cumsum(pts)
+        recent = self._window_sums(cs, np.maximum(lengths - self.recent, 0), lengths) / self.recent
+        earlier = self._window_sums(cs, start, np.minimum(start + earlier_n, lengths)) / earlier_n
+
+        long_enough = (count > self.recent) & (count >= earlier_n)
+        labels = np.full(len(pts), "Stable", dtype=object)
+        labels[long_enough & (recent > earlier + 0.5)] = "Rising"
+        labels[long_enough & (recent < earlier - 0.5)] = "Falling"
+        return labels.tolist()
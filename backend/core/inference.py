@@ -0,0 +1,187 @@
+"""
+inference.py — The Phase 2 ML hook: one place that calls predict_proba.
+
+predict_rows() builds a feature matrix with FeatureBuilder.to_matrix
+and makes a single predict_proba call for all rows. predict() serves
+one request; with micro-batching on (max_rows > 1), concurrent
+predict() calls are gathered by a background thread for up to
+max_wait_ms or max_rows, whichever comes first, and share one call.
+
+Failures no longer vanish into stdout: they are logged and counted,
+and stats() exposes the counters.
+
+The model and its version are swapped together with one assignment
+(set_model). A predict_proba call reads the pair once, so in-flight
+calls finish on the model they started with. Each result is a
+Probabilities tuple whose .version names the model that produced it.
+"""
+
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from core.feature_builder import FeatureBuilder
+
+logger = logging.getLogger(__name__)
+
+
+class Probabilities(tuple):
+    """(loss, draw, win) for one row; .version is the model version that produced it."""
+
+    def __new__(cls, values, version: str = None):
+        probs = super().__new__(cls, values)
+        probs.version = version
+        return probs
+
+
+class MLInference:
+
+    def __init__(self, model=None, max_rows: int = 1, max_wait_ms: float = 2.0, features: FeatureBuilder = None):
+        if max_rows < 1:
+            raise ValueError("max_rows must be at least 1.")
+        self._active = (model, None)
+        self.features = features or FeatureBuilder()
+        self.max_rows = max_rows
+        self.max_wait_ms = max_wait_ms
+
+        self._queue = queue.Queue()
+        self._worker = None
+        self._lock = threading.Lock()
+
+        self.successes = 0
+        self.failures = 0
+        self.calls = 0
+
+    @classmethod
+    def from_env(cls, model=None):
+        """
+        Micro-batching configured from GAFFEROS_ML_BATCH_ROWS (default 1,
+        i.e. off) and GAFFEROS_ML_BATCH_WAIT_MS (default 2).
+        """
+        return cls(
+            model,
+            max_rows=int(os.getenv("GAFFEROS_ML_BATCH_ROWS", "1")),
+            max_wait_ms=float(os.getenv("GAFFEROS_ML_BATCH_WAIT_MS", "2")),
+        )
+
+    # ── Model ──────────────────────────────────────────────────
+    @property
+    def model(self):
+        return self._active[0]
+
+    @model.setter
+    def model(self, model):
+        self._active = (model, None)
+
+    @property
+    def version(self):
+        return self._active[1]
+
+    def set_model(self, model, version: str = None):
+        """Swaps model and version in together."""
+        self._active = (model, version)
+
+    # ── Prediction ─────────────────────────────────────────────
+    def predict(self, context):
+        """(loss, draw, win) for one enriched context, or None on failure."""
+        if self.max_rows == 1:
+            return self.predict_rows([context])[0]
+
+        self._ensure_worker()
+        future = Future()
+        self._queue.put((context, future))
+        return future.result()
+
+    def predict_rows(self, contexts: list) -> list:
+        """
+        One predict_proba call for all contexts. If it fails, each row
+        is retried alone so only the bad rows come back as None.
+        """
+        model, version = self._active
+        try:
+            matrix = self.features.to_matrix(contexts)
+            rows = model.predict_proba(matrix)
+            self._count(calls=1, successes=len(contexts))
+            return [self._probabilities(row, version) for row in rows]
+        except Exception as e:
+            if len(contexts) == 1:
+                self._count(calls=1, failures=1)
+                logger.warning("ML prediction failed: %s", e)
+                return [None]
+
+        return [self.predict_rows([context])[0] for context in contexts]
+
+    @staticmethod
+    def _probabilities(probs, version: str = None) -> Probabilities:
+        """(loss, draw, win) rounded to 3dp from one predict_proba row."""
+        return Probabilities((
+            round(probs[0], 3),
+            round(probs[1], 3),
+            round(probs[2], 3),
+        ), version)
+
+    # ── Micro-batching ─────────────────────────────────────────
+    def _ensure_worker(self):
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._drain, name="ml-batcher", daemon=True)
+                self._worker.start()
+
+    def _drain(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            deadline = time.monotonic() + self.max_wait_ms / 1000
+
+            while len(batch) < self.max_rows:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._queue.put(None)
+                    break
+                batch.append(item)
+
+            try:
+                results = self.predict_rows([context for context, _ in batch])
+            except Exception as e:
+                results = [None] * len(batch)
+                logger.warning("ML micro-batch failed: %s", e)
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+
+    def close(self):
+        """Stops the micro-batching thread once queued requests are served."""
+        with self._lock:
+            if self._worker is not None:
+                self._queue.put(None)
+                self._worker.join()
+                self._worker = None
+
+    # ── Stats ──────────────────────────────────────────────────
+    def _count(self, calls=0, successes=0, failures=0):
+        with self._lock:
+            self.calls += calls
+            self.successes += successes
+            self.failures += failures
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "model_loaded": self.model is not None,
+                "model_version": self.version,
+                "max_rows": self.max_rows,
+                "max_wait_ms": self.max_wait_ms,
+                "predict_calls": self.calls,
+                "successes": self.successes,
+                "failures": self.failures,
+            }
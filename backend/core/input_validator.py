@@ -1,4 +1,27 @@
+from pydantic import ValidationError
+
+from core.errors import InvalidInput
 from core.schemas import MatchAnalysisRequest, DataTier, Tier1Input, Tier2Input
+from core.payloads import ANALYSE_ADAPTER, ROUND_ADAPTER
+
+# A round team's tier 2 averages, and the opponent field each fills in
+# the other side's request
+ROUND_AVERAGES = {
+    "avg_possession": "opp_avg_possession",
+    "avg_passing_accuracy": "opp_avg_passing_accuracy",
+    "avg_shots_per_match": "opp_avg_shots_per_match",
+    "avg_shots_on_target": None,
+    "avg_defensive_errors": "opp_avg_defensive_errors",
+}
+
+
+def _checked(validate, raw):
+    """validate(raw), with a pydantic ValidationError raised as InvalidInput."""
+    try:
+        return validate(raw)
+    except ValidationError as e:
+        raise InvalidInput(str(e)) from e
+
 
 class InputValidator:
 
@@ -10,29 +33,122 @@ class InputValidator:
         else:
             raise NotImplementedError("Tier 3 is future scope.")
 
+    # ── Fast Path ──────────────────────────────────────────────
+    def validate_json(self, raw) -> dict:
+        """
+        Parses and validates an analyse request body (JSON str / bytes)
+        in one pass, straight to the same dict validate() returns.
+        """
+        return self._validate_payload(_checked(ANALYSE_ADAPTER.validate_json, raw))
+
+    def validate_payload(self, payload: dict) -> dict:
+        """Same as validate_json for an already-decoded JSON object."""
+        return self._validate_payload(_checked(ANALYSE_ADAPTER.validate_python, payload))
+
+    def _validate_payload(self, body: dict) -> dict:
+        tier = DataTier(body["tier"])
+        data = body.get("tier1_data" if tier == DataTier.TIER_1 else "tier2_data")
+        if data is None:
+            raise InvalidInput("Tier 1 data missing." if tier == DataTier.TIER_1 else "Tier 2 data missing.")
+
+        data["players"] = self._players(data.get("players"))
+        if tier == DataTier.TIER_1:
+            return self._tier1_fields(data)
+        return self._tier2_fields(data)
+
+    def _players(self, players) -> list:
+        return [
+            {
+                "name": p["name"],
+                "position": p["position"],
+                "specific_position": p["specific_position"],
+                "secondary_position": p.get("secondary_position"),
+                "available": p.get("available", True),
+                "fitness_score": p.get("fitness_score", 1.0),
+            }
+            for p in players
+        ] if players else []
+
+    # ── Fixture Rounds ─────────────────────────────────────────
+    def validate_round_json(self, raw) -> tuple:
+        """
+        Parses and validates a fixture round body (FixtureRoundRequest) in one
+        pass. Returns ({team_name: team}, [(home, away), ...]); each team
+        is validated once, whatever number of fixtures it appears in.
+        """
+        return self._validate_round(_checked(ROUND_ADAPTER.validate_json, raw))
+
+    def validate_round_payload(self, payload: dict) -> tuple:
+        """Same as validate_round_json for an already-decoded JSON object."""
+        return self._validate_round(_checked(ROUND_ADAPTER.validate_python, payload))
+
+    def _validate_round(self, body: dict) -> tuple:
+        teams = {}
+        for team in body["teams"]:
+            name = team["team_name"]
+            if name in teams:
+                raise InvalidInput(f"Team {name!r} is listed more than once.")
+            given = [key for key in ROUND_AVERAGES if team.get(key) is not None]
+            if given and len(given) < len(ROUND_AVERAGES):
+                raise InvalidInput(f"{name} needs all of {', '.join(ROUND_AVERAGES)} for tier 2, or none.")
+            team["tier"] = DataTier.TIER_2 if given else DataTier.TIER_1
+            team["players"] = self._players(team.get("players"))
+            teams[name] = team
+
+        fixtures = []
+        for fixture in body["fixtures"]:
+            home, away = fixture["home"], fixture["away"]
+            for name in (home, away):
+                if name not in teams:
+                    raise InvalidInput(f"Fixture team {name!r} is not in teams.")
+            if home == away:
+                raise InvalidInput(f"{home} cannot play itself.")
+            fixtures.append((home, away))
+        return teams, fixtures
+
+    def side_fields(self, team: dict, opponent: dict = None) -> dict:
+        """
+        The validate() dict for one side of a round fixture: the team's
+        own fields, with the opponent's filled from the opponent's
+        results and, at tier 2, its averages. The same dict /analyse
+        would produce for that request. Without an opponent, the
+        neutral defaults.
+        """
+        fields = dict(team, opponent_name="")
+        if opponent is not None:
+            fields.update(
+                opponent_name=opponent["team_name"],
+                opponent_last_5_results=opponent["last_5_results"],
+                opponent_goals_scored=opponent["goals_scored_last_5"],
+                opponent_goals_conceded=opponent["goals_conceded_last_5"],
+            )
+        if team["tier"] == DataTier.TIER_1:
+            return self._tier1_fields(fields)
+        if opponent is not None:
+            fields.update({opp_key: opponent.get(key) for key, opp_key in ROUND_AVERAGES.items() if opp_key})
+        return self._tier2_fields(fields)
+
     # ── Tier 1 ─────────────────────────────────────────────────
     def _validate_tier1(self, data: Tier1Input) -> dict:
         if data is None:
-            raise ValueError("Tier 1 data missing.")
+            raise InvalidInput("Tier 1 data missing.")
+        # mode="json" unwraps enums to their values in one C-level pass
+        return self._tier1_fields(data.model_dump(mode="json"))
 
+    def _tier1_fields(self, f: dict) -> dict:
         return {
             "tier": DataTier.TIER_1,
-            "team_name": data.team_name,
-            "opponent_name": data.opponent_name,
-            "last_5_results": [r.value for r in data.last_5_results],
-            "goals_scored_last_5": data.goals_scored_last_5,
-            "goals_conceded_last_5": data.goals_conceded_last_5,
-            "players": [{k: (v.value if hasattr(v, "value") else v) for k, v in p.dict().items()} for p in data.players]
-             if data.players else [],
+            "team_name": f["team_name"],
+            "opponent_name": f["opponent_name"],
+            "last_5_results": f["last_5_results"],
+            "goals_scored_last_5": f["goals_scored_last_5"],
+            "goals_conceded_last_5": f["goals_conceded_last_5"],
+            "players": f.get("players") or [],
 
             # Opponent — use neutral defaults if not provided
-            "opponent_last_5_results": (
-                [r.value for r in data.opponent_last_5_results]
-                if data.opponent_last_5_results
-                else ["D", "D", "D", "D", "D"]
-            ),
-            "opponent_goals_scored": data.opponent_goals_scored or 6,
-            "opponent_goals_conceded": data.opponent_goals_conceded or 6,
+            "opponent_last_5_results": f.get("opponent_last_5_results") or ["D", "D", "D", "D", "D"],
+            "opponent_goals_scored": f.get("opponent_goals_scored") or 6,
+            "opponent_goals_conceded": f.get("opponent_goals_conceded") or 6,
 
             # Tier 2 fields — None for now
             "avg_possession": None,
@@ -49,19 +165,21 @@ class InputValidator:
     # ── Tier 2 ─────────────────────────────────────────────────
     def _validate_tier2(self, data: Tier2Input) -> dict:
         if data is None:
-            raise ValueError("Tier 2 data missing.")
+            raise InvalidInput("Tier 2 data missing.")
+        return self._tier2_fields(data.model_dump(mode="json"))
 
-        base = self._validate_tier1(data)
+    def _tier2_fields(self, f: dict) -> dict:
+        base = self._tier1_fields(f)
         base.update({
             "tier": DataTier.TIER_2,
-            "avg_possession": data.avg_possession,
-            "avg_passing_accuracy": data.avg_passing_accuracy,
-            "avg_shots_per_match": data.avg_shots_per_match,
-            "avg_shots_on_target": data.avg_shots_on_target,
-            "avg_defensive_errors": data.avg_defensive_errors,
-            "opp_avg_possession": data.opp_avg_possession or 50.0,
-            "opp_avg_passing_accuracy": data.opp_avg_passing_accuracy or 72.0,
-            "opp_avg_shots_per_match": data.opp_avg_shots_per_match or 10.0,
-            "opp_avg_defensive_errors": data.opp_avg_defensive_errors or 1.5,
+            "avg_possession": f["avg_possession"],
+            "avg_passing_accuracy": f["avg_passing_accuracy"],
+            "avg_shots_per_match": f["avg_shots_per_match"],
+            "avg_shots_on_target": f["avg_shots_on_target"],
+            "avg_defensive_errors": f["avg_defensive_errors"],
+            "opp_avg_possession": f.get("opp_avg_possession") or 50.0,
+            "opp_avg_passing_accuracy": f.get("opp_avg_passing_accuracy") or 72.0,
+            "opp_avg_shots_per_match": f.get("opp_avg_shots_per_match") or 10.0,
+            "opp_avg_defensive_errors": f.get("opp_avg_defensive_errors") or 1.5,
         })
-        return base
\ No newline at end of file
+        return base
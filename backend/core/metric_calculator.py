@@ -1,24 +1,109 @@
+import numpy as np
+
+from core.columns import float_column, results_matrix, round_column
+from core.context import MatchContext, context_stage
+
+
 class MetricCalculator:
 
-    def calculate(self, data: dict) -> dict:
-        metrics = {}
-        metrics["offensive_strength_index"] = self._offensive_strength(data)
-        metrics["defensive_vulnerability_index"] = self._defensive_vulnerability(data)
-        metrics["transition_intensity_score"] = self._transition_intensity(data)
-        metrics["fatigue_risk_score"] = self._fatigue_risk(data)
-        metrics["tactical_stability_score"] = self._tactical_stability(data)
-        metrics["opponent_strength_index"] = self._opponent_strength(data)
-        return {**data, **metrics}
+    POINTS = {"W": 3, "D": 1, "L": 0}
+
+    # Context keys calculate() reads and writes, for the stage graph
+    READS = (
+        "last_5_results", "goals_scored_last_5", "goals_conceded_last_5", "players",
+        "opponent_last_5_results", "opponent_goals_scored",
+        "avg_possession", "avg_shots_per_match", "avg_shots_on_target",
+        "avg_defensive_errors", "opp_avg_shots_per_match",
+    )
+    WRITES = (
+        "offensive_strength_index", "defensive_vulnerability_index",
+        "transition_intensity_score", "fatigue_risk_score",
+        "tactical_stability_score", "opponent_strength_index",
+    )
+    # The indices that depend only on the team's own input
+    TEAM_WRITES = WRITES[:5]
+
+    @context_stage
+    def calculate(self, data: MatchContext) -> MatchContext:
+        data.offensive_strength_index = self._offensive_strength(data)
+        data.defensive_vulnerability_index = self._defensive_vulnerability(data)
+        data.transition_intensity_score = self._transition_intensity(data)
+        data.fatigue_risk_score = self._fatigue_risk(data)
+        data.tactical_stability_score = self._tactical_stability(data)
+        data.opponent_strength_index = self._opponent_strength(data)
+        return data
+
+    @context_stage
+    def update_fatigue(self, data: MatchContext) -> MatchContext:
+        """Recomputes only fatigue_risk_score, for player-only changes."""
+        data.fatigue_risk_score = self._fatigue_risk(data)
+        return data
+
+    @context_stage
+    def calculate_team(self, data: MatchContext) -> MatchContext:
+        """
+        calculate() split in two, for fixture rounds: TEAM_WRITES once
+        per team, calculate_opponent() once per opponent.
+        """
+        data.offensive_strength_index = self._offensive_strength(data)
+        data.defensive_vulnerability_index = self._defensive_vulnerability(data)
+        data.transition_intensity_score = self._transition_intensity(data)
+        data.fatigue_risk_score = self._fatigue_risk(data)
+        data.tactical_stability_score = self._tactical_stability(data)
+        return data
+
+    @context_stage
+    def calculate_opponent(self, data: MatchContext) -> MatchContext:
+        data.opponent_strength_index = self._opponent_strength(data)
+        return data
+
+    def calculate_batch(self, rows: list) -> dict:
+        """
+        Column-wise calculate() over many validated inputs.
+        Returns {index_name: np.ndarray}, identical to the scalar path.
+        """
+        c = {
+            "goals_scored_last_5": np.array([r.get("goals_scored_last_5") or 0 for r in rows], dtype=np.float64),
+            "goals_conceded_last_5": float_column(rows, "goals_conceded_last_5"),
+            "opponent_goals_scored": np.array([r.get("opponent_goals_scored", 6) for r in rows], dtype=np.float64),
+        }
+        for key in ("avg_shots_per_match", "avg_shots_on_target", "avg_possession",
+                    "avg_defensive_errors", "opp_avg_shots_per_match"):
+            c[key] = float_column(rows, key)
+
+        c["pts"], c["lengths"] = results_matrix([r["last_5_results"] for r in rows], self.POINTS)
+        c["opp_pts"], _ = results_matrix(
+            [r.get("opponent_last_5_results", ["D"] * 5) for r in rows], self.POINTS
+        )
+        c["fitness_total"], c["player_count"] = self._fitness_totals(rows)
+        return self.calculate_columns(c)
+
+    def calculate_columns(self, c: dict) -> dict:
+        """
+        calculate_batch() from input columns: the goal / tier 2 fields
+        (NaN where missing), "pts" / "lengths" and "opp_pts" from
+        results_matrix(), and per row "fitness_total" / "player_count".
+        Lets callers that generate inputs as arrays skip building rows.
+        """
+        pts = c["pts"]
+        return {
+            "offensive_strength_index": round_column(self._offensive_strength_batch(c)),
+            "defensive_vulnerability_index": round_column(self._defensive_vulnerability_batch(c)),
+            "transition_intensity_score": round_column(self._transition_intensity_batch(c, pts)),
+            "fatigue_risk_score": self._fatigue_risk_batch(c["fitness_total"], c["player_count"]),
+            "tactical_stability_score": self._tactical_stability_batch(pts, c["lengths"]),
+            "opponent_strength_index": round_column(self._opponent_strength_batch(c, c["opp_pts"])),
+        }
 
     # ── Offensive Strength ─────────────────────────────────────
-    def _offensive_strength(self, d: dict) -> float:
+    def _offensive_strength(self, d: MatchContext) -> float:
         """Higher = more attacking threat."""
-        goals = d.get("goals_scored_last_5") or 0
+        goals = d.goals_scored_last_5 or 0
 
         goals_component = min(goals / 15.0, 1.0)
 
-        shots = d.get("avg_shots_per_match")
-        on_target = d.get("avg_shots_on_target")
+        shots = d.avg_shots_per_match
+        on_target = d.avg_shots_on_target
 
         if shots is not None and on_target is not None:
             shots_component   = min(shots / 20.0, 1.0)
@@ -28,31 +113,31 @@ class MetricCalculator:
         return round(goals_component, 3)
 
     # ── Defensive Vulnerability ────────────────────────────────
-    def _defensive_vulnerability(self, d: dict) -> float:
+    def _defensive_vulnerability(self, d: MatchContext) -> float:
         """Higher = more defensively exposed."""
-        goals = min(d["goals_conceded_last_5"] / 15.0, 1.0)
+        goals = min(d.goals_conceded_last_5 / 15.0, 1.0)
 
-        if d["avg_defensive_errors"] is not None:
-            errors = min(d["avg_defensive_errors"] / 5.0, 1.0)
+        if d.avg_defensive_errors is not None:
+            errors = min(d.avg_defensive_errors / 5.0, 1.0)
             return round(goals * 0.6 + errors * 0.4, 3)
 
         return round(goals, 3)
 
     # ── Transition Intensity ───────────────────────────────────
-    def _transition_intensity(self, d: dict) -> float:
+    def _transition_intensity(self, d: MatchContext) -> float:
         """High shots + low possession = transition style."""
-        if d["avg_shots_per_match"] is not None and d["avg_possession"] is not None:
-            shots = min(d["avg_shots_per_match"] / 20.0, 1.0)
-            possession_inv = 1.0 - (d["avg_possession"] / 100.0)
+        if d.avg_shots_per_match is not None and d.avg_possession is not None:
+            shots = min(d.avg_shots_per_match / 20.0, 1.0)
+            possession_inv = 1.0 - (d.avg_possession / 100.0)
             return round(shots * 0.5 + possession_inv * 0.5, 3)
 
-        wins = d["last_5_results"].count("W")
+        wins = d.last_5_results.count("W")
         return round(wins / 5.0 * 0.5, 3)
 
     # ── Fatigue Risk ───────────────────────────────────────────
-    def _fatigue_risk(self, d: dict) -> float:
+    def _fatigue_risk(self, d: MatchContext) -> float:
         """Higher = more players at fatigue risk."""
-        players = d.get("players", [])
+        players = getattr(d, "players", [])
         if not players:
             return 0.3
 
@@ -60,10 +145,9 @@ class MetricCalculator:
         return round(1.0 - avg_fitness, 3)
 
     # ── Tactical Stability ─────────────────────────────────────
-    def _tactical_stability(self, d: dict) -> float:
+    def _tactical_stability(self, d: MatchContext) -> float:
         """Higher = more consistent results."""
-        points = {"W": 3, "D": 1, "L": 0}
-        pts = [points[r] for r in d["last_5_results"]]
+        pts = [self.POINTS[r] for r in d.last_5_results]
 
         if len(pts) < 2:
             return 0.5
@@ -73,17 +157,82 @@ class MetricCalculator:
         return round(1.0 - min(variance / 9.0, 1.0), 3)
 
     # ── Opponent Strength ──────────────────────────────────────
-    def _opponent_strength(self, d: dict) -> float:
+    def _opponent_strength(self, d: MatchContext) -> float:
         """Mirrors offensive strength but for opponent."""
-        opp_results = d.get("opponent_last_5_results", ["D"] * 5)
-        opp_goals = d.get("opponent_goals_scored", 6)
+        opp_results = getattr(d, "opponent_last_5_results", ["D"] * 5)
+        opp_goals = getattr(d, "opponent_goals_scored", 6)
 
         wins = opp_results.count("W")
         goals = min(opp_goals / 15.0, 1.0)
         wins_score = wins / 5.0
 
-        if d["opp_avg_shots_per_match"] is not None:
-            shots = min(d["opp_avg_shots_per_match"] / 20.0, 1.0)
+        if d.opp_avg_shots_per_match is not None:
+            shots = min(d.opp_avg_shots_per_match / 20.0, 1.0)
             return round(goals * 0.35 + wins_score * 0.35 + shots * 0.3, 3)
 
-        return round(goals * 0.5 + wins_score * 0.5, 3)
\ No newline at end of file
+        return round(goals * 0.5 + wins_score * 0.5, 3)
+
+    # ── Batch Versions ─────────────────────────────────────────
+    # Same formulas and operation order as above so every value
+    # rounds to exactly what the scalar methods return.
+
+    def _offensive_strength_batch(self, c: dict) -> np.ndarray:
+        goals_component = np.minimum(c["goals_scored_last_5"] / 15.0, 1.0)
+        shots, on_target = c["avg_shots_per_match"], c["avg_shots_on_target"]
+        tier2 = (
+            goals_component * 0.4
+            + np.minimum(shots / 20.0, 1.0) * 0.35
+            + np.minimum(on_target / 10.0, 1.0) * 0.25
+        )
+        has_stats = ~np.isnan(shots) & ~np.isnan(on_target)
+        return np.where(has_stats, tier2, goals_component)
+
+    def _defensive_vulnerability_batch(self, c: dict) -> np.ndarray:
+        goals = np.minimum(c["goals_conceded_last_5"] / 15.0, 1.0)
+        errors = c["avg_defensive_errors"]
+        tier2 = goals * 0.6 + np.minimum(errors / 5.0, 1.0) * 0.4
+        return np.where(~np.isnan(errors), tier2, goals)
+
+    def _transition_intensity_batch(self, c: dict, pts: np.ndarray) -> np.ndarray:
+        shots, possession = c["avg_shots_per_match"], c["avg_possession"]
+        tier2 = np.minimum(shots / 20.0, 1.0) * 0.5 + (1.0 - (possession / 100.0)) * 0.5
+        wins = (pts == self.POINTS["W"]).sum(axis=1)
+        tier1 = wins / 5.0 * 0.5
+        has_stats = ~np.isnan(shots) & ~np.isnan(possession)
+        return np.where(has_stats, tier2, tier1)
+
+    def _fitness_totals(self, rows: list) -> tuple:
+        counts = np.array([len(r.get("players", [])) for r in rows], dtype=np.int64)
+        owner = np.repeat(np.arange(len(rows)), counts)
+        fitness = np.array(
+            [p.get("fitness_score", 1.0) for r in rows for p in r.get("players", [])],
+            dtype=np.float64,
+        )
+        # bincount accumulates left to right, matching Python's sum()
+        return np.bincount(owner, weights=fitness, minlength=len(rows)), counts
+
+    def _fatigue_risk_batch(self, totals: np.ndarray, counts: np.ndarray) -> np.ndarray:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            risk = round_column(1.0 - totals / counts)
+        return np.where(counts > 0, risk, 0.3)
+
+    def _tactical_stability_batch(self, pts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+        cols = np.arange(pts.shape[1])
+        valid = cols[None, :] < lengths[:, None]
+        safe_len = np.maximum(lengths, 1)
+        mean = pts.sum(axis=1) / safe_len
+
+        variance = np.zeros(len(pts))
+        for j in cols:
+            variance = variance + np.where(valid[:, j], (pts[:, j] - mean) ** 2, 0.0)
+        variance = variance / safe_len
+
+        stability = round_column(1.0 - np.minimum(variance / 9.0, 1.0))
+        return np.where(lengths < 2, 0.5, stability)
+
+    def _opponent_strength_batch(self, c: dict, opp_pts: np.ndarray) -> np.ndarray:
+        wins_score = (opp_pts == self.POINTS["W"]).sum(axis=1) / 5.0
+        goals = np.minimum(c["opponent_goals_scored"] / 15.0, 1.0)
+        shots = c["opp_avg_shots_per_match"]
+        tier2 = goals * 0.35 + wins_score * 0.35 + np.minimum(shots / 20.0, 1.0) * 0.3
+        return np.where(~np.isnan(shots), tier2, goals * 0.5 + wins_score * 0.5)
@@ -0,0 +1,193 @@
+"""
+model_registry.py — Versioned model artifacts, memory-mapped and hot-swappable.
+
+Artifacts live under one directory per model name:
+
+    models/match_predictor/2026-10-01.joblib
+    models/match_predictor/2026-10-15.joblib
+    models/match_predictor/CURRENT      the active version's name
+
+publish() writes a new version with joblib, uncompressed and via a
+temporary file and os.replace, so a half-written artifact is never
+visible. Versions are immutable; publishing an existing one is an error.
+
+load() opens an artifact with joblib's mmap_mode="r". The NumPy arrays
+inside (tree node tables, coefficient matrices) are then read-only
+memory maps of the file rather than private copies. Every uvicorn
+worker that loads the same version shares those pages through the page
+cache, so adding workers adds little model memory. Only arrays are
+mapped; a model whose weights are one opaque blob (an XGBoost booster)
+is still unpickled per process.
+
+activate() loads a version and hands (model, version) to the listeners,
+normally TactIQPipeline.use_model, which swaps both in with one
+assignment. promote() also writes CURRENT, and reload_if_changed()
+(run every poll_interval seconds from a background thread) is how the
+other workers pick that up, as RuleBook does for the rule table.
+"""
+
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from core.errors import InvalidInput, NotFound
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ROOT = Path(__file__).resolve().parent.parent / "models"
+DEFAULT_NAME = "match_predictor"
+SUFFIX = ".joblib"
+
+
+class ModelRegistry:
+
+    def __init__(self, root=DEFAULT_ROOT, name: str = DEFAULT_NAME, mmap: bool = True,
+                 poll_interval: float = 0.0):
+        self.root = Path(root) / name
+        self.name = name
+        self.mmap = mmap
+        self.version = None
+        self.loaded_at = None
+        self._model = None
+        self._lock = threading.Lock()
+        self._listeners = []
+        self._mtime = self._stat()
+        self.poll_interval = poll_interval
+        if poll_interval > 0:
+            threading.Thread(target=self._poll, name="model-registry-poll", daemon=True).start()
+
+    @classmethod
+    def from_env(cls):
+        """
+        Registry at GAFFEROS_MODEL_DIR (default backend/models) for
+        GAFFEROS_MODEL_NAME (default match_predictor). GAFFEROS_MODEL_MMAP=0
+        loads private copies; GAFFEROS_MODEL_POLL seconds turns on
+        polling CURRENT. Returns None when GAFFEROS_MODEL_DIR is unset and
+        the default directory has no artifacts.
+        """
+        root = os.getenv("GAFFEROS_MODEL_DIR")
+        registry = cls(
+            root or DEFAULT_ROOT,
+            name=os.getenv("GAFFEROS_MODEL_NAME", DEFAULT_NAME),
+            mmap=os.getenv("GAFFEROS_MODEL_MMAP", "1") != "0",
+            poll_interval=float(os.getenv("GAFFEROS_MODEL_POLL", "0")),
+        )
+        if root is None and not registry.versions():
+            return None
+        return registry
+
+    # ── Artifacts ──────────────────────────────────────────────
+    def path(self, version: str) -> Path:
+        if not version or Path(version).name != version or version.startswith("."):
+            raise InvalidInput(f"Invalid model version {version!r}.")
+        return self.root / f"{version}{SUFFIX}"
+
+    def versions(self) -> list:
+        """Published versions, oldest name first."""
+        if not self.root.is_dir():
+            return []
+        return sorted(p.name[:-len(SUFFIX)] for p in self.root.glob(f"*{SUFFIX}"))
+
+    def current(self):
+        """The version CURRENT names, else the newest published one, else None."""
+        try:
+            return (self.root / "CURRENT").read_text(encoding="utf-8").strip() or None
+        except OSError:
+            versions = self.versions()
+            return versions[-1] if versions else None
+
+    def publish(self, model, version: str) -> Path:
+        """Writes model as a new version. Uncompressed, so load() can map its arrays."""
+        import joblib
+
+        path = self.path(version)
+        if path.exists():
+            raise ValueError(f"Model version {version!r} already exists.")
+        self.root.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        os.close(fd)
+        try:
+            joblib.dump(model, tmp, compress=0)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        return path
+
+    def load(self, version: str):
+        """The model for version, memory-mapped unless mmap is off. Raises NotFound if unpublished."""
+        import joblib
+
+        path = self.path(version)
+        if not path.exists():
+            raise NotFound(f"No model version {version!r} in {self.root}.")
+        return joblib.load(path, mmap_mode="r" if self.mmap else None)
+
+    # ── Swapping ───────────────────────────────────────────────
+    def activate(self, version: str = None) -> str:
+        """
+        Loads version (default: current()) and passes (model, version)
+        to every listener. Returns the version, or None when there is
+        nothing published.
+        """
+        with self._lock:
+            version = version or self.current()
+            if version is None:
+                return None
+            # The old model's maps close once in-flight calls drop it
+            model = self._model if version == self.version else self.load(version)
+            self._model, self.version = model, version
+            self.loaded_at = time.time()
+        logger.info("Activated model %s %s", self.name, version)
+        for listener in self._listeners:
+            listener(model, version)
+        return version
+
+    def promote(self, version: str) -> str:
+        """activate(version), then records it in CURRENT for the other workers."""
+        self.activate(version)
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(version)
+        os.replace(tmp, self.root / "CURRENT")
+        self._mtime = self._stat()
+        return version
+
+    def on_swap(self, listener):
+        """Calls listener(model, version) after every activate()."""
+        self._listeners.append(listener)
+
+    def reload_if_changed(self) -> bool:
+        if self._stat() == self._mtime:
+            return False
+        self._mtime = self._stat()
+        try:
+            self.activate()
+        except Exception as e:
+            # Keep serving the old model; try again once CURRENT changes
+            logger.error("Model swap for %s failed, keeping %s: %s", self.name, self.version, e)
+            return False
+        return True
+
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "version": self.version,
+            "versions": self.versions(),
+            "mmap": self.mmap,
+            "loaded_at": self.loaded_at,
+        }
+
+    def _stat(self):
+        try:
+            return (self.root / "CURRENT").stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def _poll(self):
+        while True:
+            time.sleep(self.poll_interval)
+            self.reload_if_changed()
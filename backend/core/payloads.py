@@ -0,0 +1,89 @@
+"""
+payloads.py — TypedDict versions of the request schemas in schemas.py,
+used by the single-pass validation fast path.
+
+Validating JSON against a TypedDict yields plain dicts and strings, so
+a request is parsed and checked once, straight into the shape
+InputValidator hands to the pipeline — no BaseModel instances, no
+enum unwrapping. The TypedDicts are generated from the BaseModels
+(payload_type), so the two can't drift: same fields, same
+constraints, enums as Literals of their values. Defaults are not
+carried over; InputValidator fills them in.
+"""
+
+from enum import Enum
+from functools import lru_cache
+from typing import Annotated, List, Literal, Union, get_args, get_origin
+
+from pydantic import BaseModel, TypeAdapter
+from typing_extensions import NotRequired, TypedDict
+
+from core.schemas import FixtureRoundRequest, MatchAnalysisRequest
+
+
+def _plain(annotation):
+    """annotation with enums as Literals and models as their payload TypedDicts."""
+    if isinstance(annotation, type) and issubclass(annotation, Enum):
+        return Literal[tuple(member.value for member in annotation)]
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return payload_type(annotation)
+    origin = get_origin(annotation)
+    if origin is Union:
+        return Union[tuple(_plain(arg) for arg in get_args(annotation))]
+    if origin is list:
+        return List[_plain(get_args(annotation)[0])]
+    return annotation
+
+
+@lru_cache(maxsize=None)
+def payload_type(model: type) -> type:
+    """
+    The TypedDict for a request BaseModel. Field constraints carry over
+    as Annotated metadata; fields with a default become NotRequired.
+    """
+    fields = {}
+    for name, info in model.model_fields.items():
+        annotation = _plain(info.annotation)
+        if info.metadata:
+            annotation = Annotated[(annotation, *info.metadata)]
+        fields[name] = annotation if info.is_required() else NotRequired[annotation]
+    return TypedDict(f"{model.__name__}Payload", fields)
+
+
+# Built once at import — constructing a TypeAdapter compiles its validator
+ANALYSE_ADAPTER = TypeAdapter(payload_type(MatchAnalysisRequest))
+ROUND_ADAPTER = TypeAdapter(payload_type(FixtureRoundRequest))
+
+
+# A small valid request, run end to end by TactIQPipeline.warm_up()
+SAMPLE_PAYLOAD = {
+    "tier": "tier_2",
+    "tier2_data": {
+        "team_name": "Warm-up FC",
+        "opponent_name": "Warm-up United",
+        "last_5_results": ["W", "D", "L", "W", "W"],
+        "goals_scored_last_5": 8,
+        "goals_conceded_last_5": 5,
+        "players": [
+            {"name": f"Player {i + 1}", "position": broad, "specific_position": specific,
+             "fitness_score": 0.9 - i * 0.03}
+            for i, (broad, specific) in enumerate((
+                ("GK", "GK"), ("DEF", "CB"), ("DEF", "CB"), ("DEF", "RB"), ("DEF", "LB"),
+                ("MID", "CDM"), ("MID", "CM"), ("MID", "CAM"), ("FWD", "RW"), ("FWD", "ST"),
+                ("FWD", "LW"), ("GK", "GK"), ("DEF", "CB"), ("MID", "CM"),
+            ))
+        ],
+        "opponent_last_5_results": ["L", "D", "W", "L", "D"],
+        "opponent_goals_scored": 5,
+        "opponent_goals_conceded": 7,
+        "avg_possession": 54.0,
+        "avg_passing_accuracy": 79.5,
+        "avg_shots_per_match": 13.4,
+        "avg_shots_on_target": 5.8,
+        "avg_defensive_errors": 1.2,
+        "opp_avg_possession": 46.0,
+        "opp_avg_passing_accuracy": 70.0,
+        "opp_avg_shots_per_match": 9.6,
+        "opp_avg_defensive_errors": 2.4,
+    },
+}
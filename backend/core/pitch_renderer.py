@@ -0,0 +1,321 @@
+"""
+pitch_renderer.py — Formation and starting XI drawn on a pitch, as SVG
+or PNG, for the Streamlit UI and the /render route.
+
+The pitch markings never change, so they are drawn once. SVG output is
+the pitch's SVG text plus one marker group per player. PNG output
+draws the pitch once into a matplotlib Agg canvas and saves its pixels.
+Each render restores those pixels and draws only the markers and the
+title. Figures are never opened through pyplot, so nothing collects in
+pyplot's figure registry between reruns.
+
+Finished images are cached by a hash of what they show: format,
+formation, team name and each player's name, positions and fitness.
+The same XI renders once, however many times the UI reruns.
+
+Layout matches the original app: GK, then one row per formation line
+filled from the XI's DEF / MID / FWD players in order, with empty slots
+shown as "?". Coordinates are on a 100 × 130 pitch, y up.
+"""
+
+import hashlib
+import io
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from engine.rotation_advisor import RotationAdvisor
+
+FORMATS = ("svg", "png")
+MEDIA_TYPES = {"svg": "image/svg+xml", "png": "image/png"}
+
+PITCH_WIDTH, PITCH_HEIGHT = 100, 130
+MARKER_RADIUS = 4.5
+FIT_THRESHOLD = RotationAdvisor.FATIGUE_THRESHOLD
+
+GRASS = "#2d5a27"
+FIT_COLOR = "#1a3a8f"
+TIRED_COLOR = "#8b0000"
+POSITION_COLOR = "#ffdd88"
+FITNESS_COLOR = "#aaffaa"
+
+# (x, y, width, height, line width) — touchlines, boxes, six-yard boxes
+_RECTANGLES = (
+    (5, 5, PITCH_WIDTH - 10, PITCH_HEIGHT - 10, 2),
+    (27, 5, 46, 18, 1.5),
+    (27, PITCH_HEIGHT - 23, 46, 18, 1.5),
+    (38, 5, 24, 8, 1),
+    (38, PITCH_HEIGHT - 13, 24, 8, 1),
+)
+_CENTRE = (PITCH_WIDTH / 2, PITCH_HEIGHT / 2)
+_CENTRE_RADIUS = 10
+
+# PNG: the original 8 × 11 in figure at 100 dpi
+_FIGSIZE = (8, 11)
+_DPI = 100
+
+
+# ── Layout ─────────────────────────────────────────────────────
+def _field(player, key):
+    value = player.get(key)
+    return getattr(value, "value", value)
+
+
+def formation_rows(formation: str, xi: list) -> list:
+    """Rows of players (None for an empty slot), goalkeeper first."""
+    try:
+        lines = [int(x) for x in formation.split("-")]
+    except (AttributeError, ValueError):
+        lines = [4, 3, 3]
+
+    by_group = {"GK": [], "DEF": [], "MID": [], "FWD": []}
+    for player in xi:
+        if player:
+            by_group.get(_field(player, "position"), []).append(player)
+
+    pools = [by_group["DEF"], by_group["MID"], by_group["FWD"]]
+    rows = [by_group["GK"][:1] or [None]]
+    for i, count in enumerate(lines):
+        pool = pools[i] if i < len(pools) else []
+        rows.append([pool[j] if j < len(pool) else None for j in range(count)])
+    return rows
+
+
+def layout(formation: str, xi: list) -> list:
+    """[(x, y, player or None)] on the 100 × 130 pitch."""
+    rows = formation_rows(formation, xi)
+    step = (PITCH_HEIGHT - 30) / max(len(rows) - 1, 1)
+    return [
+        ((PITCH_WIDTH / (len(row) + 1)) * (col + 1), 15 + i * step, player)
+        for i, row in enumerate(rows)
+        for col, player in enumerate(row)
+    ]
+
+
+def _labels(player) -> tuple:
+    fitness = player.get("fitness_score") or 0
+    return (
+        (player.get("name") or "?").split()[-1],
+        _field(player, "specific_position") or "",
+        f"{int(fitness * 100)}%",
+    )
+
+
+def _color(player) -> str:
+    fitness = (player.get("fitness_score") or 0) if player else 0
+    return FIT_COLOR if fitness >= FIT_THRESHOLD else TIRED_COLOR
+
+
+# ── SVG ────────────────────────────────────────────────────────
+def _escape(text: str) -> str:
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;").replace('"', "&quot;")
+
+
+def _svg_pitch() -> str:
+    """Everything up to the markers: size, grass, lines, legend."""
+    h = PITCH_HEIGHT
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {PITCH_WIDTH} {h}" '
+        f'width="{_FIGSIZE[0] * _DPI // 2}" height="{_FIGSIZE[1] * _DPI // 2}" '
+        f'font-family="DejaVu Sans, sans-serif" text-anchor="middle" dominant-baseline="central">',
+        f'<rect width="{PITCH_WIDTH}" height="{h}" fill="{GRASS}"/>',
+        '<g fill="none" stroke="white">',
+    ]
+    for x, y, w, rh, lw in _RECTANGLES:
+        parts.append(f'<rect x="{x}" y="{h - y - rh}" width="{w}" height="{rh}" stroke-width="{lw / 4:g}"/>')
+    cx, cy = _CENTRE
+    parts += [
+        f'<line x1="5" y1="{cy:g}" x2="{PITCH_WIDTH - 5}" y2="{cy:g}" stroke-width="0.375"/>',
+        f'<circle cx="{cx:g}" cy="{cy:g}" r="{_CENTRE_RADIUS}" stroke-width="0.375"/>',
+        '</g>',
+        f'<circle cx="{cx:g}" cy="{cy:g}" r="0.6" fill="white"/>',
+        # Legend, bottom centre
+        '<rect x="22" y="123.2" width="56" height="5" rx="0.8" fill="#1a1a1a" fill-opacity="0.8"/>',
+        f'<circle cx="26" cy="125.7" r="1.2" fill="{FIT_COLOR}"/>',
+        '<text x="34" y="125.7" font-size="1.6" fill="white">Fit (≥65%)</text>',
+        f'<circle cx="45" cy="125.7" r="1.2" fill="{TIRED_COLOR}"/>',
+        '<text x="59" y="125.7" font-size="1.6" fill="white">Fatigue risk (&lt;65%)</text>',
+    ]
+    return "".join(parts)
+
+
+_SVG_PITCH = _svg_pitch()
+
+
+def render_svg(formation: str, xi: list, team_name: str = "") -> bytes:
+    parts = [_SVG_PITCH]
+    for x, y, player in layout(formation, xi):
+        y = PITCH_HEIGHT - y
+        parts.append(
+            f'<circle cx="{x:.2f}" cy="{y:.2f}" r="{MARKER_RADIUS}" fill="{_color(player)}" '
+            f'stroke="white" stroke-width="0.375"/>'
+        )
+        if player:
+            name, position, fitness = _labels(player)
+            parts.append(
+                f'<text x="{x:.2f}" y="{y - 0.5:.2f}" font-size="1.25" font-weight="bold" fill="white">{_escape(name)}</text>'
+                f'<text x="{x:.2f}" y="{y + 1.8:.2f}" font-size="1.0" fill="{POSITION_COLOR}">{_escape(position)}</text>'
+                f'<text x="{x:.2f}" y="{y + 3.5:.2f}" font-size="0.9" fill="{FITNESS_COLOR}">{fitness}</text>'
+            )
+        else:
+            parts.append(f'<text x="{x:.2f}" y="{y:.2f}" font-size="1.8" fill="white">?</text>')
+
+    title = f"{team_name}  ·  {formation}" if team_name else formation
+    parts.append(f'<text x="{PITCH_WIDTH / 2:g}" y="3" font-size="2" font-weight="bold" fill="white">{_escape(title)}</text>')
+    parts.append("</svg>")
+    return "".join(parts).encode("utf-8")
+
+
+# ── PNG ────────────────────────────────────────────────────────
+class _PngCanvas:
+    """One Agg figure holding the pitch; markers are drawn over a saved copy of its pixels."""
+
+    def __init__(self):
+        # matplotlib takes ~0.3 s to import, so it loads with the first
+        # PNG render; optional — SVG output still works without it
+        try:
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
+            from matplotlib.figure import Figure
+            from matplotlib.patches import Circle, Rectangle
+        except ImportError:
+            raise RuntimeError("PNG rendering needs matplotlib; use fmt='svg'.") from None
+
+        self.figure = Figure(figsize=_FIGSIZE, dpi=_DPI, facecolor=GRASS)
+        self.canvas = FigureCanvasAgg(self.figure)
+        ax = self.ax = self.figure.add_subplot()
+        ax.set_facecolor(GRASS)
+
+        for x, y, w, h, lw in _RECTANGLES:
+            ax.add_patch(Rectangle((x, y), w, h, linewidth=lw, edgecolor="white", facecolor="none"))
+        ax.plot([5, PITCH_WIDTH - 5], [_CENTRE[1]] * 2, color="white", linewidth=1.5)
+        ax.add_patch(Circle(_CENTRE, _CENTRE_RADIUS, color="white", fill=False, linewidth=1.5))
+        ax.plot(*_CENTRE, "o", color="white", markersize=3)
+
+        ax.plot([], [], "o", color=FIT_COLOR, label="Fit (≥65%)", markersize=8)
+        ax.plot([], [], "o", color=TIRED_COLOR, label="Fatigue risk (<65%)", markersize=8)
+        ax.legend(loc="lower center", fontsize=7, facecolor="#1a1a1a",
+                  labelcolor="white", framealpha=0.8, ncol=2)
+        ax.set_xlim(0, PITCH_WIDTH)
+        ax.set_ylim(0, PITCH_HEIGHT)
+        ax.axis("off")
+
+        self.canvas.draw()
+        self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self.lock = threading.Lock()
+
+    def render(self, formation: str, xi: list, team_name: str = "") -> bytes:
+        from matplotlib.collections import PatchCollection
+        from matplotlib.image import imsave
+        from matplotlib.patches import Circle
+
+        ax = self.ax
+        with self.lock:
+            spots = layout(formation, xi)
+            # All markers in one collection — one draw call instead of two per player
+            overlay = [PatchCollection(
+                [Circle((x, y), MARKER_RADIUS) for x, y, _ in spots],
+                facecolors=[_color(player) for _, _, player in spots],
+                edgecolors="white", linewidths=1.5, zorder=3,
+            )]
+            ax.add_collection(overlay[0], autolim=False)
+            for x, y, player in spots:
+                if player:
+                    name, position, fitness = _labels(player)
+                    overlay.append(ax.text(x, y + 0.5, name, ha="center", va="center",
+                                           fontsize=5.5, color="white", fontweight="bold", zorder=5))
+                    overlay.append(ax.text(x, y - 1.8, position, ha="center", va="center",
+                                           fontsize=4.5, color=POSITION_COLOR, zorder=5))
+                    overlay.append(ax.text(x, y - 3.5, fitness, ha="center", va="center",
+                                           fontsize=4.0, color=FITNESS_COLOR, zorder=5))
+                else:
+                    overlay.append(ax.text(x, y, "?", ha="center", va="center",
+                                           fontsize=8, color="white", zorder=5))
+
+            title = f"{team_name}  ·  {formation}" if team_name else formation
+            overlay.append(ax.text(PITCH_WIDTH / 2, PITCH_HEIGHT - 2, title, ha="center", va="top",
+                                   fontsize=9, color="white", fontweight="bold"))
+
+            self.canvas.restore_region(self.background)
+            for artist in overlay:
+                ax.draw_artist(artist)
+                artist.remove()
+
+            # Opaque image: drop the alpha channel, and favour speed over size
+            pixels = np.asarray(self.canvas.buffer_rgba())[..., :3]
+            buffer = io.BytesIO()
+            imsave(buffer, pixels, format="png", pil_kwargs={"compress_level": 1})
+            return buffer.getvalue()
+
+
+# ── Renderer ───────────────────────────────────────────────────
+class PitchRenderer:
+
+    def __init__(self, cache_size: int = 256):
+        self.cache_size = cache_size
+        self._entries = OrderedDict()   # key -> image bytes
+        self._lock = threading.Lock()
+        self._png = None
+
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls):
+        """Cache size from GAFFEROS_RENDER_CACHE_SIZE (0 disables, default 256)."""
+        return cls(cache_size=int(os.getenv("GAFFEROS_RENDER_CACHE_SIZE", "256")))
+
+    @staticmethod
+    def key_for(formation: str, xi: list, team_name: str = "", fmt: str = "svg") -> str:
+        """Hash of everything the image shows."""
+        players = [
+            [_field(p, "name"), _field(p, "position"), _field(p, "specific_position"), p.get("fitness_score")]
+            if p else None
+            for p in xi
+        ]
+        canonical = json.dumps([fmt, formation, team_name, players], separators=(",", ":"))
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def render(self, formation: str, xi: list, team_name: str = "", fmt: str = "svg") -> bytes:
+        """
+        formation: e.g. "4-3-3". xi: player dicts as in
+        TacticalReport.starting_xi. Returns SVG or PNG bytes.
+        """
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown format '{fmt}'. Use one of {FORMATS}.")
+
+        key = self.key_for(formation, xi, team_name, fmt)
+        with self._lock:
+            image = self._entries.get(key)
+            if image is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return image
+            self.misses += 1
+
+        if fmt == "svg":
+            image = render_svg(formation, xi, team_name)
+        else:
+            if self._png is None:
+                with self._lock:
+                    if self._png is None:
+                        self._png = _PngCanvas()
+            image = self._png.render(formation, xi, team_name)
+
+        if self.cache_size > 0:
+            with self._lock:
+                self._entries[key] = image
+                while len(self._entries) > self.cache_size:
+                    self._entries.popitem(last=False)
+        return image
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.cache_size,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
@@ -0,0 +1,106 @@
+"""
+report_cache.py — Content-addressed cache of TacticalReports.
+
+Keys are a SHA-256 of the canonical JSON of InputValidator's output,
+so two requests that validate to the same data share one entry no
+matter how they were built. Reports are stored as their JSON bytes
+and rebuilt on a hit, which keeps cached reports byte-identical to
+fresh ones and safe from callers mutating a shared object.
+
+Eviction is LRU once max_size is reached, plus a TTL per entry.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from core.schemas import TacticalReport
+
+
+class ReportCache:
+
+    def __init__(self, max_size: int = 1024, ttl_seconds: float = 600.0, clock=time.monotonic):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1.")
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries = OrderedDict()   # key -> (expires_at, report JSON bytes)
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_env(cls):
+        """
+        Cache configured from GAFFEROS_CACHE_SIZE (0 disables, default
+        1024) and GAFFEROS_CACHE_TTL in seconds (default 600).
+        Returns None when disabled.
+        """
+        size = int(os.getenv("GAFFEROS_CACHE_SIZE", "1024"))
+        if size <= 0:
+            return None
+        return cls(max_size=size, ttl_seconds=float(os.getenv("GAFFEROS_CACHE_TTL", "600")))
+
+    # ── Keys ───────────────────────────────────────────────────
+    @staticmethod
+    def key_for(validated: dict) -> str:
+        """Canonical hash of a validated input dict."""
+        canonical = json.dumps(validated, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    # ── Lookup / Store ─────────────────────────────────────────
+    def get(self, key: str):
+        """Cached TacticalReport for key, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= self._clock():
+                del self._entries[key]
+                self.evictions += 1
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            payload = entry[1]
+
+        return TacticalReport.model_validate_json(payload)
+
+    def put(self, key: str, report: TacticalReport):
+        payload = report.model_dump_json().encode("utf-8")
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl_seconds, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: str = None):
+        """Drops one entry, or everything when key is None."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    # ── Stats ──────────────────────────────────────────────────
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
@@ -0,0 +1,343 @@
+"""
+rolling_form.py — Form over a club's whole match history.
+
+FormAnalyser reads the five results in one request. RollingForm keeps
+form over any number of windows as results are appended: the last N
+matches, and optionally an exponentially weighted window with a given
+half-life. Each append is O(1) per window. backfill() computes the
+same figures after every match of a long history in one pass of
+cumulative sums.
+
+Per window:
+    form_score     points / max points, over the matches in the window
+    momentum       Rising / Falling / Stable. Mean points of the most
+                   recent RECENT_SHARE of the window vs the rest, as
+                   FormAnalyser does (last 2 of 5 vs the 3 before)
+    goals_for      goals scored per match
+    goals_against  goals conceded per match
+    stability      1 - std(points) / 1.5. 1.0 for identical results,
+                   0.0 for alternating wins and losses
+    matches        matches in the window
+
+The exponentially weighted window ("ewm_<half-life>") weights a match
+half as much as the one `halflife` matches later. Its momentum compares
+a faster average (half-life × RECENT_SHARE) against it.
+"""
+
+import math
+
+import numpy as np
+
+from core.columns import pick, round_column
+from core.errors import InvalidInput
+from core.form_analyser import FormAnalyser
+
+DEFAULT_WINDOWS = (5, 10, 20)
+
+POINTS = FormAnalyser.POINTS
+RECENT_SHARE = FormAnalyser.RECENT_SHARE
+MAX_STD = 1.5  # points split evenly between wins and losses
+
+
+def window_key(window: int) -> str:
+    return f"last_{window}"
+
+
+def ewm_key(halflife: float) -> str:
+    return f"ewm_{halflife:g}"
+
+
+def _recent_size(window: int) -> int:
+    return max(1, round(window * RECENT_SHARE))
+
+
+def _alpha(halflife: float) -> float:
+    return 1.0 - 0.5 ** (1.0 / halflife)
+
+
+def _momentum(recent: float, earlier: float) -> str:
+    if recent > earlier + 0.5:
+        return "Rising"
+    elif recent < earlier - 0.5:
+        return "Falling"
+    return "Stable"
+
+
+def _stability(mean: float, mean_sq: float) -> float:
+    return 1.0 - math.sqrt(max(mean_sq - mean * mean, 0.0)) / MAX_STD
+
+
+# ── Incremental ────────────────────────────────────────────────
+class _Window:
+    """Running sums over the last `size` matches of a shared ring buffer."""
+
+    __slots__ = ("size", "recent", "count", "pts", "pts_sq", "goals_for", "goals_against", "recent_pts")
+
+    def __init__(self, size: int):
+        self.size = size
+        self.recent = _recent_size(size)
+        self.count = 0
+        self.pts = self.pts_sq = self.goals_for = self.goals_against = self.recent_pts = 0
+
+    def snapshot(self) -> dict:
+        n = self.count
+        if n == 0:
+            return {"form_score": 0.5, "momentum": "Stable", "goals_for": 0.0,
+                    "goals_against": 0.0, "stability": 1.0, "matches": 0}
+        momentum = "Stable"
+        if n > self.recent:
+            momentum = _momentum(self.recent_pts / self.recent, (self.pts - self.recent_pts) / (n - self.recent))
+        return {
+            "form_score": round(self.pts / (POINTS["W"] * n), 3),
+            "momentum": momentum,
+            "goals_for": round(self.goals_for / n, 3),
+            "goals_against": round(self.goals_against / n, 3),
+            "stability": round(_stability(self.pts / n, self.pts_sq / n), 3),
+            "matches": n,
+        }
+
+
+class _Ewm:
+    """Exponentially weighted means; the first match seeds them."""
+
+    __slots__ = ("alpha", "fast_alpha", "count", "pts", "pts_sq", "goals_for", "goals_against", "fast_pts")
+
+    def __init__(self, halflife: float):
+        self.alpha = _alpha(halflife)
+        self.fast_alpha = _alpha(halflife * RECENT_SHARE)
+        self.count = 0
+        self.pts = self.pts_sq = self.goals_for = self.goals_against = self.fast_pts = 0.0
+
+    def append(self, pts: int, goals_for: int, goals_against: int):
+        if self.count == 0:
+            self.pts, self.pts_sq, self.fast_pts = float(pts), float(pts * pts), float(pts)
+            self.goals_for, self.goals_against = float(goals_for), float(goals_against)
+        else:
+            a, b = self.alpha, 1.0 - self.alpha
+            self.pts = a * pts + b * self.pts
+            self.pts_sq = a * (pts * pts) + b * self.pts_sq
+            self.goals_for = a * goals_for + b * self.goals_for
+            self.goals_against = a * goals_against + b * self.goals_against
+            self.fast_pts = self.fast_alpha * pts + (1.0 - self.fast_alpha) * self.fast_pts
+        self.count += 1
+
+    def snapshot(self) -> dict:
+        if self.count == 0:
+            return {"form_score": 0.5, "momentum": "Stable", "goals_for": 0.0,
+                    "goals_against": 0.0, "stability": 1.0, "matches": 0}
+        return {
+            "form_score": round(self.pts / POINTS["W"], 3),
+            "momentum": _momentum(self.fast_pts, self.pts) if self.count >= 3 else "Stable",
+            "goals_for": round(self.goals_for, 3),
+            "goals_against": round(self.goals_against, 3),
+            "stability": round(_stability(self.pts, self.pts_sq), 3),
+            "matches": self.count,
+        }
+
+
+class RollingForm:
+    """
+    One club's form, updated as results arrive in date order.
+
+        form = RollingForm(windows=(5, 10, 20), halflife=8)
+        form.append("W", 2, 0)
+        form.snapshot()["last_10"]["form_score"]
+    """
+
+    def __init__(self, windows: tuple = DEFAULT_WINDOWS, halflife: float = None):
+        windows = sorted(set(windows))
+        if not windows or windows[0] < 1:
+            raise InvalidInput("windows must be positive match counts.")
+        if halflife is not None and halflife <= 0:
+            raise InvalidInput("halflife must be positive.")
+
+        self.windows = [_Window(size) for size in windows]
+        self.ewm = _Ewm(halflife) if halflife else None
+        self.halflife = halflife
+        # Ring buffer of (pts, goals_for, goals_against), long enough for the widest window
+        self._ring = [None] * windows[-1]
+        self._next = 0
+        self._seen = 0
+
+    def append(self, result: str, goals_for: int, goals_against: int):
+        pts = POINTS.get(result, 1)
+        ring, size = self._ring, len(self._ring)
+
+        for w in self.windows:
+            if self._seen >= w.size:
+                old_pts, old_for, old_against = ring[(self._next - w.size) % size]
+                w.pts -= old_pts
+                w.pts_sq -= old_pts * old_pts
+                w.goals_for -= old_for
+                w.goals_against -= old_against
+            else:
+                w.count += 1
+            if self._seen >= w.recent:
+                w.recent_pts -= ring[(self._next - w.recent) % size][0]
+            w.pts += pts
+            w.pts_sq += pts * pts
+            w.goals_for += goals_for
+            w.goals_against += goals_against
+            w.recent_pts += pts
+
+        if self.ewm is not None:
+            self.ewm.append(pts, goals_for, goals_against)
+
+        ring[self._next] = (pts, goals_for, goals_against)
+        self._next = (self._next + 1) % size
+        self._seen += 1
+
+    def extend(self, results: list, goals_for: list, goals_against: list):
+        for result, scored, conceded in zip(results, goals_for, goals_against):
+            self.append(result, scored, conceded)
+
+    @property
+    def matches(self) -> int:
+        return self._seen
+
+    def snapshot(self) -> dict:
+        """{"last_5": {...}, "last_10": {...}, "ewm_8": {...}}"""
+        out = {window_key(w.size): w.snapshot() for w in self.windows}
+        if self.ewm is not None:
+            out[ewm_key(self.halflife)] = self.ewm.snapshot()
+        return out
+
+
+# ── Backfill ───────────────────────────────────────────────────
+def points_column(results) -> np.ndarray:
+    """W/D/L labels to a float points column; unknown labels score 1."""
+    lookup = np.full(128, 1, dtype=np.float64)
+    for label, value in POINTS.items():
+        lookup[ord(label)] = value
+    return lookup[np.frombuffer("".join(results).encode("ascii"), dtype=np.uint8)]
+
+
+def backfill(results, goals_for, goals_against, groups=None,
+             windows: tuple = DEFAULT_WINDOWS, halflife: float = None) -> dict:
+    """
+    RollingForm.snapshot() after every match of a history, as columns.
+
+    results, goals_for and goals_against line up one entry per match,
+    in date order. groups (e.g. club ids) splits the history: entries
+    of one group must be contiguous, and each group starts from an
+    empty window. Returns {window key: {field: column}}, momentum as
+    a list and the rest as arrays.
+    """
+    pts = points_column(results)
+    goals_for = np.asarray(goals_for, dtype=np.float64)
+    goals_against = np.asarray(goals_against, dtype=np.float64)
+    n = len(pts)
+    if not (len(goals_for) == len(goals_against) == n):
+        raise ValueError("results, goals_for and goals_against must be the same length.")
+
+    index = np.arange(n)
+    if groups is None:
+        group_start = np.zeros(n, dtype=np.int64)
+    else:
+        groups = np.asarray(groups)
+        new_group = np.ones(n, dtype=bool)
+        new_group[1:] = groups[1:] != groups[:-1]
+        starts = np.flatnonzero(new_group)
+        if len(np.unique(groups[starts])) != len(starts):
+            raise ValueError("Each group's matches must be contiguous.")
+        group_start = starts[np.cumsum(new_group) - 1]
+
+    def prefix(values):
+        cs = np.zeros(n + 1)
+        np.cumsum(values, out=cs[1:])
+        return cs
+
+    cs_pts, cs_sq = prefix(pts), prefix(pts * pts)
+    cs_for, cs_against = prefix(goals_for), prefix(goals_against)
+    stop = index + 1
+
+    out = {}
+    for size in sorted(set(windows)):
+        if size < 1:
+            raise InvalidInput("windows must be positive match counts.")
+        start = np.maximum(stop - size, group_start)
+        count = stop - start
+        total = cs_pts[stop] - cs_pts[start]
+
+        recent = _recent_size(size)
+        recent_pts = cs_pts[stop] - cs_pts[np.maximum(stop - recent, group_start)]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            earlier = (total - recent_pts) / (count - recent)
+        momentum = _momentum_column(recent_pts / recent, earlier, count > recent)
+
+        out[window_key(size)] = _columns(
+            total / (POINTS["W"] * count),
+            momentum,
+            (cs_for[stop] - cs_for[start]) / count,
+            (cs_against[stop] - cs_against[start]) / count,
+            total / count,
+            (cs_sq[stop] - cs_sq[start]) / count,
+            count,
+        )
+
+    if halflife:
+        if halflife <= 0:
+            raise InvalidInput("halflife must be positive.")
+        alpha, fast = _alpha(halflife), _alpha(halflife * RECENT_SHARE)
+        ewm_pts = _ewm(pts, alpha, group_start)
+        count = index - group_start + 1
+        out[ewm_key(halflife)] = _columns(
+            ewm_pts / POINTS["W"],
+            _momentum_column(_ewm(pts, fast, group_start), ewm_pts, count >= 3),
+            _ewm(goals_for, alpha, group_start),
+            _ewm(goals_against, alpha, group_start),
+            ewm_pts,
+            _ewm(pts * pts, alpha, group_start),
+            count,
+        )
+    return out
+
+
+def _columns(form, momentum, goals_for, goals_against, mean, mean_sq, count) -> dict:
+    std = np.sqrt(np.maximum(mean_sq - mean * mean, 0.0))
+    return {
+        "form_score": round_column(form),
+        "momentum": momentum,
+        "goals_for": round_column(goals_for),
+        "goals_against": round_column(goals_against),
+        "stability": round_column(1.0 - std / MAX_STD),
+        "matches": count,
+    }
+
+
+def _momentum_column(recent: np.ndarray, earlier: np.ndarray, long_enough: np.ndarray) -> list:
+    return pick(
+        ["Rising", "Falling"],
+        [long_enough & (recent > earlier + 0.5), long_enough & (recent < earlier - 0.5)],
+        "Stable",
+    )
+
+
+def _lfilter():
+    """
+    scipy.signal.lfilter, or None. Imported on first use rather than
+    with this module: scipy.signal alone takes ~0.7 s to load.
+    """
+    try:
+        from scipy.signal import lfilter
+    except ImportError:  # optional — backfill falls back to a Python loop
+        return None
+    return lfilter
+
+
+def _ewm(values: np.ndarray, alpha: float, group_start: np.ndarray) -> np.ndarray:
+    """y[i] = alpha·x[i] + (1 - alpha)·y[i-1], restarting at each group's first match."""
+    out = np.empty(len(values))
+    bounds = np.append(np.unique(group_start), len(values))
+    lfilter = _lfilter()
+    for lo, hi in zip(bounds[:-1].tolist(), bounds[1:].tolist()):
+        x = values[lo:hi]
+        if lfilter is not None:
+            # Initial state chosen so the first output is x[0] itself
+            out[lo:hi], _ = lfilter([alpha], [1.0, alpha - 1.0], x, zi=[(1.0 - alpha) * x[0]])
+        else:
+            y = x[0]
+            for i, v in enumerate(x.tolist(), lo):
+                y = alpha * v + (1.0 - alpha) * y
+                out[i] = y
+    return out
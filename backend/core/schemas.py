@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from datetime import datetime
+from typing import Annotated, Dict, List, Literal, Optional
 from enum import Enum
 
 
@@ -59,8 +60,8 @@ class Player(BaseModel):
     position: BroadPosition
     specific_position: SpecificPosition
     secondary_position: Optional[SpecificPosition] = None
-    available: bool
-    fitness_score: Optional[float] = 1.0
+    available: bool = True
+    fitness_score: float = Field(default=1.0, ge=0.0, le=1.0)
 
 
 class Tier1Input(BaseModel):
@@ -93,6 +94,82 @@ class MatchAnalysisRequest(BaseModel):
     tier2_data: Optional[Tier2Input] = None
 
 
+class RoundTeam(BaseModel):
+    """One team in a fixture round. With all five averages it is analysed at tier 2."""
+    team_name: str
+    last_5_results: List[MatchResult] = Field(..., min_length=1, max_length=5)
+    goals_scored_last_5: int = Field(..., ge=0)
+    goals_conceded_last_5: int = Field(..., ge=0)
+    players: Optional[List[Player]] = []
+    avg_possession: Optional[float] = Field(default=None, ge=0, le=100)
+    avg_passing_accuracy: Optional[float] = Field(default=None, ge=0, le=100)
+    avg_shots_per_match: Optional[float] = Field(default=None, ge=0)
+    avg_shots_on_target: Optional[float] = Field(default=None, ge=0)
+    avg_defensive_errors: Optional[float] = Field(default=None, ge=0)
+
+
+class RoundFixture(BaseModel):
+    home: str
+    away: str
+
+
+class FixtureRoundRequest(BaseModel):
+    teams: List[RoundTeam] = Field(..., min_length=2)
+    fixtures: List[RoundFixture] = Field(..., min_length=1)
+
+
+class RenderRequest(BaseModel):
+    formation: str = Field(..., pattern=r"^\d(-\d){1,4}$")
+    starting_xi: List[dict] = Field(default=[], max_length=11)
+    team_name: str = ""
+
+
+class SweepAxis(BaseModel):
+    start: float = Field(default=0.0, ge=0, le=1)
+    stop: float = Field(default=1.0, ge=0, le=1)
+    steps: int = Field(default=50, ge=1, le=500)
+
+
+class ClubIn(BaseModel):
+    name: str = Field(..., min_length=1, max_length=120)
+
+
+class TeamMatchStatsIn(BaseModel):
+    possession: float = Field(..., ge=0, le=100)
+    passing_accuracy: float = Field(..., ge=0, le=100)
+    shots: float = Field(..., ge=0)
+    shots_on_target: float = Field(..., ge=0)
+    defensive_errors: float = Field(..., ge=0)
+
+
+class ResultIn(BaseModel):
+    home_goals: int = Field(..., ge=0)
+    away_goals: int = Field(..., ge=0)
+    home_stats: Optional[TeamMatchStatsIn] = None
+    away_stats: Optional[TeamMatchStatsIn] = None
+
+
+class FixtureIn(BaseModel):
+    home_club_id: int
+    away_club_id: int
+    kickoff: datetime
+    result: Optional[ResultIn] = None
+
+
+# The counting stats the Player Impact Score reads
+# (engine/squad_selector.py weights a subset of these per position group)
+PIS_STAT_KEYS = [
+    "assists", "blocks", "chances_created", "clean_sheets", "crosses", "dribbles",
+    "goals", "interceptions", "key_passes", "saves", "tackles",
+]
+PisStat = Literal[tuple(PIS_STAT_KEYS)]
+
+
+class PlayerStatsIn(BaseModel):
+    fixture_id: int
+    stats: Dict[PisStat, Annotated[float, Field(ge=0)]]
+
+
 class TacticalReport(BaseModel):
     team_name: str
     opponent_name: str
@@ -106,6 +183,7 @@ class TacticalReport(BaseModel):
     win_probability: Optional[float] = None
     draw_probability: Optional[float] = None
     loss_probability: Optional[float] = None
+    model_version: Optional[str] = None
     offensive_strength_index: float
     defensive_vulnerability_index: float
     fatigue_risk_score: float
@@ -0,0 +1,68 @@
+"""
+stage_graph.py — Which pipeline stages a set of output keys needs.
+
+Every stage declares the context keys it reads and writes. StageGraph
+links each read to the stage that writes that key; keys no stage
+writes are inputs, already there after validation. plan(keys) walks
+back from the requested keys to the stages behind them and groups
+those into levels: a stage depends only on stages in earlier levels,
+so the stages within one level can run at the same time.
+"""
+
+
+class StageGraph:
+
+    def __init__(self, stages):
+        """
+        stages: (name, reads, writes) triples in pipeline order. A stage
+        may only depend on stages listed before it, which keeps the
+        graph acyclic and the plans in the order the full run uses.
+        """
+        self.order = tuple(name for name, _, _ in stages)
+        self.writer = {}
+        for name, _, writes in stages:
+            for key in writes:
+                if key in self.writer:
+                    raise ValueError(f"{key!r} is written by both {self.writer[key]!r} and {name!r}.")
+                self.writer[key] = name
+
+        position = {name: i for i, name in enumerate(self.order)}
+        self.depends = {}
+        self.level = {}
+        for name, reads, _ in stages:
+            needs = frozenset(self.writer[key] for key in reads if key in self.writer) - {name}
+            late = [dep for dep in needs if position[dep] > position[name]]
+            if late:
+                raise ValueError(f"{name!r} reads keys written later, by {sorted(late)}.")
+            self.depends[name] = needs
+            self.level[name] = max((self.level[dep] + 1 for dep in needs), default=0)
+
+        self._plans = {}
+
+    def stages_for(self, keys) -> set:
+        """Every stage needed to produce keys, dependencies included."""
+        needed = set()
+        pending = [self.writer[key] for key in keys if key in self.writer]
+        while pending:
+            name = pending.pop()
+            if name not in needed:
+                needed.add(name)
+                pending.extend(self.depends[name])
+        return needed
+
+    def plan(self, keys) -> tuple:
+        """
+        The stages keys need as a tuple of levels, each a tuple of stage
+        names in pipeline order. Plans are cached per key set.
+        """
+        keys = frozenset(keys)
+        plan = self._plans.get(keys)
+        if plan is None:
+            needed = self.stages_for(keys)
+            levels = {}
+            for name in self.order:
+                if name in needed:
+                    levels.setdefault(self.level[name], []).append(name)
+            plan = tuple(tuple(levels[i]) for i in sorted(levels))
+            self._plans[keys] = plan
+        return plan
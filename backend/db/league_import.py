@@ -0,0 +1,237 @@
+"""
+league_import.py — Streams league-wide match stat exports into tier 2
+aggregates.
+
+Reads CSV or Parquet in chunks and keeps only each team's most recent
+matches. Memory therefore depends on chunk_size and the number of
+teams, not on the file size. The result builds tier 2 request payloads
+that go straight into InputValidator.validate_payload():
+
+    league = LeagueImporter(window=5).import_file("epl_2024.parquet")
+    validated = validator.validate_payload(league.payload("Arsenal", "Chelsea"))
+    print(f"{league.rows_per_sec:,.0f} rows/s")
+
+Two layouts are read:
+    team   one row per team per match: date, team, opponent,
+           goals_for, goals_against and the STAT_COLUMNS
+    match  one row per match: date, home_team, away_team, home_goals,
+           away_goals and home_/away_ prefixed STAT_COLUMNS
+`columns` renames source columns to these names first.
+
+window=N averages each stat over a team's last N matches, the same
+window TeamStore uses. window=None averages over every match in the
+file, from running totals. Either way, last_5_results and the goal
+totals cover the last five matches. Rows may arrive in any order;
+"last" is by date.
+"""
+
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from core.errors import InvalidInput, NotFound
+from core.schemas import DataTier
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # optional — only needed for Parquet files
+    pq = None
+
+# Source column -> tier 2 field
+STAT_COLUMNS = {
+    "possession": "avg_possession",
+    "passing_accuracy": "avg_passing_accuracy",
+    "shots": "avg_shots_per_match",
+    "shots_on_target": "avg_shots_on_target",
+    "defensive_errors": "avg_defensive_errors",
+}
+
+# Tier 2 field -> opponent field (Tier2Input has no opp shots on target)
+OPPONENT_FIELDS = {
+    "avg_possession": "opp_avg_possession",
+    "avg_passing_accuracy": "opp_avg_passing_accuracy",
+    "avg_shots_per_match": "opp_avg_shots_per_match",
+    "avg_defensive_errors": "opp_avg_defensive_errors",
+}
+
+TEAM_COLUMNS = ("date", "team", "opponent", "goals_for", "goals_against", *STAT_COLUMNS)
+MATCH_COLUMNS = (
+    "date", "home_team", "away_team", "home_goals", "away_goals",
+    *(f"{side}_{stat}" for side in ("home", "away") for stat in STAT_COLUMNS),
+)
+
+RESULT_MATCHES = 5
+
+
+class LeagueImporter:
+
+    LAYOUTS = ("team", "match")
+
+    def __init__(self, window: int = 5, chunk_size: int = 100_000, layout: str = "team",
+                 columns: dict = None, date_format: str = None):
+        if window is not None and window < 1:
+            raise ValueError("window must be at least 1, or None for the whole file.")
+        if layout not in self.LAYOUTS:
+            raise ValueError(f"Unknown layout '{layout}'. Use one of {self.LAYOUTS}.")
+        self.window = window
+        self.chunk_size = chunk_size
+        self.layout = layout
+        self.columns = columns or {}
+        self.date_format = date_format
+
+    # ── Reading ────────────────────────────────────────────────
+    def read(self, path: str):
+        """Yields DataFrame chunks of at most chunk_size rows, source columns renamed."""
+        wanted = TEAM_COLUMNS if self.layout == "team" else MATCH_COLUMNS
+        renamed_from = {dst: src for src, dst in self.columns.items()}
+        usecols = [renamed_from.get(name, name) for name in wanted]
+
+        if str(path).endswith((".parquet", ".pq")):
+            if pq is None:
+                raise ImportError("Reading Parquet needs pyarrow (pip install pyarrow).")
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=self.chunk_size, columns=usecols):
+                yield batch.to_pandas().rename(columns=self.columns)
+        else:
+            yield from (
+                chunk.rename(columns=self.columns)
+                for chunk in pd.read_csv(path, usecols=usecols, chunksize=self.chunk_size)
+            )
+
+    def import_file(self, path: str) -> "LeagueAggregates":
+        return self.import_chunks(self.read(path), source=os.fspath(path))
+
+    def import_chunks(self, chunks, source: str = None) -> "LeagueAggregates":
+        """Folds DataFrame chunks (already renamed) into LeagueAggregates."""
+        start = time.perf_counter()
+        keep = max(self.window or 0, RESULT_MATCHES)
+        recent = None
+        totals = counts = None
+        rows = 0
+
+        for chunk in chunks:
+            rows += len(chunk)
+            frame = self._team_rows(chunk)
+
+            if self.window is None:
+                stats = frame.groupby("team")[list(STAT_COLUMNS)]
+                chunk_totals, chunk_counts = stats.sum(), stats.count()
+                totals = chunk_totals if totals is None else totals.add(chunk_totals, fill_value=0)
+                counts = chunk_counts if counts is None else counts.add(chunk_counts, fill_value=0)
+
+            # Each team's newest `keep` matches so far; ties keep file order
+            if recent is not None:
+                frame = pd.concat([recent, frame], ignore_index=True)
+            frame = frame.sort_values(["team", "date"], kind="stable")
+            recent = frame.groupby("team", sort=False).tail(keep)
+
+        if recent is None:
+            raise ValueError(f"No rows in {source or 'input'}.")
+
+        if self.window is None:
+            averages = totals / counts.replace(0, np.nan)
+        else:
+            averages = recent.groupby("team").tail(self.window).groupby("team")[list(STAT_COLUMNS)].mean()
+
+        return LeagueAggregates(
+            averages.rename(columns=STAT_COLUMNS).round(3),
+            recent.groupby("team").tail(RESULT_MATCHES),
+            rows=rows,
+            seconds=time.perf_counter() - start,
+            window=self.window,
+            source=source,
+        )
+
+    def _team_rows(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """One row per team per match, with a parsed date."""
+        if self.layout == "match":
+            sides = []
+            for side, other in (("home", "away"), ("away", "home")):
+                frame = pd.DataFrame({
+                    "date": chunk["date"],
+                    "team": chunk[f"{side}_team"],
+                    "opponent": chunk[f"{other}_team"],
+                    "goals_for": chunk[f"{side}_goals"],
+                    "goals_against": chunk[f"{other}_goals"],
+                })
+                for stat in STAT_COLUMNS:
+                    frame[stat] = chunk[f"{side}_{stat}"]
+                sides.append(frame)
+            chunk = pd.concat(sides, ignore_index=True)
+        else:
+            missing = set(TEAM_COLUMNS) - set(chunk.columns)
+            if missing:
+                raise ValueError(f"Missing columns: {sorted(missing)}.")
+            chunk = chunk[list(TEAM_COLUMNS)]
+
+        date = chunk["date"]
+        if not pd.api.types.is_datetime64_any_dtype(date):
+            chunk = chunk.assign(date=pd.to_datetime(date, format=self.date_format))
+        return chunk
+
+
+# ── Aggregates ─────────────────────────────────────────────────
+class LeagueAggregates:
+    """Per-team tier 2 averages and last five results from one import."""
+
+    def __init__(self, averages: pd.DataFrame, last_matches: pd.DataFrame, rows: int,
+                 seconds: float, window: int = None, source: str = None):
+        self.averages = averages
+        self.rows = rows
+        self.seconds = seconds
+        self.window = window
+        self.source = source
+
+        self._form = {}
+        for team, matches in last_matches.groupby("team", sort=False):
+            scored, conceded = matches["goals_for"].tolist(), matches["goals_against"].tolist()
+            self._form[team] = {
+                "results": ["W" if s > c else "L" if s < c else "D" for s, c in zip(scored, conceded)],
+                "scored": int(sum(scored)),
+                "conceded": int(sum(conceded)),
+            }
+
+    @property
+    def teams(self) -> list:
+        return sorted(self._form)
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows / self.seconds if self.seconds else float("inf")
+
+    def team(self, name: str) -> dict:
+        """A team's tier 2 averages (None where it has no figures) and recent form."""
+        if name not in self._form:
+            raise NotFound(f"No matches for {name} in {self.source or 'the import'}.")
+        averages = {
+            field: None if pd.isna(value) else float(value)
+            for field, value in self.averages.loc[name].items()
+        }
+        return {**averages, **self._form[name]}
+
+    def payload(self, team: str, opponent: str, players: list = None) -> dict:
+        """
+        A tier 2 MatchAnalysisRequest body for team vs opponent, ready
+        for InputValidator.validate_payload(). Raises NotFound for an
+        unknown team and InvalidInput when the team lacks a tier 2 stat.
+        """
+        own, opp = self.team(team), self.team(opponent)
+        missing = [field for field in STAT_COLUMNS.values() if own[field] is None]
+        if missing:
+            raise InvalidInput(f"{team} has no figures for {', '.join(missing)}.")
+
+        data = {
+            "team_name": team,
+            "opponent_name": opponent,
+            "last_5_results": own["results"],
+            "goals_scored_last_5": own["scored"],
+            "goals_conceded_last_5": own["conceded"],
+            "players": players or [],
+            "opponent_last_5_results": opp["results"],
+            "opponent_goals_scored": opp["scored"],
+            "opponent_goals_conceded": opp["conceded"],
+            **{field: own[field] for field in STAT_COLUMNS.values()},
+            **{opp_field: opp[field] for field, opp_field in OPPONENT_FIELDS.items()},
+        }
+        return {"tier": DataTier.TIER_2.value, "tier2_data": data}
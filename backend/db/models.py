@@ -0,0 +1,90 @@
+"""
+models.py — SQLAlchemy tables for clubs, players, fixtures and results.
+
+A fixture row is one match between two clubs. It has goals once it is
+played, and optionally a TeamMatchStats row per side with the tier 2
+figures (possession, passing, shots, errors). PlayerMatchStats holds
+one player's counting stats for one fixture. The keys are the
+SquadSelector PIS stat names, kept as JSON. PlayerSeasonStats holds
+the running totals, so reads never have to sum match rows.
+
+The indexes follow the lookups db/store.py makes: a club's fixtures by
+date, from either side, and a club's players.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import JSON, Boolean, DateTime, Float, ForeignKey, Index, Integer, String, UniqueConstraint
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Club(Base):
+    __tablename__ = "clubs"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    name: Mapped[str] = mapped_column(String(120), unique=True)
+
+
+class PlayerRow(Base):
+    __tablename__ = "players"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    club_id: Mapped[int] = mapped_column(ForeignKey("clubs.id", ondelete="CASCADE"), index=True)
+    name: Mapped[str] = mapped_column(String(120))
+    position: Mapped[str] = mapped_column(String(3))
+    specific_position: Mapped[str] = mapped_column(String(3))
+    secondary_position: Mapped[str | None] = mapped_column(String(3), nullable=True)
+    available: Mapped[bool] = mapped_column(Boolean, default=True)
+    fitness_score: Mapped[float] = mapped_column(Float, default=1.0)
+
+    __table_args__ = (UniqueConstraint("club_id", "name"),)
+
+
+class Fixture(Base):
+    __tablename__ = "fixtures"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    home_club_id: Mapped[int] = mapped_column(ForeignKey("clubs.id", ondelete="CASCADE"))
+    away_club_id: Mapped[int] = mapped_column(ForeignKey("clubs.id", ondelete="CASCADE"))
+    kickoff: Mapped[datetime] = mapped_column(DateTime, index=True)
+    # None until the match is played
+    home_goals: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    away_goals: Mapped[int | None] = mapped_column(Integer, nullable=True)
+
+    __table_args__ = (
+        Index("ix_fixtures_home_kickoff", "home_club_id", "kickoff"),
+        Index("ix_fixtures_away_kickoff", "away_club_id", "kickoff"),
+    )
+
+
+class TeamMatchStats(Base):
+    __tablename__ = "team_match_stats"
+
+    fixture_id: Mapped[int] = mapped_column(ForeignKey("fixtures.id", ondelete="CASCADE"), primary_key=True)
+    club_id: Mapped[int] = mapped_column(ForeignKey("clubs.id", ondelete="CASCADE"), primary_key=True)
+    possession: Mapped[float] = mapped_column(Float)
+    passing_accuracy: Mapped[float] = mapped_column(Float)
+    shots: Mapped[float] = mapped_column(Float)
+    shots_on_target: Mapped[float] = mapped_column(Float)
+    defensive_errors: Mapped[float] = mapped_column(Float)
+
+
+class PlayerMatchStats(Base):
+    __tablename__ = "player_match_stats"
+
+    player_id: Mapped[int] = mapped_column(ForeignKey("players.id", ondelete="CASCADE"), primary_key=True)
+    fixture_id: Mapped[int] = mapped_column(ForeignKey("fixtures.id", ondelete="CASCADE"), primary_key=True)
+    stats: Mapped[dict] = mapped_column(JSON)
+
+
+class PlayerSeasonStats(Base):
+    """Running totals of PlayerMatchStats, kept up to date on write."""
+    __tablename__ = "player_season_stats"
+
+    player_id: Mapped[int] = mapped_column(ForeignKey("players.id", ondelete="CASCADE"), primary_key=True)
+    matches_played: Mapped[int] = mapped_column(Integer, default=0)
+    stats: Mapped[dict] = mapped_column(JSON)
@@ -0,0 +1,107 @@
+"""
+decision_surface.py — What-if sweeps over the computed indices.
+
+Holds one analysed match fixed, varies one or more indices over a
+grid and evaluates the formation and press rules for every grid cell
+at once. The rules are the batch ones the pipeline uses
+(FormationSelector.select_codes, PressEngine.recommend_codes), so a
+cell always gets the decision a real run with those indices would get.
+The columns filled, and the indices that can be swept, are whatever the
+loaded rule table reads (see sweepable()).
+
+A 100 × 100 grid takes a few milliseconds, which is cheap enough to
+redraw a heatmap as the user drags a slider.
+"""
+
+import numpy as np
+
+from core.errors import InvalidInput
+from engine.formation_selector import FormationSelector
+from engine.press_engine import PressEngine
+from engine.rule_engine import NUMERIC_INPUTS
+
+
+class DecisionSurface:
+
+    DECISIONS = (
+        "recommended_formation", "defensive_line", "tactical_focus",
+        "press_intensity", "match_risk_level",
+    )
+
+    MAX_AXES = 3
+    MAX_CELLS = 250_000
+
+    def __init__(self, formation: FormationSelector = None, press: PressEngine = None):
+        self.formation = formation or FormationSelector()
+        self.press = press or PressEngine()
+
+    def sweepable(self) -> tuple:
+        """The numeric indices the formation and press rules read — every one of them can be swept."""
+        return tuple(sorted((self.formation.READS | self.press.READS) & NUMERIC_INPUTS))
+
+    def sweep(self, base, axes: dict) -> dict:
+        """
+        base is an analysed MatchContext (or dict) with at least the
+        MetricCalculator and FormAnalyser fields. axes maps an index
+        name to (start, stop, steps); values run from start to stop
+        inclusive, as np.linspace.
+
+        Returns:
+            {"axes":     [{"index": name, "values": [...]}, ...],
+             "fixed":    {index: value for indices not swept},
+             "surfaces": {decision: {"labels": [...], "grid": nested lists}}}
+
+        grid has one dimension per axis, in the order given, and holds
+        positions in labels.
+        """
+        reads = self.formation.READS | self.press.READS
+        values = self._axis_values(axes, self.sweepable())
+        shape = tuple(len(v) for v in values.values())
+        size = int(np.prod(shape))
+
+        grids = np.meshgrid(*values.values(), indexing="ij")
+        columns = {name: grid.ravel() for name, grid in zip(values, grids)}
+        fixed = {}
+        for name in sorted(reads - columns.keys()):
+            if name in NUMERIC_INPUTS:
+                fixed[name] = float(base[name])
+                columns[name] = np.full(size, fixed[name])
+            else:
+                columns[name] = [base[name]] * size
+
+        coded = self.formation.select_codes(columns)
+        coded.update(self.press.recommend_codes(columns))
+
+        return {
+            "axes": [{"index": name, "values": v.tolist()} for name, v in values.items()],
+            "fixed": fixed,
+            "surfaces": {key: self._surface(*coded[key], shape) for key in self.DECISIONS},
+        }
+
+    def _axis_values(self, axes: dict, sweepable: list) -> dict:
+        if not axes:
+            raise InvalidInput("At least one axis is required.")
+        if len(axes) > self.MAX_AXES:
+            raise InvalidInput(f"At most {self.MAX_AXES} axes can be swept at once.")
+
+        values, cells = {}, 1
+        for name, (start, stop, steps) in axes.items():
+            if name not in sweepable:
+                raise InvalidInput(f"Cannot sweep {name!r}; the rules read {', '.join(sweepable)}.")
+            if not (0.0 <= start <= 1.0 and 0.0 <= stop <= 1.0):
+                raise InvalidInput(f"{name} range must lie within 0 and 1.")
+            if steps < 1:
+                raise InvalidInput(f"{name} needs at least one step.")
+            values[name] = np.linspace(start, stop, int(steps))
+            cells *= int(steps)
+
+        if cells > self.MAX_CELLS:
+            raise InvalidInput(f"Grid has {cells} cells; the limit is {self.MAX_CELLS}.")
+        return values
+
+    @staticmethod
+    def _surface(codes: np.ndarray, table: list, shape: tuple) -> dict:
+        """Codes into a de-duplicated label list, reshaped to the grid."""
+        labels = list(dict.fromkeys(table))
+        remap = np.array([labels.index(label) for label in table])
+        return {"labels": labels, "grid": remap[codes].reshape(shape).tolist()}
@@ -1,73 +1,47 @@
-class MismatchDetector:
+from core.context import MatchContext, context_stage
+from engine.rule_engine import RuleBook, default_rules
 
-    def detect(self, data: dict) -> dict:
-        advantages = self._find_advantages(data)
-        threats = self._find_threats(data)
 
+class MismatchDetector:
+    """
+    Advantages and threats — every rule that holds adds its message.
+    The rules and messages live in the rule table (engine/tactical_rules.json).
+    """
+
+    WRITES = ("advantages", "threats")
+
+    def __init__(self, rules: RuleBook = None):
+        self.rules = rules or default_rules()
+
+    @property
+    def READS(self) -> frozenset:
+        """Context fields the rules read — whatever the loaded table references."""
+        compiled = self.rules.compiled
+        return frozenset().union(*(compiled.reads[key] for key in self.WRITES))
+
+    @context_stage
+    def detect(self, data: MatchContext) -> MatchContext:
+        rules = self.rules.compiled.scalar
+        data.advantages = rules["advantages"](data)
+        data.threats = rules["threats"](data)
+        return data
+
+    def detect_batch(self, c: dict) -> dict:
+        """
+        Same rules as detect() over NumPy columns. Each rule is
+        one boolean mask; rows then collect the messages that fired.
+        """
+        compiled = self.rules.compiled
         return {
-            **data,
-            "advantages": advantages,
-            "threats": threats,
+            key: self._collect(compiled.batch[key](c), compiled.decisions[key]["default"])
+            for key in self.WRITES
         }
 
-    # ── Advantages ─────────────────────────────────────────────
-    def _find_advantages(self, d: dict) -> list:
-        advantages = []
-
-        if d["offensive_strength_index"] > d["opponent_strength_index"] + 0.2:
-            advantages.append(
-                "Significant attacking superiority — exploit spaces aggressively."
-            )
-
-        if d["defensive_vulnerability_index"] < 0.3:
-            advantages.append(
-                "Defensively solid — opponent will struggle to create chances."
-            )
-
-        if d["form_score"] > d["opponent_form_score"] + 0.25:
-            advantages.append(
-                "Strong form advantage — momentum is on your side."
-            )
-
-        if d["transition_intensity_score"] > 0.55 and d["opponent_strength_index"] < 0.5:
-            advantages.append(
-                "Transition game is strong — counter quickly on turnovers."
-            )
-
-        if not advantages:
-            advantages.append(
-                "No clear statistical advantage — focus on set pieces and organisation."
-            )
-
-        return advantages
-
-    # ── Threats ────────────────────────────────────────────────
-    def _find_threats(self, d: dict) -> list:
-        threats = []
-
-        if d["opponent_strength_index"] > d["offensive_strength_index"] + 0.2:
-            threats.append(
-                "Opponent has stronger attack — prioritise defensive shape."
-            )
-
-        if d["defensive_vulnerability_index"] > 0.6:
-            threats.append(
-                "High defensive vulnerability — reduce individual errors."
-            )
-
-        if d["fatigue_risk_score"] > 0.55:
-            threats.append(
-                "Fatigue risk elevated — consider early substitutions."
-            )
-
-        if d["opponent_form_score"] > 0.65:
-            threats.append(
-                "Opponent in strong form — do not underestimate them."
-            )
-
-        if not threats:
-            threats.append(
-                "No major threats identified — maintain structure and focus."
-            )
-
-        return threats                      
\ No newline at end of file
+    def _collect(self, rules: list, fallback: str) -> list:
+        masks = [mask.tolist() for mask, _ in rules]
+        messages = [msg for _, msg in rules]
+        rows = []
+        for fired in zip(*masks):
+            found = [msg for hit, msg in zip(fired, messages) if hit]
+            rows.append(found or [fallback])
+        return rows
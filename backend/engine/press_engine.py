@@ -1,51 +1,38 @@
-class PressEngine:
+from core.columns import decode
+from core.context import MatchContext, context_stage
+from engine.rule_engine import RuleBook, default_rules
+
 
-    def recommend(self, data: dict) -> dict:
-        intensity = self._press_intensity(data)
-        risk = self._match_risk(data)
-
-        return {
-            **data,
-            "press_intensity": intensity,
-            "match_risk_level": risk,
-        }
-
-    # ── Press Intensity ────────────────────────────────────────
-    def _press_intensity(self, d: dict) -> str:
-        fatigue = d["fatigue_risk_score"]
-        opp = d["opponent_strength_index"]
-        form = d["form_score"]
-
-        # Never press hard if squad is tired
-        if fatigue > 0.65:
-            return "Low"
-
-        # High press only if fit + good form + manageable opponent
-        if fatigue < 0.35 and form > 0.55 and opp < 0.6:
-            return "High"
-
-        # Strong opponent — stay compact
-        if opp > 0.65:
-            return "Low"
-
-        return "Medium"
-
-    # ── Match Risk ─────────────────────────────────────────────
-    def _match_risk(self, d: dict) -> str:
-        opp = d["opponent_strength_index"]
-        dvi = d["defensive_vulnerability_index"]
-        fatigue = d["fatigue_risk_score"]
-        form = d["form_score"]
-
-        score = (
-            opp     * 0.4 +
-            dvi     * 0.3 +
-            fatigue * 0.2 +
-            (1 - form) * 0.1
-        )
-
-        if score > 0.6:
-            return "High"
-        elif score > 0.35:
-            return "Medium"
-        return "Low"
\ No newline at end of file
+class PressEngine:
+    """
+    Press intensity and match risk. The thresholds and the match risk
+    weighting live in the rule table (engine/tactical_rules.json).
+    """
+
+    DECISIONS = ("press_intensity", "match_risk_level")
+    WRITES = DECISIONS
+
+    def __init__(self, rules: RuleBook = None):
+        self.rules = rules or default_rules()
+
+    @property
+    def READS(self) -> frozenset:
+        """Context fields the rules read — whatever the loaded table references."""
+        compiled = self.rules.compiled
+        return frozenset().union(*(compiled.reads[key] for key in self.WRITES))
+
+    @context_stage
+    def recommend(self, data: MatchContext) -> MatchContext:
+        rules = self.rules.compiled.scalar
+        data.press_intensity = rules["press_intensity"](data)
+        data.match_risk_level = rules["match_risk_level"](data)
+        return data
+
+    def recommend_batch(self, c: dict) -> dict:
+        """Same rules as recommend(), evaluated over NumPy columns."""
+        return {key: decode(*coded) for key, coded in self.recommend_codes(c).items()}
+
+    def recommend_codes(self, c: dict) -> dict:
+        """recommend_batch() before decoding: {field: (codes, table)}."""
+        rules = self.rules.compiled.batch
+        return {key: rules[key](c) for key in self.DECISIONS}
@@ -0,0 +1,214 @@
+"""
+robustness.py — Monte Carlo check on how stable a recommendation is.
+
+Tier 1 inputs are thin: five results and two goal totals. Sampler
+redraws them many times within plausible bounds, re-runs the metric,
+form, formation and press stages on every sample at once, and counts
+how often each decision comes out — "4-3-3 in 82% of samples".
+
+Per sample:
+    results       each of the team's and the opponent's results redrawn
+                  from the observed W/D/L mix, smoothed by PRIOR so a
+                  WWWWW run can still produce the odd draw
+    goals         goal totals (scored, conceded, opponent scored) drawn
+                  from a Poisson with the observed total as its mean
+    fitness       every player's fitness jittered by N(0, FITNESS_SD),
+                  clipped to 0-1
+
+Tier 2 averages are season-long figures and stay fixed.
+
+Samples are drawn in chunks of CHUNK_SIZE, each from its own child of
+one SeedSequence, so a given seed gives the same counts whether the
+chunks run in this process or are spread over a process pool. Pool
+workers are sent the formation and press rule tables along with the
+inputs, so they decide by the same rules as this process.
+"""
+
+from concurrent.futures import Executor
+
+import numpy as np
+
+from core.context import MatchContext
+from core.errors import InvalidInput
+from core.form_analyser import FormAnalyser
+from core.metric_calculator import MetricCalculator
+from engine.formation_selector import FormationSelector
+from engine.press_engine import PressEngine
+from engine.rule_engine import CompiledRules
+
+DECISIONS = (
+    "recommended_formation", "defensive_line", "tactical_focus",
+    "press_intensity", "match_risk_level",
+)
+
+CHUNK_SIZE = 4096
+MAX_SAMPLES = 100_000
+
+PRIOR = 0.5          # pseudo-count added to each of W / D / L
+FITNESS_SD = 0.05
+
+_OUTCOMES = ("W", "D", "L")
+_TIER2_COLUMNS = (
+    "avg_shots_per_match", "avg_shots_on_target", "avg_possession",
+    "avg_defensive_errors", "opp_avg_shots_per_match",
+)
+
+
+class RobustnessAnalyser:
+
+    def __init__(
+        self,
+        metrics: MetricCalculator = None,
+        form: FormAnalyser = None,
+        formation: FormationSelector = None,
+        press: PressEngine = None,
+    ):
+        self.metrics = metrics or MetricCalculator()
+        self.form = form or FormAnalyser()
+        self.formation = formation or FormationSelector()
+        self.press = press or PressEngine()
+
+    def analyse(self, validated: dict, samples: int, seed: int = None, pool: Executor = None) -> dict:
+        """
+        Runs samples perturbed copies of one validated input. With a
+        pool (e.g. a ProcessPoolExecutor) the chunks are mapped over it.
+
+        Returns:
+            {"samples": n, "seed": seed,
+             "decisions": {name: {"baseline": label, "stability": share of
+                                  samples agreeing with the baseline,
+                                  "distribution": {label: share}}},
+             "summary": ["4-3-3 in 82% of samples", ...]}
+        """
+        if not 1 <= samples <= MAX_SAMPLES:
+            raise InvalidInput(f"samples must be between 1 and {MAX_SAMPLES}.")
+
+        # Unperturbed decisions — what the report itself recommends
+        baseline = MatchContext.from_dict(validated)
+        for stage in (self.metrics.calculate, self.form.analyse, self.formation.select, self.press.recommend):
+            baseline = stage(baseline)
+
+        sizes = [CHUNK_SIZE] * (samples // CHUNK_SIZE)
+        if samples % CHUNK_SIZE:
+            sizes.append(samples % CHUNK_SIZE)
+        seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+        inputs = _sample_inputs(validated)
+
+        if pool is None:
+            tallies = [self.sample_chunk(inputs, size, s) for size, s in zip(sizes, seeds)]
+        else:
+            rules = tuple(
+                (stage.rules.compiled.version, stage.rules.compiled.table)
+                for stage in (self.formation, self.press)
+            )
+            tallies = list(pool.map(_sample_chunk, [inputs] * len(sizes), sizes, seeds, [rules] * len(sizes)))
+
+        counts = {key: {} for key in DECISIONS}
+        for tally in tallies:
+            for key, labels in tally.items():
+                for label, n in labels.items():
+                    counts[key][label] = counts[key].get(label, 0) + n
+
+        decisions, summary = {}, []
+        for key in DECISIONS:
+            ranked = sorted(counts[key].items(), key=lambda kv: -kv[1])
+            base = baseline[key]
+            stability = counts[key].get(base, 0) / samples
+            decisions[key] = {
+                "baseline": base,
+                "stability": round(stability, 4),
+                "distribution": {label: round(n / samples, 4) for label, n in ranked},
+            }
+            summary.append(f"{base} in {stability:.0%} of samples")
+
+        return {
+            "samples": samples,
+            "seed": seed,
+            "decisions": decisions,
+            "summary": summary,
+        }
+
+    def sample_chunk(self, inputs: dict, size: int, seed) -> dict:
+        """Draws size samples and returns {decision: {label: count}}."""
+        rng = np.random.default_rng(seed)
+        c = {key: np.full(size, value) for key, value in inputs["fixed"].items()}
+
+        c["pts"] = self._results(rng, inputs["results"], size)
+        c["lengths"] = np.full(size, len(inputs["results"]))
+        c["opp_pts"] = self._results(rng, inputs["opponent_results"], size)
+        for key in ("goals_scored_last_5", "goals_conceded_last_5", "opponent_goals_scored"):
+            c[key] = rng.poisson(inputs[key], size).astype(np.float64)
+
+        fitness = inputs["fitness"]
+        if len(fitness):
+            jittered = np.clip(fitness + rng.normal(0.0, FITNESS_SD, (size, len(fitness))), 0.0, 1.0)
+            c["fitness_total"] = jittered.sum(axis=1)
+        else:
+            c["fitness_total"] = np.zeros(size)
+        c["player_count"] = np.full(size, len(fitness))
+
+        opp_lengths = np.full(size, len(inputs["opponent_results"]))
+        cols = self.metrics.calculate_columns(c)
+        cols.update(self.form.analyse_points(c["pts"], c["lengths"], c["opp_pts"], opp_lengths))
+        coded = self.formation.select_codes(cols)
+        coded.update(self.press.recommend_codes(cols))
+
+        tally = {}
+        for key in DECISIONS:
+            codes, table = coded[key]
+            labels = {}
+            for label, n in zip(table, np.bincount(codes, minlength=len(table)).tolist()):
+                if n:
+                    labels[label] = labels.get(label, 0) + n
+            tally[key] = labels
+        return tally
+
+    def _results(self, rng, results: list, size: int) -> np.ndarray:
+        """size × len(results) points matrix, outcomes redrawn from the smoothed mix."""
+        counts = np.array([results.count(o) for o in _OUTCOMES], dtype=np.float64) + PRIOR
+        draws = rng.choice(len(_OUTCOMES), size=(size, len(results)), p=counts / counts.sum())
+        points = np.array([self.metrics.POINTS[o] for o in _OUTCOMES], dtype=np.float64)
+        return points[draws]
+
+
+def _sample_inputs(validated: dict) -> dict:
+    """The parts of a validated input the sampler reads — small and picklable."""
+    return {
+        "results": list(validated["last_5_results"]),
+        "opponent_results": list(validated.get("opponent_last_5_results") or ["D"] * 5),
+        "goals_scored_last_5": validated.get("goals_scored_last_5") or 0,
+        "goals_conceded_last_5": validated["goals_conceded_last_5"],
+        "opponent_goals_scored": validated.get("opponent_goals_scored", 6),
+        "fitness": np.array([p.get("fitness_score", 1.0) for p in validated.get("players") or []], dtype=np.float64),
+        "fixed": {
+            key: np.nan if validated.get(key) is None else float(validated[key])
+            for key in _TIER2_COLUMNS
+        },
+    }
+
+
+# ── Process pool entry point ───────────────────────────────────
+# Each worker process keeps one analyser, built from the rule tables it
+# was last sent and rebuilt when their versions change.
+_worker_analyser = (None, None)
+
+
+class _TableRules:
+    """Stands in for a RuleBook in a worker: one fixed, compiled table."""
+
+    def __init__(self, table: dict):
+        self.compiled = CompiledRules(table)
+
+
+def _sample_chunk(inputs: dict, size: int, seed, rules: tuple) -> dict:
+    global _worker_analyser
+    versions = tuple(version for version, _ in rules)
+    built, analyser = _worker_analyser
+    if built != versions:
+        (_, formation), (_, press) = rules
+        analyser = RobustnessAnalyser(
+            formation=FormationSelector(_TableRules(formation)),
+            press=PressEngine(_TableRules(press)),
+        )
+        _worker_analyser = (versions, analyser)
+    return analyser.sample_chunk(inputs, size, seed)
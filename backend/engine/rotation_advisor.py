@@ -1,18 +1,24 @@
+from core.context import MatchContext, context_stage
+
+
 class RotationAdvisor:
 
     FATIGUE_THRESHOLD = 0.65
+    READS = ("starting_xi", "bench", "fatigue_risk_score")
+    WRITES = ("rotation_suggestions",)
 
-    def advise(self, data: dict) -> dict:
-        suggestions = self._build_suggestions(data)
-        return {**data, "rotation_suggestions": suggestions}
+    @context_stage
+    def advise(self, data: MatchContext) -> MatchContext:
+        data.rotation_suggestions = self._build_suggestions(data)
+        return data
 
-    def _build_suggestions(self, d: dict) -> list:
-        starting_xi = d.get("starting_xi", [])
-        bench = d.get("bench", [])
+    def _build_suggestions(self, d: MatchContext) -> list:
+        starting_xi = getattr(d, "starting_xi", [])
+        bench = getattr(d, "bench", [])
         suggestions = []
 
         if not starting_xi:
-            if d["fatigue_risk_score"] > 0.55:
+            if d.fatigue_risk_score > 0.55:
                 suggestions.append(
                     "Fatigue risk elevated — consider rotating 2-3 players if depth allows."
                 )
@@ -0,0 +1,493 @@
+"""
+rule_engine.py — Declarative tactical rules, compiled to Python.
+
+The thresholds behind formation, defensive line, tactical focus, press
+intensity, match risk and the mismatch messages live in a JSON table
+(engine/tactical_rules.json by default):
+
+    "defaults":  fallback values for fields a context may not have
+    "derived":   named expressions, e.g. the weighted match_risk_score
+    "decisions": {name: {"mode", "default", "rules": [{"when", "then"}]}}
+
+A "when" is a Python-syntax expression over context fields and derived
+names: comparisons, and / or / not, + - * / and number or string
+constants — nothing else parses. The fields are the ones every path
+through the rule stages has (scalar, batch, sweep, robustness): the
+metric and form outputs, bar the display-only form_label. The one
+text field, momentum, only compares == / != with a string. Every decision needs at least one rule.
+A table of the wrong shape — a decision that is not an object, a
+"when" that is not a string — is rejected with the path to the bad
+entry, like any other RuleError.
+
+mode "first" takes the first rule that holds (an if / elif chain);
+mode "all" collects every rule that holds, falling back to [default]
+when none do.
+
+Each decision is compiled once into two generated functions: one
+taking a MatchContext, written like the hand-coded if-chains it
+replaces, and one taking a dict of NumPy columns for the batch stages,
+where and / or become & / | on boolean masks. Both evaluate the same
+expression trees in the same order, so scalar and batch results match
+the old code exactly. interpret() walks the trees instead and is kept
+as the reference (see benchmarks/bench_rules.py).
+
+RuleBook.reload() compiles a new table and swaps it in with a single
+assignment; a table that fails to load or compile leaves the current
+one in place. reload_if_changed() does the same only when the file's
+mtime has moved, and poll_interval runs that from a background thread,
+which is how process-pool workers pick up edits.
+"""
+
+import ast
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+from core.columns import pick_codes
+from core.form_analyser import FormAnalyser
+from core.metric_calculator import MetricCalculator
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RULES = Path(__file__).with_name("tactical_rules.json")
+
+# Decisions the engine stages read, and the mode each must use
+REQUIRED = {
+    "recommended_formation": "first",
+    "defensive_line": "first",
+    "tactical_focus": "first",
+    "press_intensity": "first",
+    "match_risk_level": "first",
+    "advantages": "all",
+    "threats": "all",
+}
+
+# What rules read: the outputs of the stages upstream of the rule
+# stages. Robustness samples have no form_label, so it is left out.
+NUMERIC_INPUTS = frozenset(MetricCalculator.WRITES) | {"form_score", "opponent_form_score"}
+TEXT_INPUTS = frozenset(FormAnalyser.WRITES) - NUMERIC_INPUTS - {"form_label"}
+
+_COMPARE = {ast.Gt: ">", ast.GtE: ">=", ast.Lt: "<", ast.LtE: "<=", ast.Eq: "==", ast.NotEq: "!="}
+_ARITH = {ast.Add: "+", ast.Sub: "-", ast.Mult: "*", ast.Div: "/"}
+_COMPARE_FN = {
+    ">": lambda a, b: a > b, ">=": lambda a, b: a >= b,
+    "<": lambda a, b: a < b, "<=": lambda a, b: a <= b,
+    "==": lambda a, b: a == b, "!=": lambda a, b: a != b,
+}
+_ARITH_FN = {
+    "+": lambda a, b: a + b, "-": lambda a, b: a - b,
+    "*": lambda a, b: a * b, "/": lambda a, b: a / b,
+}
+
+
+class RuleError(ValueError):
+    pass
+
+
+def _equals(column, value) -> np.ndarray:
+    """Elementwise == for a column of strings (a list, not an array)."""
+    return np.array([v == value for v in column], dtype=bool)
+
+
+# ── Parsing ────────────────────────────────────────────────────
+def _parse(text: str, names: frozenset, where: str) -> ast.expr:
+    """Parses one expression and rejects anything outside the rule grammar."""
+    try:
+        tree = ast.parse(text, mode="eval").body
+    except SyntaxError as e:
+        raise RuleError(f"{where}: cannot parse {text!r} ({e.msg}).")
+    except ValueError as e:
+        raise RuleError(f"{where}: cannot parse {text!r} ({e}).")
+
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name):
+            if node.id not in names:
+                raise RuleError(f"{where}: {node.id!r} is not a field rules can read here.")
+        elif isinstance(node, ast.Constant):
+            if isinstance(node.value, bool) or not isinstance(node.value, (int, float, str)):
+                raise RuleError(f"{where}: unsupported constant {node.value!r}.")
+        elif isinstance(node, ast.Compare):
+            if any(type(op) not in _COMPARE for op in node.ops):
+                raise RuleError(f"{where}: unsupported comparison in {text!r}.")
+        elif isinstance(node, ast.BinOp):
+            if type(node.op) not in _ARITH:
+                raise RuleError(f"{where}: unsupported operator in {text!r}.")
+        elif isinstance(node, ast.UnaryOp):
+            if not isinstance(node.op, (ast.USub, ast.Not)):
+                raise RuleError(f"{where}: unsupported operator in {text!r}.")
+        elif not isinstance(node, (ast.BoolOp, ast.And, ast.Or, ast.Load, ast.cmpop, ast.operator, ast.unaryop)):
+            raise RuleError(f"{where}: {type(node).__name__} is not allowed in {text!r}.")
+    return tree
+
+
+def _expect(value, kind, where: str, what: str):
+    """value, if it is a kind (bools never count as numbers); RuleError otherwise."""
+    if isinstance(value, bool) or not isinstance(value, kind):
+        raise RuleError(f"{where}: must be {what}, got {type(value).__name__}.")
+    return value
+
+
+def _check_text(tree: ast.expr, text: frozenset, where: str):
+    """Text fields and strings only meet each other, in == / != comparisons."""
+    allowed = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Compare):
+            operands = [node.left, *node.comparators]
+            strings = [n for n in operands if isinstance(n, ast.Constant) and isinstance(n.value, str)]
+            if not strings:
+                continue
+            others = [n for n in operands if n not in strings]
+            if len(operands) != 2 or len(others) != 1 or not isinstance(others[0], ast.Name) \
+                    or others[0].id not in text:
+                raise RuleError(f"{where}: a string can only be compared with a text field.")
+            allowed.update(map(id, operands))
+    for node in ast.walk(tree):
+        if id(node) in allowed:
+            continue
+        if isinstance(node, ast.Name) and node.id in text:
+            raise RuleError(f"{where}: {node.id!r} is text; compare it with == or != against a string.")
+        if isinstance(node, ast.Constant) and isinstance(node.value, str):
+            raise RuleError(f"{where}: a string can only be compared with a text field.")
+
+
+def _names(tree: ast.expr) -> set:
+    return {node.id for node in ast.walk(tree) if isinstance(node, ast.Name)}
+
+
+# ── Code Generation ────────────────────────────────────────────
+class _Emitter:
+    """Turns a parsed expression into scalar or column source code."""
+
+    def __init__(self, batch: bool, defaults: dict, derived: frozenset):
+        self.batch = batch
+        self.defaults = defaults
+        self.derived = derived
+
+    def emit(self, node) -> str:
+        if isinstance(node, ast.Name):
+            if node.id in self.derived:
+                return node.id
+            if self.batch:
+                return f"c[{node.id!r}]"
+            if node.id in self.defaults:
+                return f"getattr(d, {node.id!r}, {self.defaults[node.id]!r})"
+            return f"d.{node.id}"
+
+        if isinstance(node, ast.Constant):
+            return repr(node.value)
+
+        if isinstance(node, ast.BinOp):
+            return f"({self.emit(node.left)} {_ARITH[type(node.op)]} {self.emit(node.right)})"
+
+        if isinstance(node, ast.UnaryOp):
+            if isinstance(node.op, ast.USub):
+                return f"(-{self.emit(node.operand)})"
+            return f"(~{self.emit(node.operand)})" if self.batch else f"(not {self.emit(node.operand)})"
+
+        if isinstance(node, ast.BoolOp):
+            joiner = (" & " if self.batch else " and ") if isinstance(node.op, ast.And) \
+                else (" | " if self.batch else " or ")
+            return "(" + joiner.join(self.emit(v) for v in node.values) + ")"
+
+        # Compare — a chain a < b < c is (a < b) and (b < c)
+        parts, left = [], node.left
+        for op, right in zip(node.ops, node.comparators):
+            parts.append(self._compare(left, _COMPARE[type(op)], right))
+            left = right
+        if len(parts) == 1:
+            return parts[0]
+        return "(" + (" & " if self.batch else " and ").join(parts) + ")"
+
+    def _compare(self, left, op: str, right) -> str:
+        text = next((n.value for n in (left, right) if isinstance(n, ast.Constant) and isinstance(n.value, str)), None)
+        if text is not None and op not in ("==", "!="):
+            raise RuleError(f"Strings only support == and !=, got {op}.")
+        if self.batch and text is not None:
+            column = right if isinstance(left, ast.Constant) else left
+            mask = f"_equals({self.emit(column)}, {text!r})"
+            return mask if op == "==" else f"(~{mask})"
+        return f"({self.emit(left)} {op} {self.emit(right)})"
+
+
+def _generate(name: str, decision: dict, derived: dict, defaults: dict, batch: bool) -> str:
+    """Source for one decision's evaluator: def <name>(d) or def <name>(c)."""
+    emitter = _Emitter(batch, defaults, frozenset(derived))
+    arg = "c" if batch else "d"
+    lines = [f"def {name}({arg}):"]
+
+    # Derived values this decision reads, in table order
+    used = set().union(*(_names(rule["when"]) for rule in decision["rules"]))
+    for key in reversed(list(derived)):
+        if key in used:
+            used |= _names(derived[key])
+    for key, tree in derived.items():
+        if key in used:
+            lines.append(f"    {key} = {emitter.emit(tree)}")
+
+    conditions = [emitter.emit(rule["when"]) for rule in decision["rules"]]
+    outcomes = [rule["then"] for rule in decision["rules"]]
+    default = decision["default"]
+
+    if batch and decision["mode"] == "first":
+        lines.append(f"    return _pick_codes({outcomes!r}, [")
+        lines += [f"        {cond}," for cond in conditions]
+        lines.append(f"    ], {default!r})")
+    elif batch:
+        lines.append("    return [")
+        lines += [f"        ({cond}, {then!r})," for cond, then in zip(conditions, outcomes)]
+        lines.append("    ]")
+    elif decision["mode"] == "first":
+        for cond, then in zip(conditions, outcomes):
+            lines.append(f"    if {cond}:")
+            lines.append(f"        return {then!r}")
+        lines.append(f"    return {default!r}")
+    else:
+        lines.append("    found = []")
+        for cond, then in zip(conditions, outcomes):
+            lines.append(f"    if {cond}:")
+            lines.append(f"        found.append({then!r})")
+        lines.append(f"    return found or [{default!r}]")
+    return "\n".join(lines) + "\n"
+
+
+# ── Compiled Table ─────────────────────────────────────────────
+class CompiledRules:
+    """
+    One loaded table. scalar[name](context) and batch[name](columns)
+    are the generated evaluators; batch "first" decisions return
+    (codes, table) like columns.pick_codes, "all" decisions a list of
+    (mask, message) pairs. table is the source table, kept so a
+    process-pool worker can compile the same rules.
+    """
+
+    def __init__(self, table: dict, source: str = "<table>"):
+        self.table = table
+        self.source = source
+        _expect(table, dict, "Rule table", "an object")
+        self.version = hashlib.sha1(json.dumps(table, sort_keys=True).encode()).hexdigest()[:12]
+        self.defaults = dict(_expect(table.get("defaults", {}), dict, "defaults", "an object"))
+        for key, value in self.defaults.items():
+            _expect(value, (int, float, str), f"defaults.{key}", "a number or string")
+
+        inputs = NUMERIC_INPUTS | TEXT_INPUTS
+        self.derived = {}
+        for key, text in _expect(table.get("derived", {}), dict, "derived", "an object").items():
+            _expect(text, str, f"derived.{key}", "a string")
+            if not key.isidentifier() or key in inputs:
+                raise RuleError(f"derived.{key}: not a usable name.")
+            self.derived[key] = _parse(text, inputs | frozenset(self.derived), f"derived.{key}")
+            _check_text(self.derived[key], TEXT_INPUTS, f"derived.{key}")
+
+        names = inputs | frozenset(self.derived)
+        self.decisions = {}
+        for key, decision in _expect(table.get("decisions", {}), dict, "decisions", "an object").items():
+            _expect(decision, dict, key, "an object")
+            mode = decision.get("mode", "first")
+            if mode not in ("first", "all"):
+                raise RuleError(f"{key}: mode must be 'first' or 'all', got {mode!r}.")
+            if "default" not in decision:
+                raise RuleError(f"{key}: a default outcome is required.")
+            _expect(decision["default"], str, f"{key}.default", "a string")
+            if not _expect(decision.get("rules", []), list, f"{key}.rules", "a list"):
+                raise RuleError(f"{key}: needs at least one rule.")
+            rules = []
+            for i, rule in enumerate(decision["rules"]):
+                where = f"{key}.rules[{i}]"
+                _expect(rule, dict, where, "an object")
+                if "when" not in rule or "then" not in rule:
+                    raise RuleError(f"{where}: needs 'when' and 'then'.")
+                _expect(rule["when"], str, f"{where}.when", "a string")
+                _expect(rule["then"], str, f"{where}.then", "a string")
+                when = _parse(rule["when"], names, where)
+                _check_text(when, TEXT_INPUTS, where)
+                rules.append({"when": when, "then": rule["then"]})
+            self.decisions[key] = {"mode": mode, "default": decision["default"], "rules": rules}
+
+        # Context fields behind each decision, derived names expanded —
+        # what the pipeline's stage graph links the rule stages by
+        self.reads = {key: self._fields(d["rules"]) for key, d in self.decisions.items()}
+
+        for key, mode in REQUIRED.items():
+            if key not in self.decisions:
+                raise RuleError(f"Rule table has no {key!r} decision.")
+            if self.decisions[key]["mode"] != mode:
+                raise RuleError(f"{key} must use mode {mode!r}.")
+
+        self.scalar, self.batch = {}, {}
+        for key, decision in self.decisions.items():
+            if not key.isidentifier():
+                raise RuleError(f"{key!r} is not a valid decision name.")
+            self.scalar[key] = self._compile(key, decision, batch=False)
+            self.batch[key] = self._compile(key, decision, batch=True)
+
+    def _fields(self, rules: list) -> frozenset:
+        pending = list(set().union(*(_names(rule["when"]) for rule in rules)))
+        fields = set()
+        while pending:
+            name = pending.pop()
+            if name in self.derived:
+                pending.extend(_names(self.derived[name]))
+            else:
+                fields.add(name)
+        return frozenset(fields)
+
+    def _compile(self, key: str, decision: dict, batch: bool):
+        source = _generate(key, decision, self.derived, self.defaults, batch)
+        namespace = {"_pick_codes": pick_codes, "_equals": _equals}
+        exec(compile(source, f"<rules:{key}{':batch' if batch else ''}>", "exec"), namespace)
+        return namespace[key]
+
+    def interpret(self, key: str, d):
+        """Scalar evaluation by walking the expression trees — the reference path."""
+        derived = {}
+
+        def value(name):
+            if name in self.derived:
+                if name not in derived:
+                    derived[name] = self._eval(self.derived[name], value)
+                return derived[name]
+            if name in self.defaults:
+                return getattr(d, name, self.defaults[name])
+            return getattr(d, name)
+
+        decision = self.decisions[key]
+        if decision["mode"] == "first":
+            for rule in decision["rules"]:
+                if self._eval(rule["when"], value):
+                    return rule["then"]
+            return decision["default"]
+        found = [rule["then"] for rule in decision["rules"] if self._eval(rule["when"], value)]
+        return found or [decision["default"]]
+
+    def _eval(self, node, value):
+        if isinstance(node, ast.Name):
+            return value(node.id)
+        if isinstance(node, ast.Constant):
+            return node.value
+        if isinstance(node, ast.BinOp):
+            return _ARITH_FN[_ARITH[type(node.op)]](self._eval(node.left, value), self._eval(node.right, value))
+        if isinstance(node, ast.UnaryOp):
+            operand = self._eval(node.operand, value)
+            return -operand if isinstance(node.op, ast.USub) else not operand
+        if isinstance(node, ast.BoolOp):
+            if isinstance(node.op, ast.And):
+                return all(self._eval(v, value) for v in node.values)
+            return any(self._eval(v, value) for v in node.values)
+
+        left = self._eval(node.left, value)
+        for op, comparator in zip(node.ops, node.comparators):
+            right = self._eval(comparator, value)
+            if not _COMPARE_FN[_COMPARE[type(op)]](left, right):
+                return False
+            left = right
+        return True
+
+
+# ── Rule Book ──────────────────────────────────────────────────
+class RuleBook:
+    """
+    The current CompiledRules for a rules file, reloadable in place.
+    Stages read .compiled once per call, so a reload never mixes two
+    tables within one stage.
+    """
+
+    def __init__(self, path=DEFAULT_RULES, poll_interval: float = 0.0):
+        self.path = Path(path)
+        self.compiled = self._load()
+        self.loaded_at = time.time()
+        self._mtime = self._stat()
+        self._lock = threading.Lock()
+        self._listeners = []
+        self.poll_interval = poll_interval
+        if poll_interval > 0:
+            threading.Thread(target=self._poll, name="rulebook-poll", daemon=True).start()
+
+    @classmethod
+    def from_env(cls):
+        """
+        Rules from GAFFEROS_RULES (default engine/tactical_rules.json),
+        re-read every GAFFEROS_RULES_POLL seconds when that is set.
+        """
+        return cls(
+            os.getenv("GAFFEROS_RULES", str(DEFAULT_RULES)),
+            poll_interval=float(os.getenv("GAFFEROS_RULES_POLL", "0")),
+        )
+
+    @property
+    def version(self) -> str:
+        return self.compiled.version
+
+    def reload(self) -> str:
+        """Re-reads the file and swaps the table in. Raises RuleError and keeps the old one if it is bad."""
+        with self._lock:
+            mtime = self._stat()
+            compiled = self._load()
+            self.compiled = compiled
+            self._mtime = mtime
+            self.loaded_at = time.time()
+        logger.info("Loaded rules %s from %s", compiled.version, self.path)
+        for listener in self._listeners:
+            listener()
+        return compiled.version
+
+    def on_reload(self, listener):
+        """Calls listener() after every successful reload, e.g. to drop cached reports."""
+        self._listeners.append(listener)
+
+    def reload_if_changed(self) -> bool:
+        if self._stat() == self._mtime:
+            return False
+        try:
+            self.reload()
+        except (OSError, RuleError) as e:
+            # Keep serving the old table; try again once the file changes
+            self._mtime = self._stat()
+            logger.error("Rules reload from %s failed, keeping %s: %s", self.path, self.version, e)
+            return False
+        except Exception:
+            # A bug, not a bad table — but it must not end the poll thread
+            self._mtime = self._stat()
+            logger.exception("Rules reload from %s failed unexpectedly, serving %s", self.path, self.version)
+            return False
+        return True
+
+    def stats(self) -> dict:
+        return {"version": self.version, "path": str(self.path), "loaded_at": self.loaded_at}
+
+    def _load(self) -> CompiledRules:
+        try:
+            table = json.loads(self.path.read_text(encoding="utf-8"))
+        except json.JSONDecodeError as e:
+            raise RuleError(f"{self.path}: invalid JSON ({e}).")
+        return CompiledRules(table, source=str(self.path))
+
+    def _stat(self):
+        try:
+            return self.path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def _poll(self):
+        while True:
+            time.sleep(self.poll_interval)
+            self.reload_if_changed()
+
+
+_default_book = None
+
+
+def default_rules() -> RuleBook:
+    """
+    Shared RuleBook.from_env() for pipelines and stages built without
+    one — process-pool workers included.
+    """
+    global _default_book
+    if _default_book is None:
+        _default_book = RuleBook.from_env()
+    return _default_book
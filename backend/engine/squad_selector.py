@@ -7,8 +7,28 @@ Selection score:
   Medium risk: PIS × 0.50 + fitness × 0.50
   Low risk:    PIS × 0.30 + fitness × 0.70
   No stats:    fitness only
+
+XI assignment:
+  optimal: one min-cost assignment over players × slots (Hungarian,
+           via scipy). Fewest players out of position first, then
+           most primary-position fits, then total selection score.
+  greedy:  fills GK, DEF, MID, FWD in turn, best score first.
+           Used when scipy is not installed.
 """
 
+import threading
+from enum import Enum
+from importlib.util import find_spec
+
+import numpy as np
+
+from core.context import MatchContext, context_stage
+from core.schemas import PIS_STAT_KEYS
+
+# Optional — greedy selection still works. scipy.optimize takes ~0.3 s
+# to import, so it loads on the first optimal selection, not with this module.
+HAS_SCIPY = find_spec("scipy") is not None
+
 BROAD_TO_SPECIFIC = {
     "GK":  ["GK"],
     "DEF": ["CB", "RB", "LB", "RWB", "LWB"],
@@ -16,6 +36,12 @@ BROAD_TO_SPECIFIC = {
     "FWD": ["RW", "LW", "ST", "CF", "SS"],
 }
 
+SPECIFIC_TO_BROAD = {
+    specific: broad
+    for broad, specifics in BROAD_TO_SPECIFIC.items()
+    for specific in specifics
+}
+
 FORMATION_SLOTS = {
     "4-3-3":   {"GK": 1, "DEF": 4, "MID": 3, "FWD": 3},
     "4-2-3-1": {"GK": 1, "DEF": 4, "MID": 5, "FWD": 1},
@@ -24,6 +50,16 @@ FORMATION_SLOTS = {
     "5-4-1":   {"GK": 1, "DEF": 5, "MID": 4, "FWD": 1},
 }
 
+# Fit penalties for the assignment objective. Selection scores are 0-1
+# per slot, so XI totals differ by at most XI_SIZE: a secondary penalty
+# above that means no score gain buys a secondary fit in place of a
+# primary one, and an out-of-position penalty above XI_SIZE times
+# (secondary penalty + 1) means no mix of fits and scores buys one
+# player out of position.
+XI_SIZE = max(sum(slots.values()) for slots in FORMATION_SLOTS.values())
+SECONDARY_PENALTY = XI_SIZE + 1.0
+OUT_OF_POSITION_PENALTY = XI_SIZE * (SECONDARY_PENALTY + 1) + 1.0
+
 # ── Position group mapping ─────────────────────────────────────
 def _position_group(specific: str) -> str:
     if specific == "GK":
@@ -126,10 +162,99 @@ def _calculate_pis(player: dict) -> float | None:
     return None
 
 
+# ── Vectorized PIS ─────────────────────────────────────────────
+# Same formulas as _calculate_pis as data: per position group, each
+# stat's per-match value is divided by its cap, clipped to 1 and
+# weighted. Keep in step with _calculate_pis.
+PIS_WEIGHTS = {
+    "GK":       {"saves": (5, 0.6), "clean_sheets": (0.5, 0.4)},
+    "CB":       {"tackles": (5, 0.40), "interceptions": (3, 0.35), "blocks": (2, 0.25)},
+    "Fullback": {"tackles": (4, 0.30), "interceptions": (3, 0.30), "crosses": (4, 0.20), "assists": (0.5, 0.20)},
+    "CDM":      {"tackles": (5, 0.45), "interceptions": (3, 0.35), "key_passes": (2, 0.20)},
+    "CM":       {"key_passes": (3, 0.40), "assists": (0.5, 0.35), "goals": (0.3, 0.25)},
+    "CAM":      {"key_passes": (4, 0.35), "chances_created": (3, 0.35), "assists": (0.5, 0.30)},
+    "Wide":     {"goals": (0.5, 0.30), "assists": (0.5, 0.30), "crosses": (4, 0.20), "dribbles": (3, 0.20)},
+    "FWD":      {"goals": (0.6, 0.65), "assists": (0.4, 0.35)},
+}
+
+PIS_GROUPS = list(PIS_WEIGHTS)
+
+# group × stat matrices; unused stats get weight 0 and an infinite cap
+_PIS_CAPS = np.full((len(PIS_GROUPS), len(PIS_STAT_KEYS)), np.inf)
+_PIS_W = np.zeros((len(PIS_GROUPS), len(PIS_STAT_KEYS)))
+for _g, _group in enumerate(PIS_GROUPS):
+    for _key, (_cap, _weight) in PIS_WEIGHTS[_group].items():
+        _PIS_CAPS[_g, PIS_STAT_KEYS.index(_key)] = _cap
+        _PIS_W[_g, PIS_STAT_KEYS.index(_key)] = _weight
+
+# fingerprint -> PIS, shared across runs and risk levels — and across
+# executor and stage-pool threads, hence the lock
+PIS_CACHE_SIZE = 8192
+_pis_cache = {}
+_pis_lock = threading.Lock()
+
+
+def _pis_fingerprint(player: dict):
+    """
+    Hashable summary of everything PIS depends on, or None when the
+    player has no usable stats (PIS is None).
+    """
+    stats = player.get("stats")
+    if not stats:
+        return None
+    mp = stats.get("matches_played", 0)
+    if not mp:
+        return None
+    group = _position_group(player.get("specific_position", ""))
+    if group not in PIS_WEIGHTS:
+        return None
+    return (group, mp, tuple(stats.get(key, 0) for key in PIS_WEIGHTS[group]))
+
+
+def calculate_pis_batch(players: list) -> list:
+    """
+    PIS for a whole squad in one pass. Stats go into a players ×
+    stat-keys matrix, are divided by matches played, scaled by the
+    position group's cap / weight rows and clipped. Results are
+    memoised by stats fingerprint. Matches _calculate_pis to 1e-9.
+    """
+    fingerprints = [_pis_fingerprint(p) for p in players]
+    # Results come from this local copy, never read back from the
+    # shared cache, which another thread may clear meanwhile
+    with _pis_lock:
+        found = {fp: _pis_cache[fp] for fp in fingerprints if fp is not None and fp in _pis_cache}
+    todo = [
+        i for i, fp in enumerate(fingerprints)
+        if fp is not None and fp not in found
+    ]
+
+    if todo:
+        groups = np.array([PIS_GROUPS.index(fingerprints[i][0]) for i in todo])
+        mp = np.array([fingerprints[i][1] for i in todo], dtype=np.float64)
+        stats = np.array(
+            [[players[i]["stats"].get(key, 0) for key in PIS_STAT_KEYS] for i in todo],
+            dtype=np.float64,
+        )
+        per_match = stats / mp[:, None]
+        parts = np.minimum(per_match / _PIS_CAPS[groups], 1.0) * _PIS_W[groups]
+        pis = np.minimum(parts.sum(axis=1), 1.0)
+
+        computed = {fingerprints[i]: value for i, value in zip(todo, pis.tolist())}
+        found.update(computed)
+        with _pis_lock:
+            if len(_pis_cache) + len(computed) > PIS_CACHE_SIZE:
+                _pis_cache.clear()
+            _pis_cache.update(computed)
+
+    return [None if fp is None else found[fp] for fp in fingerprints]
+
+
 # ── Selection Score ────────────────────────────────────────────
-def _selection_score(player: dict, match_risk: str) -> float:
+def _selection_score(player: dict, match_risk: str, pis=...) -> float:
+    """pis may be passed in when already known; otherwise it is computed."""
     fitness = player.get("fitness_score") or 0.0
-    pis = _calculate_pis(player)
+    if pis is ...:
+        pis = _calculate_pis(player)
 
     if pis is None:
         return fitness
@@ -146,42 +271,105 @@ def _selection_score(player: dict, match_risk: str) -> float:
 # ── Squad Selector ─────────────────────────────────────────────
 class SquadSelector:
 
-    def select(self, data: dict) -> dict:
-        players = data.get("players", [])
-        formation = data.get("recommended_formation", "4-3-3")
-        match_risk = data.get("match_risk_level", "Medium")
+    MODES = ("optimal", "greedy")
+    READS = ("players", "recommended_formation", "match_risk_level")
+    WRITES = ("starting_xi", "bench")
+
+    def __init__(self, mode: str = "optimal"):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown selection mode '{mode}'. Use one of {self.MODES}.")
+        if mode == "optimal" and not HAS_SCIPY:
+            mode = "greedy"
+        self.mode = mode
+
+    @context_stage
+    def select(self, data: MatchContext) -> MatchContext:
+        players = getattr(data, "players", [])
+        formation = getattr(data, "recommended_formation", "4-3-3")
+        match_risk = getattr(data, "match_risk_level", "Medium")
 
         if not players:
-            data["starting_xi"] = []
-            data["bench"] = []
+            data.starting_xi = []
+            data.bench = []
             return data
 
-        # Normalise player dicts (handle Pydantic models)
+        # Normalise player dicts (handle Pydantic models). Validated
+        # players are already plain, so enums are only unwrapped for
+        # dicts built by hand.
         player_dicts = []
         for p in players:
-            if hasattr(p, "dict"):
-                d = p.dict()
+            if hasattr(p, "model_dump"):
+                d = p.model_dump(mode="json")
             else:
                 d = dict(p)
-            for key, val in d.items():
-                if hasattr(val, "value"):
-                    d[key] = val.value
-            # Attach computed selection score
-            d["_selection_score"] = _selection_score(d, match_risk)
-            d["_pis"] = _calculate_pis(d)
+                for key, val in d.items():
+                    if isinstance(val, Enum):
+                        d[key] = val.value
             player_dicts.append(d)
 
+        # Attach impact and selection scores — PIS once for the squad
+        for d, pis in zip(player_dicts, calculate_pis_batch(player_dicts)):
+            d["_selection_score"] = _selection_score(d, match_risk, pis)
+            d["_pis"] = pis
+
         slots = FORMATION_SLOTS.get(formation, {"GK": 1, "DEF": 4, "MID": 3, "FWD": 3})
         available = [p for p in player_dicts if p.get("available", True)]
 
         starting_xi, used_names = self._fill_xi(available, slots)
         bench = [p for p in available if p.get("name") not in used_names]
 
-        data["starting_xi"] = starting_xi
-        data["bench"] = bench
+        data.starting_xi = starting_xi
+        data.bench = bench
         return data
 
     def _fill_xi(self, available: list, slots: dict):
+        if self.mode == "optimal":
+            return self._fill_xi_optimal(available, slots)
+        return self._fill_xi_greedy(available, slots)
+
+    # ── Optimal Assignment ─────────────────────────────────────
+    def _fill_xi_optimal(self, available: list, slots: dict):
+        from scipy.optimize import linear_sum_assignment
+
+        slot_broads = [broad for broad, count in slots.items() for _ in range(count)]
+        if not available or not slot_broads:
+            return [], set()
+
+        groups = list(BROAD_TO_SPECIFIC)
+        code = {broad: i for i, broad in enumerate(groups)}
+        primary = np.array([code.get(p.get("position"), -1) for p in available])
+        secondary = np.array([
+            code.get(SPECIFIC_TO_BROAD.get(p.get("secondary_position")), -1)
+            for p in available
+        ])
+        slot_codes = np.array([code.get(b, -2) for b in slot_broads])
+        scores = np.array([p.get("_selection_score", 0.0) for p in available], dtype=np.float64)
+
+        # value[i, j] — worth of player i in slot j
+        fit = np.where(
+            primary[:, None] == slot_codes[None, :], 0.0,
+            np.where(secondary[:, None] == slot_codes[None, :],
+                     -SECONDARY_PENALTY, -OUT_OF_POSITION_PENALTY),
+        )
+        rows, cols = linear_sum_assignment(scores[:, None] + fit, maximize=True)
+
+        by_slot = {broad: [] for broad in slots}
+        for i, j in zip(rows.tolist(), cols.tolist()):
+            by_slot[slot_broads[j]].append(available[i])
+
+        starting_xi = []
+        used_names = set()
+        for broad, selected in by_slot.items():
+            selected.sort(key=lambda p: p.get("_selection_score", 0.0), reverse=True)
+            for p in selected:
+                p_copy = dict(p)
+                p_copy["slot_broad"] = broad
+                starting_xi.append(p_copy)
+                used_names.add(p.get("name"))
+        return starting_xi, used_names
+
+    # ── Greedy Fallback ────────────────────────────────────────
+    def _fill_xi_greedy(self, available: list, slots: dict):
         starting_xi = []
         used_names = set()
         for broad, count in slots.items():
@@ -195,6 +383,7 @@ class SquadSelector:
 
     def _pick_for_position(self, available: list, broad: str, count: int, used_names: set) -> list:
         candidates = []
+        taken = set()   # ids of candidates — avoids comparing whole dicts
 
         # Pass 1 — primary position match
         for p in available:
@@ -202,20 +391,22 @@ class SquadSelector:
                 continue
             if p.get("position") == broad:
                 candidates.append(p)
+                taken.add(id(p))
 
         # Pass 2 — secondary position match
         if len(candidates) < count:
             specific_options = BROAD_TO_SPECIFIC.get(broad, [])
             for p in available:
-                if p.get("name") in used_names or p in candidates:
+                if p.get("name") in used_names or id(p) in taken:
                     continue
                 if p.get("secondary_position") in specific_options:
                     candidates.append(p)
+                    taken.add(id(p))
 
         # Pass 3 — any available player as last resort
         if len(candidates) < count:
             for p in available:
-                if p.get("name") in used_names or p in candidates:
+                if p.get("name") in used_names or id(p) in taken:
                     continue
                 candidates.append(p)
 
@@ -1,76 +1,499 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+
 from core.schemas import MatchAnalysisRequest, TacticalReport
+from core.context import MatchContext
+from core.errors import InvalidInput
+from core.feature_builder import FeatureBuilder
 from core.input_validator import InputValidator
 from core.metric_calculator import MetricCalculator
 from core.form_analyser import FormAnalyser
-from core.feature_builder import FeatureBuilder
+from core.inference import MLInference
+from core.model_registry import ModelRegistry
+from core.payloads import SAMPLE_PAYLOAD
+from core.report_cache import ReportCache
+from core.stage_graph import StageGraph
+from core.stage_metrics import StageMetrics
 from engine.formation_selector import FormationSelector
 from engine.press_engine import PressEngine
 from engine.mismatch_detector import MismatchDetector
 from engine.rotation_advisor import RotationAdvisor
 from engine.explainer import Explainer
+from engine.decision_surface import DecisionSurface
+from engine.rule_engine import RuleBook, default_rules
+from engine.robustness import RobustnessAnalyser
 from engine.squad_selector import SquadSelector
 
 
 class TactIQPipeline:
 
-    def __init__(self, ml_model=None):
+    # Player fields update_players() accepts
+    PLAYER_CHANGE_FIELDS = ("available", "fitness_score")
+
+    # run_round(): each team's own indices and form, computed once
+    TEAM_KEYS = MetricCalculator.TEAM_WRITES + FormAnalyser.TEAM_WRITES
+
+    # run_fields(): report fields, the context key behind each where
+    # the names differ, and the keys the "ml" stage writes
+    REPORT_FIELDS = tuple(TacticalReport.model_fields)
+    FIELD_KEYS = {"tier_used": "tier"}
+    PROBABILITY_FIELDS = ("loss_probability", "draw_probability", "win_probability")
+    ML_FIELDS = PROBABILITY_FIELDS + ("model_version",)
+
+    def __init__(
+        self,
+        ml_model=None,
+        cache: ReportCache = None,
+        inference: MLInference = None,
+        stage_metrics: StageMetrics = None,
+        rules: RuleBook = None,
+        stage_workers: int = 0,
+        models: ModelRegistry = None,
+    ):
         # Core
         self.validator = InputValidator()
         self.metrics = MetricCalculator()
         self.form = FormAnalyser()
-        self.features = FeatureBuilder()
 
-        # Engine
-        self.formation = FormationSelector()
-        self.press = PressEngine()
-        self.mismatch = MismatchDetector()
+        # Engine — the three rule stages share one reloadable table
+        self.rules = rules or default_rules()
+        self.formation = FormationSelector(self.rules)
+        self.press = PressEngine(self.rules)
+        self.mismatch = MismatchDetector(self.rules)
         self.rotation = RotationAdvisor()
         self.explainer = Explainer()
         self.squad_selector = SquadSelector()
+        self.surface = DecisionSurface(self.formation, self.press)
+        self.robustness = RobustnessAnalyser(self.metrics, self.form, self.formation, self.press)
+
+        # Steps 2-7 in order, as (histogram name, stage). Every analysis
+        # path runs this list, or a tail of it, through _run_stages().
+        self.stages = (
+            ("metrics", self.metrics.calculate),
+            ("form", self.form.analyse),
+            ("formation", self.formation.select),
+            ("press", self.press.recommend),
+            ("mismatch", self.mismatch.detect),
+            ("squad", self.squad_selector.select),
+            ("rotation", self.rotation.advise),
+            ("explain", self.explainer.explain),
+        )
+
+        # Optional report cache, keyed on the validated input. Cached
+        # reports carry the old rules' decisions, so a reload drops them.
+        self.cache = cache
+        if cache is not None:
+            self.rules.on_reload(cache.invalidate)
 
-        # ML — None until Phase 2
-        self.ml_model = ml_model
+        # Optional per-stage latency histograms — None means untimed
+        self.stage_metrics = stage_metrics
+
+        # run_fields() plans from the stage graph, rebuilt when a rule
+        # reload changes what the rule stages read. With stage_workers,
+        # independent stages in a plan level run on this pool.
+        self._graph = (None, None)
+        self.stage_pool = None
+        if stage_workers > 0:
+            self.stage_pool = ThreadPoolExecutor(stage_workers, thread_name_prefix="gafferos-stage")
+
+        # ML — None until Phase 2. MLInference owns the predict_proba
+        # call, micro-batching and the success / failure counters.
+        self.inference = inference or MLInference()
+        self.features = self.inference.features
+        if ml_model is not None:
+            self.ml_model = ml_model
+
+        # Optional versioned model store. Its current model is loaded in
+        # warm_up(), not here, and every later activation swaps in.
+        self.models = models
+        if models is not None:
+            models.on_swap(self.use_model)
+
+    @property
+    def ml_model(self):
+        return self.inference.model
+
+    @ml_model.setter
+    def ml_model(self, model):
+        self.use_model(model)
+
+    def use_model(self, model, version: str = None):
+        """
+        Swaps the model (and the version reports will name) in one
+        step; in-flight predictions finish on the old one.
+        """
+        self.inference.set_model(model, version)
+        # Cached reports carry the old model's probabilities
+        if self.cache is not None:
+            self.cache.invalidate()
+
+    def warm_up(self, raw=None) -> float:
+        """
+        Loads the registry's current model if none is active yet, then
+        runs one sample request end to end — JSON validation, every
+        stage, ML when a model is loaded, the report — outside the
+        report cache and stage histograms. The first real request then
+        doesn't pay for lazy imports (scipy.optimize in squad selection)
+        or first-call setup. raw defaults to core.payloads.SAMPLE_PAYLOAD.
+        Returns the seconds taken.
+        """
+        start = perf_counter()
+        if self.models is not None and self.models.version is None:
+            self.models.activate()
+        validated = self.validator.validate_json(raw if raw is not None else json.dumps(SAMPLE_PAYLOAD))
+        data = MatchContext.from_dict(validated)
+        for _, stage in self.stages:
+            data = stage(data)
+        probs = self.inference.predict(data) if self.ml_model is not None else None
+        self._build_report(data, probs).model_dump()
+        self.stage_graph()
+        return perf_counter() - start
 
     def run(self, request: MatchAnalysisRequest) -> TacticalReport:
 
         # Step 1 — Validate
-        data = self.validator.validate(request)
+        return self.run_validated(self._timed("validate", self.validator.validate, request))
+
+    def validate_json(self, raw) -> dict:
+        """InputValidator.validate_json, timed as the validate stage."""
+        return self._timed("validate", self.validator.validate_json, raw)
+
+    def validate_payload(self, payload: dict) -> dict:
+        """InputValidator.validate_payload, timed as the validate stage."""
+        return self._timed("validate", self.validator.validate_payload, payload)
+
+    def run_validated(self, validated: dict) -> TacticalReport:
+        """
+        Runs from InputValidator output — lets the API's single-pass
+        validate_json() skip rebuilding a MatchAnalysisRequest.
+        """
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.key_for(validated)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        # Steps 2-7 — later stages fill the context in place
+        data = self._analyse(MatchContext.from_dict(validated))
+
+        # Step 8 — ML prediction (Phase 2)
+        probs = self._predict(data) if self.ml_model is not None else None
+
+        # Step 9 — Return report
+        report = self._build_report(data, probs)
+        # Not cached if the model was swapped while this request ran
+        current = probs is not None and probs.version == self.inference.version
+        if cache_key is not None and (current or self.ml_model is None):
+            self.cache.put(cache_key, report)
+        return report
+
+    def run_fields(self, validated: dict, fields) -> dict:
+        """
+        Only the named TacticalReport fields, as a dict. Runs just the
+        stages those fields need, e.g. metrics, form, formation and press
+        for recommended_formation and press_intensity; the probabilities
+        need the ML stage and only when a model is loaded. A cached full
+        report is sliced instead. Partial results are not cached.
+        """
+        fields = tuple(dict.fromkeys(fields))
+        unknown = [f for f in fields if f not in self.REPORT_FIELDS]
+        if unknown:
+            raise InvalidInput(f"Unknown report field(s): {', '.join(unknown)}.")
+
+        if self.cache is not None:
+            cached = self.cache.get(self.cache.key_for(validated))
+            if cached is not None:
+                return {f: getattr(cached, f) for f in fields}
+
+        keys = {self.FIELD_KEYS.get(f, f) for f in fields}
+        if self.ml_model is None:
+            keys -= set(self.ML_FIELDS)
+
+        data = MatchContext.from_dict(validated)
+        steps = dict(self.stages, ml=self.inference.predict)
+        probs = None
+        for level in self.stage_graph().plan(keys):
+            if self.stage_pool is not None and len(level) > 1:
+                futures = [self.stage_pool.submit(self._timed, name, steps[name], data) for name in level]
+                results = dict(zip(level, [f.result() for f in futures]))
+            else:
+                results = {name: self._timed(name, steps[name], data) for name in level}
+            probs = results.get("ml", probs)
+
+        ml = dict(zip(self.ML_FIELDS, (*probs, probs.version) if probs else (None,) * 4))
+        return {f: ml[f] if f in ml else data[self.FIELD_KEYS.get(f, f)] for f in fields}
+
+    def stage_graph(self) -> StageGraph:
+        """
+        The analysis stages and ML as a StageGraph, linked by the keys
+        each declares it reads and writes (core/stage_graph.py).
+        """
+        version, graph = self._graph
+        if version != self.rules.version:
+            stages = [
+                (name, stage.__self__.READS, stage.__self__.WRITES)
+                for name, stage in self.stages
+            ]
+            stages.append(("ml", FeatureBuilder.FEATURE_KEYS, self.ML_FIELDS))
+            graph = StageGraph(stages)
+            self._graph = (self.rules.version, graph)
+        return graph
+
+    def run_with_state(self, request: MatchAnalysisRequest) -> tuple:
+        """
+        Like run(), but also returns the enriched MatchContext so a
+        later update_players() call can reuse it. Returns (report, state).
+        """
+        validated = self._timed("validate", self.validator.validate, request)
+        data = self._analyse(MatchContext.from_dict(validated))
+        probs = self._predict(data) if self.ml_model is not None else None
+        return self._build_report(data, probs), data
+
+    def update_players(self, previous_state: MatchContext, player_changes: dict) -> tuple:
+        """
+        Incremental re-analysis for matchday availability / fitness changes.
+
+        player_changes maps player name to the fields that changed, e.g.
+        {"Jamie Cole": {"available": False}, "Liam Torres": {"fitness_score": 0.7}}.
 
-        # Step 2 — Calculate metrics
-        data = self.metrics.calculate(data)
+        Only fatigue risk and the stages that read it or the players
+        list are re-run: formation, press, mismatch, squad selection,
+        rotation and the explainer. Validation, the other five indices
+        and form are reused from previous_state, which is left untouched.
+        Returns (report, new_state), same as run_with_state().
+        """
+        data = previous_state.copy()
+        data.players = self._apply_player_changes(previous_state.players, player_changes)
 
-        # Step 3 — Analyse form
+        # Fatigue in place of the full metrics step, then formation onwards
+        stages = (("metrics", self.metrics.update_fatigue),) + self._stages_from("formation")
+        data = self._run_stages(stages, data)
+
+        probs = self._predict(data) if self.ml_model is not None else None
+        return self._build_report(data, probs), data
+
+    def swap_xi(self, report: TacticalReport, names: list) -> TacticalReport:
+        """
+        The report with a hand-picked starting XI: names drawn from its
+        starting_xi and bench. Rotation advice is the only output that
+        depends on who starts, so RotationAdvisor is the only stage
+        re-run; everyone not picked goes to the bench.
+        """
+        pool = {p["name"]: p for p in report.bench + report.starting_xi}
+        missing = [name for name in names if name not in pool]
+        if missing:
+            raise InvalidInput(f"Not in this report's squad: {', '.join(missing)}.")
+        if len(set(names)) != len(names):
+            raise InvalidInput("A player can only fill one slot.")
+
+        picked = set(names)
+        starting_xi = [pool[name] for name in names]
+        bench = [p for p in report.starting_xi + report.bench if p["name"] not in picked]
+
+        data = MatchContext(fatigue_risk_score=report.fatigue_risk_score, starting_xi=starting_xi, bench=bench)
+        data = self._timed("rotation", self.rotation.advise, data)
+        return report.model_copy(update={
+            "starting_xi": starting_xi,
+            "bench": bench,
+            "rotation_suggestions": data.rotation_suggestions,
+        })
+
+    def _apply_player_changes(self, players: list, changes: dict) -> list:
+        known = {p["name"] for p in players}
+        missing = set(changes) - known
+        if missing:
+            raise InvalidInput(f"Unknown player(s): {', '.join(sorted(missing))}.")
+
+        updated = []
+        for p in players:
+            change = changes.get(p["name"])
+            if not change:
+                updated.append(p)
+                continue
+
+            bad = set(change) - set(self.PLAYER_CHANGE_FIELDS)
+            if bad:
+                raise InvalidInput(f"Only {self.PLAYER_CHANGE_FIELDS} can change, got {sorted(bad)}.")
+            fitness = change.get("fitness_score", p.get("fitness_score"))
+            if fitness is not None and not 0.0 <= fitness <= 1.0:
+                raise InvalidInput(f"fitness_score for {p['name']} must be between 0 and 1.")
+
+            updated.append({**p, **change})
+        return updated
+
+    def _analyse(self, data: MatchContext) -> MatchContext:
+        return self._run_stages(self.stages, data)
+
+    def _run_stages(self, stages: tuple, data: MatchContext) -> MatchContext:
+        """
+        Runs (name, stage) pairs in order. On sampled calls StageMetrics
+        times each stage under its name.
+        """
+        if self.stage_metrics is not None and next(self.stage_metrics.sampler):
+            names, steps = zip(*stages)
+            return self.stage_metrics.run_stages(names, steps, data)
+        for _, stage in stages:
+            data = stage(data)
+        return data
+
+    def _stages_from(self, name: str) -> tuple:
+        """The tail of self.stages starting at the named stage."""
+        names = [n for n, _ in self.stages]
+        return self.stages[names.index(name):]
+
+    def sweep(self, request: MatchAnalysisRequest, axes: dict) -> dict:
+        """
+        What-if decision surface: validates and scores the request once,
+        then evaluates formation and press rules over a grid of index
+        values. axes maps index name to (start, stop, steps); see
+        DecisionSurface.sweep() for the result layout.
+        """
+        return self.sweep_validated(self._timed("validate", self.validator.validate, request), axes)
+
+    def sweep_validated(self, validated: dict, axes: dict) -> dict:
+        """sweep() from InputValidator output."""
+        # Steps 2-3 give the base indices; the grid replaces the rest
+        data = self.metrics.calculate(MatchContext.from_dict(validated))
         data = self.form.analyse(data)
+        return self.surface.sweep(data, axes)
+
+    def robustness_check(self, request: MatchAnalysisRequest, samples: int, seed: int = None) -> dict:
+        """
+        Monte Carlo stability of the recommendation: re-runs metrics,
+        form, formation and press on samples perturbed copies of the
+        input. See RobustnessAnalyser.analyse() for the result layout.
+        """
+        validated = self._timed("validate", self.validator.validate, request)
+        return self.robustness_validated(validated, samples, seed)
 
-        # Step 4 — Tactical reasoning
-        data = self.formation.select(data)
-        data = self.press.recommend(data)
-        data = self.mismatch.detect(data)
+    def robustness_validated(self, validated: dict, samples: int, seed: int = None) -> dict:
+        """robustness_check() from InputValidator output."""
+        return self.robustness.analyse(validated, samples, seed)
 
-        # Step 5 - Auto-select best XI and bench
-        data = self.squad_selector.select(data)
+    def run_batch(self, requests: list) -> list:
+        """
+        Runs many requests at once. Indices, form and the threshold
+        decisions are computed as NumPy column operations; squad
+        selection, rotation and the explainer stay per request.
+        Reports are identical to calling run() on each request.
+        """
+        # Step 1 — Validate
+        return self.run_batch_validated([self._timed("validate", self.validator.validate, r) for r in requests])
 
-        #Step 6 - Rotation advice
-        data = self.rotation.advise(data)
+    def run_batch_validated(self, validated: list) -> list:
+        """run_batch() from InputValidator output."""
+        rows = [MatchContext.from_dict(v) for v in validated]
+        if not rows:
+            return []
 
-        # Step 7 — Build explanation
-        data = self.explainer.explain(data)
+        # Steps 2-4 — Metrics, form and tactical reasoning as columns,
+        # timed together as one "batch_columns" observation per batch
+        cols = self._timed("batch_columns", self._batch_columns, rows)
 
-        # Step 8 — ML prediction (Phase 2)
-        win_prob = draw_prob = loss_prob = None
+        columns = {k: v.tolist() if hasattr(v, "tolist") else v for k, v in cols.items()}
+        stages = self._stages_from("squad")
+        enriched = []
+        for i, data in enumerate(rows):
+            for key, values in columns.items():
+                data[key] = values[i]
+
+            # Steps 5-7 — Squad, rotation and explanation per request
+            enriched.append(self._run_stages(stages, data))
+
+        # Step 8 — ML prediction (Phase 2), one call for the whole batch
+        probs = [None] * len(enriched)
         if self.ml_model is not None:
-            try:
-                features = self.features.to_list(data)
-                probs = self.ml_model.predict_proba([features])[0]
-                loss_prob, draw_prob, win_prob = (
-                    round(probs[0], 3),
-                    round(probs[1], 3),
-                    round(probs[2], 3),
-                )
-            except Exception as e:
-                print(f"[ML] Prediction failed: {e}")
+            probs = self._timed("ml_batch", self.inference.predict_rows, enriched)
+
+        # Step 9 — Return reports
+        return [self._build_report(d, p) for d, p in zip(enriched, probs)]
+
+    def _batch_columns(self, rows: list) -> dict:
+        cols = self.metrics.calculate_batch(rows)
+        cols.update(self.form.analyse_batch(rows))
+        cols.update(self.formation.select_batch(cols))
+        cols.update(self.press.recommend_batch(cols))
+        cols.update(self.mismatch.detect_batch(cols))
+        return cols
+
+    def run_round(self, teams: dict, fixtures: list) -> list:
+        """
+        Both sides of every fixture in a round, from
+        InputValidator.validate_round_*() output. Returns
+        [(home report, away report)] in fixture order, each identical to
+        run_validated() on that side's request.
+
+        A team's own indices and form are computed once, however many
+        fixtures it appears in, and serve as the subject half of its
+        reports and the opponent half (opponent_form_score, and opponent
+        strength once per tier) of its opponents'. Formation onwards
+        runs per side and ML once for the round. Reports are cached,
+        and served from the cache, as run_validated() does.
+        """
+        sides = [
+            self.validator.side_fields(teams[team], teams[opponent])
+            for home, away in fixtures for team, opponent in ((home, away), (away, home))
+        ]
+        keys = [None] * len(sides)
+        reports = [None] * len(sides)
+        if self.cache is not None:
+            keys = [self.cache.key_for(side) for side in sides]
+            reports = [self.cache.get(key) for key in keys]
+        todo = [i for i, report in enumerate(reports) if report is None]
+
+        # Steps 2-3 — once per team and per (opponent, tier)
+        blocks, strengths = {}, {}
+        stages = self._stages_from("formation")
+        enriched = []
+        for i in todo:
+            data = MatchContext.from_dict(sides[i])
+            for name in (data.team_name, data.opponent_name):
+                if name not in blocks:
+                    blocks[name] = self._timed("round_team", self._team_block, teams[name])
+            data.update(blocks[data.team_name])
+            data.opponent_form_score = blocks[data.opponent_name]["form_score"]
+            strength = (data.opponent_name, data.tier)
+            if strength not in strengths:
+                strengths[strength] = self.metrics.calculate_opponent(data).opponent_strength_index
+            data.opponent_strength_index = strengths[strength]
+
+            # Steps 4-7 — per side
+            enriched.append(self._run_stages(stages, data))
+
+        # Step 8 — ML prediction (Phase 2), one call for the round
+        probs = [None] * len(enriched)
+        if self.ml_model is not None and enriched:
+            probs = self._timed("ml_batch", self.inference.predict_rows, enriched)
+
+        # Step 9 — Reports, cached unless the model was swapped meanwhile
+        for i, data, p in zip(todo, enriched, probs):
+            reports[i] = self._build_report(data, p)
+            current = p is not None and p.version == self.inference.version
+            if keys[i] is not None and (current or self.ml_model is None):
+                self.cache.put(keys[i], reports[i])
+        return list(zip(reports[::2], reports[1::2]))
+
+    def _team_block(self, team: dict) -> dict:
+        """TEAM_KEYS for a round team, from its side with a neutral opponent."""
+        data = MatchContext.from_dict(self.validator.side_fields(team))
+        data = self.metrics.calculate_team(data)
+        data = self.form.analyse_team(data)
+        return {key: data[key] for key in self.TEAM_KEYS}
+
+    def _predict(self, data: MatchContext):
+        return self._timed("ml", self.inference.predict, data)
+
+    def _timed(self, stage: str, fn, arg):
+        if self.stage_metrics is None:
+            return fn(arg)
+        return self.stage_metrics.call(stage, fn, arg)
+
+    def _build_report(self, data: dict, probs=None) -> TacticalReport:
+        loss_prob, draw_prob, win_prob = probs if probs is not None else (None, None, None)
+        version = probs.version if probs is not None else None
 
-        # Step 9 — Return report
         return TacticalReport(
             team_name=data["team_name"],
             opponent_name=data["opponent_name"],
@@ -84,6 +507,7 @@ class TactIQPipeline:
             win_probability=win_prob,
             draw_probability=draw_prob,
             loss_probability=loss_prob,
+            model_version=version,
             offensive_strength_index=data["offensive_strength_index"],
             defensive_vulnerability_index=data["defensive_vulnerability_index"],
             fatigue_risk_score=data["fatigue_risk_score"],
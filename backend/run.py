@@ -18,10 +18,10 @@ def main():
             goals_scored_last_5=9,
             goals_conceded_last_5=5,
             players=[
-                Player(name="Jamie Cole", position="GK", available=True, fitness_score=0.95),
-                Player(name="Marcus Webb", position="DEF", available=True, fitness_score=0.60),
-                Player(name="Owen Hart", position="MID", available=False, fitness_score=0.0),
-                Player(name="Liam Torres", position="FWD", available=True, fitness_score=0.88),
+                Player(name="Jamie Cole", position="GK", specific_position="GK", available=True, fitness_score=0.95),
+                Player(name="Marcus Webb", position="DEF", specific_position="CB", available=True, fitness_score=0.60),
+                Player(name="Owen Hart", position="MID", specific_position="CM", available=False, fitness_score=0.0),
+                Player(name="Liam Torres", position="FWD", specific_position="ST", available=True, fitness_score=0.88),
             ],
             opponent_last_5_results=[
                 MatchResult.LOSS,
@@ -1,16 +1,12 @@
 import sys
 import os
+import json
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../backend'))
 
 import streamlit as st
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
-from core.schemas import (
-    MatchAnalysisRequest, DataTier,
-    Tier1Input, Tier2Input,
-    MatchResult, Player,
-    BroadPosition, SpecificPosition, POSITION_MAP
-)
+from core.schemas import DataTier
+from core.pitch_renderer import PitchRenderer, formation_rows
+from core.report_cache import ReportCache
 from pipeline import TactIQPipeline
 
 # ── Page Config ────────────────────────────────────────────────
@@ -22,10 +18,28 @@ st.set_page_config(
 
 @st.cache_resource
 def load_pipeline():
-    return TactIQPipeline()
+    return TactIQPipeline(cache=ReportCache(max_size=256))
 
 pipeline = load_pipeline()
 
+
+@st.cache_resource
+def load_renderer():
+    # Draws the pitch once and caches each rendered XI across reruns
+    return PitchRenderer(cache_size=64)
+
+renderer = load_renderer()
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def analyse(payload_json: str):
+    """
+    Report for one set of form inputs, keyed by their canonical JSON.
+    Pressing Analyse again with unchanged inputs skips validation and
+    the pipeline entirely.
+    """
+    return pipeline.run_validated(pipeline.validate_json(payload_json))
+
 st.title("⚽ GafferOS")
 st.caption("AI-assisted tactical decision support for grassroots football")
 st.divider()
@@ -86,7 +100,7 @@ SPECIFIC_OPTIONS = {
     "FWD": ["RW", "LW", "ST", "CF", "SS"],
 }
 
-num_players = st.number_input("Number of players", min_value=0, max_value=25, value=14)
+num_players = st.number_input("Number of players", min_value=0, max_value=30, value=14)
 players = []
 
 if num_players > 0:
@@ -111,14 +125,15 @@ if num_players > 0:
         with c6:
             fitness = st.slider("Fitness", 0.0, 1.0, 0.85, key=f"fit_{i}")
 
-        players.append(Player(
-            name=name,
-            position=BroadPosition(broad),
-            specific_position=SpecificPosition(specific),
-            secondary_position=SpecificPosition(secondary) if secondary else None,
-            available=available,
-            fitness_score=fitness
-        ))
+        # Plain dicts — validated once, when Analyse is pressed
+        players.append({
+            "name": name,
+            "position": broad,
+            "specific_position": specific,
+            "secondary_position": secondary,
+            "available": available,
+            "fitness_score": fitness,
+        })
 
 # ── Tier 2 Stats ───────────────────────────────────────────────
 avg_possession = avg_passing = avg_shots = avg_sot = avg_errors = None
@@ -146,47 +161,37 @@ if tier == DataTier.TIER_2:
 st.divider()
 analyse_clicked = st.button("🔍 Analyse Match", type="primary", use_container_width=True)
 
+data = dict(
+    team_name=team_name,
+    opponent_name=opponent_name,
+    last_5_results=results_input,
+    goals_scored_last_5=goals_scored,
+    goals_conceded_last_5=goals_conceded,
+    players=players,
+    opponent_last_5_results=opp_results,
+    opponent_goals_scored=opp_goals_scored,
+    opponent_goals_conceded=opp_goals_conceded,
+)
+if tier == DataTier.TIER_2:
+    data.update(
+        avg_possession=avg_possession,
+        avg_passing_accuracy=avg_passing,
+        avg_shots_per_match=avg_shots,
+        avg_shots_on_target=avg_sot,
+        avg_defensive_errors=avg_errors,
+        opp_avg_possession=opp_possession,
+        opp_avg_passing_accuracy=opp_passing,
+        opp_avg_shots_per_match=opp_shots,
+        opp_avg_defensive_errors=opp_errors,
+    )
+data_key = "tier1_data" if tier == DataTier.TIER_1 else "tier2_data"
+payload_json = json.dumps({"tier": tier.value, data_key: data}, sort_keys=True)
+
 if analyse_clicked:
     with st.spinner("Analysing..."):
         try:
-            base = dict(
-                team_name=team_name,
-                opponent_name=opponent_name,
-                last_5_results=[MatchResult(r) for r in results_input],
-                goals_scored_last_5=goals_scored,
-                goals_conceded_last_5=goals_conceded,
-                players=players,
-                opponent_last_5_results=[MatchResult(r) for r in opp_results],
-                opponent_goals_scored=opp_goals_scored,
-                opponent_goals_conceded=opp_goals_conceded,
-            )
-
-            if tier == DataTier.TIER_1:
-                request = MatchAnalysisRequest(
-                    tier=DataTier.TIER_1,
-                    tier1_data=Tier1Input(**base)
-                )
-            else:
-                request = MatchAnalysisRequest(
-                    tier=DataTier.TIER_2,
-                    tier2_data=Tier2Input(
-                        **base,
-                        avg_possession=avg_possession,
-                        avg_passing_accuracy=avg_passing,
-                        avg_shots_per_match=avg_shots,
-                        avg_shots_on_target=avg_sot,
-                        avg_defensive_errors=avg_errors,
-                        opp_avg_possession=opp_possession,
-                        opp_avg_passing_accuracy=opp_passing,
-                        opp_avg_shots_per_match=opp_shots,
-                        opp_avg_defensive_errors=opp_errors,
-                    )
-                )
-
-            result = pipeline.run(request)
-            st.session_state["result"] = result
-            st.session_state["players"] = players
-            st.session_state["current_xi"] = [p.dict() if hasattr(p, "dict") else p for p in result.starting_xi]
+            st.session_state["result"] = analyse(payload_json)
+            st.session_state["analysed_input"] = payload_json
 
         except Exception as e:
             import traceback
@@ -196,10 +201,13 @@ if analyse_clicked:
 # ── Results ────────────────────────────────────────────────────
 if "result" in st.session_state:
     result = st.session_state["result"]
-    current_xi = st.session_state.get("current_xi", result.starting_xi)
+    current_xi = result.starting_xi
     bench = result.bench
 
-    st.success("Analysis complete!")
+    if st.session_state.get("analysed_input") == payload_json:
+        st.success("Analysis complete!")
+    else:
+        st.warning("Inputs changed since this analysis — press Analyse to update it.")
     st.divider()
 
     tab1, tab2 = st.tabs(["📋 Report", "⚽ Formation"])
@@ -235,96 +243,12 @@ if "result" in st.session_state:
     with tab2:
         st.subheader(f"⚽ {result.recommended_formation} — Auto-Selected XI")
 
-        # ── Build rows from current_xi ─────────────────────────
         formation_str = result.recommended_formation
-        try:
-            lines = [int(x) for x in formation_str.split("-")]
-        except:
-            lines = [4, 3, 3]
-        
-        def get_pos(p):
-            pos = p.get("position")
-            return pos.value if hasattr(pos, "value") else pos
-
-        gks  = [p for p in current_xi if get_pos(p) == "GK"]
-        defs = [p for p in current_xi if get_pos(p) == "DEF"]
-        mids = [p for p in current_xi if get_pos(p) == "MID"]
-        fwds = [p for p in current_xi if get_pos(p) == "FWD"]
-
-        position_pools = [defs, mids, fwds]
-        rows = [gks[:1] if gks else [None]]
-        for i, count in enumerate(lines):
-            pool = position_pools[i] if i < len(position_pools) else []
-            row = [pool[j] if j < len(pool) else None for j in range(count)]
-            rows.append(row)
+        rows = formation_rows(formation_str, current_xi)
+        lines = [len(row) for row in rows[1:]]
 
         # ── Draw Pitch ─────────────────────────────────────────
-        fig, ax = plt.subplots(figsize=(8, 11))
-        fig.patch.set_facecolor("#2d5a27")
-        ax.set_facecolor("#2d5a27")
-
-        pitch_width, pitch_height = 100, 130
-
-        ax.add_patch(patches.Rectangle(
-            (5, 5), pitch_width - 10, pitch_height - 10,
-            linewidth=2, edgecolor="white", facecolor="none"
-        ))
-        ax.plot([5, pitch_width - 5], [pitch_height / 2, pitch_height / 2],
-                color="white", linewidth=1.5)
-        ax.add_patch(plt.Circle((pitch_width / 2, pitch_height / 2), 10,
-                color="white", fill=False, linewidth=1.5))
-        ax.plot(pitch_width / 2, pitch_height / 2, "o", color="white", markersize=3)
-        ax.add_patch(patches.Rectangle((27, 5), 46, 18,
-                linewidth=1.5, edgecolor="white", facecolor="none"))
-        ax.add_patch(patches.Rectangle((27, pitch_height - 23), 46, 18,
-                linewidth=1.5, edgecolor="white", facecolor="none"))
-        ax.add_patch(patches.Rectangle((38, 5), 24, 8,
-                linewidth=1, edgecolor="white", facecolor="none"))
-        ax.add_patch(patches.Rectangle((38, pitch_height - 13), 24, 8,
-                linewidth=1, edgecolor="white", facecolor="none"))
-
-        num_rows = len(rows)
-        y_positions = [
-            15 + (i * (pitch_height - 30) / max(num_rows - 1, 1))
-            for i in range(num_rows)
-        ]
-
-        for row_idx, row in enumerate(rows):
-            y = y_positions[row_idx]
-            for col_idx, player in enumerate(row):
-                x = (pitch_width / (len(row) + 1)) * (col_idx + 1)
-                fitness = player.get("fitness_score") or 0 if player else 0
-                color = "#1a3a8f" if fitness >= 0.65 else "#8b0000"
-
-                ax.add_patch(plt.Circle((x, y), 4.5, color=color, zorder=3))
-                ax.add_patch(plt.Circle((x, y), 4.5, color="white",
-                             fill=False, linewidth=1.5, zorder=4))
-
-                if player:
-                    short_name   = (player.get("name") or "?").split()[-1]
-                    specific_pos = player.get("specific_position") or ""
-                    fitness_pct  = f"{int((player.get('fitness_score') or 0) * 100)}%"
-                    ax.text(x, y + 0.5, short_name, ha="center", va="center",
-                            fontsize=5.5, color="white", fontweight="bold", zorder=5)
-                    ax.text(x, y - 1.8, specific_pos, ha="center", va="center",
-                            fontsize=4.5, color="#ffdd88", zorder=5)
-                    ax.text(x, y - 3.5, fitness_pct, ha="center", va="center",
-                            fontsize=4.0, color="#aaffaa", zorder=5)
-                else:
-                    ax.text(x, y, "?", ha="center", va="center",
-                            fontsize=8, color="white", zorder=5)
-
-        ax.plot([], [], "o", color="#1a3a8f", label="Fit (≥65%)", markersize=8)
-        ax.plot([], [], "o", color="#8b0000", label="Fatigue risk (<65%)", markersize=8)
-        ax.legend(loc="lower center", fontsize=7, facecolor="#1a1a1a",
-                  labelcolor="white", framealpha=0.8, ncol=2)
-        ax.text(pitch_width / 2, pitch_height - 2,
-                f"{result.team_name}  ·  {formation_str}",
-                ha="center", va="top", fontsize=9, color="white", fontweight="bold")
-        ax.set_xlim(0, pitch_width)
-        ax.set_ylim(0, pitch_height)
-        ax.axis("off")
-        st.pyplot(fig)
+        st.image(renderer.render(formation_str, current_xi, result.team_name, "png"))
         st.caption("🔵 Fit  🔴 Fatigue risk  · position in yellow · % is fitness")
 
         # ── Swap Panel ─────────────────────────────────────────
@@ -332,10 +256,9 @@ if "result" in st.session_state:
         st.subheader("🔄 Swap Players")
         st.caption("Override the auto-selection for any slot")
 
-        all_available = [p for p in st.session_state["players"] if p.available]
-        all_names = [p.name for p in all_available]
+        all_names = [p["name"] for p in current_xi + bench if p.get("available", True)]
         row_labels = ["GK"] + [f"Line {i+1}" for i in range(len(lines))]
-        updated_xi = []
+        picked = []
 
         for row_idx, row in enumerate(rows):
             cols = st.columns(len(row))
@@ -351,16 +274,15 @@ if "result" in st.session_state:
                         key=f"swap_{row_idx}_{col_idx}"
                     )
                     if selected_name != "Empty":
-                        matched = next(
-                            (p for p in all_available if p.name == selected_name), None
-                        )
-                        updated_xi.append(matched.dict() if matched else None)
-                    else:
-                        updated_xi.append(None)
+                        picked.append(selected_name)
 
         if st.button("✅ Apply Changes", use_container_width=True):
-            st.session_state["current_xi"] = [p.dict() if hasattr(p, "dict") else p for p in updated_xi if p]
-            st.rerun()
+            # Only the rotation advice and the pitch image depend on the XI
+            try:
+                st.session_state["result"] = pipeline.swap_xi(result, picked)
+                st.rerun()
+            except ValueError as e:
+                st.error(str(e))
 
         # ── Bench ──────────────────────────────────────────────
         st.divider()